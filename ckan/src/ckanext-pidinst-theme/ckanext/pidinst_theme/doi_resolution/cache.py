@@ -0,0 +1,127 @@
+"""Process-wide resolution cache and pooled HTTP sessions.
+
+Registrars often resolve the same DOI or URL several times while filling in
+the form, so the Provider_Clients and the URL metadata client share a small
+in-memory cache:
+
+* entries expire after a TTL; ``NOT_FOUND`` style (negative) outcomes use a
+  shorter TTL so a freshly registered DOI shows up reasonably quickly;
+* the cache is bounded and evicts the least recently used entry;
+* errors are never cached, so a transient upstream failure is retried on the
+  next request;
+* hit/miss/eviction counters are kept and exposed via
+  :meth:`ResolutionCache.stats`.
+
+Each provider also gets one keep-alive ``requests.Session`` so repeated
+lookups reuse pooled connections instead of a new TCP/TLS handshake per call.
+
+Like the rest of the package this module is free of CKAN imports.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import requests
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL = 3600.0           # seconds, found records
+DEFAULT_NEGATIVE_TTL = 300.0   # seconds, NOT_FOUND / unsupported outcomes
+
+
+class ResolutionCache:
+    """Thread-safe TTL + LRU cache for resolution outcomes.
+
+    Values are deep-copied on the way in and out so callers can never mutate
+    a cached entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._counters = self._empty_counters()
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {'hits': 0, 'negative_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a copy of the cached value for *key*, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            expires_at, negative, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['negative_hits' if negative else 'hits'] += 1
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any, negative: bool = False) -> None:
+        """Store *value*; negative entries use ``negative_ttl``."""
+        ttl = self.negative_ttl if negative else self.ttl
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, negative, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._counters = self._empty_counters()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+        return stats
+
+
+# Shared by DataCiteClient, CrossrefClient and fetch_url_metadata.
+resolution_cache = ResolutionCache()
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def shared_session(
+    name: str,
+    factory: Callable[[], requests.Session] = requests.Session,
+) -> requests.Session:
+    """Return the process-wide keep-alive session registered as *name*.
+
+    *factory* is only called the first time a name is requested.
+    """
+    session = _sessions.get(name)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = factory()
+                _sessions[name] = session
+    return session
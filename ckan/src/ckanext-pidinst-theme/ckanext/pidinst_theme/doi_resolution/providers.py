@@ -19,6 +19,11 @@ Each client catches its own network/parse errors and translates them into a
 * ``requests.Timeout``, ``requests.RequestException``, any non-2xx/non-404
   status, or an unparseable response body -> ``ProviderLookup.ERROR``
 * a parseable 2xx record -> ``ProviderLookup.FOUND`` with a ``ProviderRecord``
+
+``FOUND`` and ``NOT_FOUND`` responses are kept in the shared
+:data:`~ckanext.pidinst_theme.doi_resolution.cache.resolution_cache` (keyed by
+provider, API URL and DOI) and requests go through one pooled keep-alive
+session per provider. ``ERROR`` responses are never cached.
 """
 
 from __future__ import annotations
@@ -34,6 +39,11 @@ except ImportError:  # pragma: no cover - Python < 3.8 fallback
 
 import requests
 
+from ckanext.pidinst_theme.doi_resolution.cache import (
+    ResolutionCache,
+    resolution_cache,
+    shared_session,
+)
 from ckanext.pidinst_theme.doi_resolution.types import ProviderRecord
 
 
@@ -114,6 +124,52 @@ def _sanitize_provider_metadata(value):
     return _stringify(value)
 
 
+def _cached_lookup(client, bare_doi: str) -> ProviderResponse:
+    """Return the cached response for ``bare_doi`` or fetch and cache it."""
+    # DOIs are case-insensitive.
+    key = (client.source, client.api_url, bare_doi.lower())
+    cached = client.cache.get(key)
+    if cached is not None:
+        return cached
+
+    response = _fetch(client, bare_doi)
+    if response.outcome == ProviderLookup.FOUND:
+        client.cache.set(key, response)
+    elif response.outcome == ProviderLookup.NOT_FOUND:
+        client.cache.set(key, response, negative=True)
+    return response
+
+
+def _fetch(client, bare_doi: str) -> ProviderResponse:
+    """GET ``{api_url}/{bare_doi}`` and translate it into a ProviderResponse."""
+    url = '{base}/{doi}'.format(base=client.api_url, doi=bare_doi)
+    try:
+        response = shared_session(client.source).get(
+            url,
+            timeout=client.timeout,
+            headers={'Accept': 'application/json'},
+        )
+    except requests.Timeout:
+        return ProviderResponse(ProviderLookup.ERROR)
+    except requests.RequestException:
+        return ProviderResponse(ProviderLookup.ERROR)
+
+    if response.status_code == 404:
+        return ProviderResponse(ProviderLookup.NOT_FOUND)
+    if not 200 <= response.status_code < 300:
+        return ProviderResponse(ProviderLookup.ERROR)
+
+    try:
+        payload = response.json()
+    except ValueError:
+        return ProviderResponse(ProviderLookup.ERROR)
+
+    record = client._parse(payload)
+    if record is None:
+        return ProviderResponse(ProviderLookup.ERROR)
+    return ProviderResponse(ProviderLookup.FOUND, record)
+
+
 class DataCiteClient:
     """Provider_Client that queries the DataCite REST API.
 
@@ -124,38 +180,19 @@ class DataCiteClient:
 
     source = 'datacite'
 
-    def __init__(self, api_url: str, timeout: float):
+    def __init__(
+        self,
+        api_url: str,
+        timeout: float,
+        cache: Optional[ResolutionCache] = None,
+    ):
         # Trailing slashes are trimmed so URL construction stays predictable.
         self.api_url = api_url.rstrip('/')
         self.timeout = timeout
+        self.cache = cache if cache is not None else resolution_cache
 
     def lookup(self, bare_doi: str) -> ProviderResponse:
-        url = '{base}/{doi}'.format(base=self.api_url, doi=bare_doi)
-        try:
-            response = requests.get(
-                url,
-                timeout=self.timeout,
-                headers={'Accept': 'application/json'},
-            )
-        except requests.Timeout:
-            return ProviderResponse(ProviderLookup.ERROR)
-        except requests.RequestException:
-            return ProviderResponse(ProviderLookup.ERROR)
-
-        if response.status_code == 404:
-            return ProviderResponse(ProviderLookup.NOT_FOUND)
-        if not 200 <= response.status_code < 300:
-            return ProviderResponse(ProviderLookup.ERROR)
-
-        try:
-            payload = response.json()
-        except ValueError:
-            return ProviderResponse(ProviderLookup.ERROR)
-
-        record = self._parse(payload)
-        if record is None:
-            return ProviderResponse(ProviderLookup.ERROR)
-        return ProviderResponse(ProviderLookup.FOUND, record)
+        return _cached_lookup(self, bare_doi)
 
     def _parse(self, payload) -> Optional[ProviderRecord]:
         """Map a DataCite ``data.attributes`` body into a ``ProviderRecord``."""
@@ -242,37 +279,18 @@ class CrossrefClient:
 
     source = 'crossref'
 
-    def __init__(self, api_url: str, timeout: float):
+    def __init__(
+        self,
+        api_url: str,
+        timeout: float,
+        cache: Optional[ResolutionCache] = None,
+    ):
         self.api_url = api_url.rstrip('/')
         self.timeout = timeout
+        self.cache = cache if cache is not None else resolution_cache
 
     def lookup(self, bare_doi: str) -> ProviderResponse:
-        url = '{base}/{doi}'.format(base=self.api_url, doi=bare_doi)
-        try:
-            response = requests.get(
-                url,
-                timeout=self.timeout,
-                headers={'Accept': 'application/json'},
-            )
-        except requests.Timeout:
-            return ProviderResponse(ProviderLookup.ERROR)
-        except requests.RequestException:
-            return ProviderResponse(ProviderLookup.ERROR)
-
-        if response.status_code == 404:
-            return ProviderResponse(ProviderLookup.NOT_FOUND)
-        if not 200 <= response.status_code < 300:
-            return ProviderResponse(ProviderLookup.ERROR)
-
-        try:
-            payload = response.json()
-        except ValueError:
-            return ProviderResponse(ProviderLookup.ERROR)
-
-        record = self._parse(payload)
-        if record is None:
-            return ProviderResponse(ProviderLookup.ERROR)
-        return ProviderResponse(ProviderLookup.FOUND, record)
+        return _cached_lookup(self, bare_doi)
 
     def _parse(self, payload) -> Optional[ProviderRecord]:
         """Map a Crossref ``message`` body into a ``ProviderRecord``."""
@@ -21,6 +21,12 @@ Lookup-order semantics for DOIs:
 * A Crossref ``FOUND`` is used with ``source='crossref'``; a Crossref ``ERROR``
   yields ``fetch_error``; a Crossref ``NOT_FOUND`` yields ``not_found``.
 
+With ``concurrent=True`` both providers are queried at the same time, so a
+Crossref-registered DOI costs max(DataCite, Crossref) rather than the sum.
+The outcome is decided exactly as above: the DataCite response is always
+awaited first and the Crossref response is only used when DataCite reports
+``NOT_FOUND``; otherwise it is ignored.
+
 For non-DOI URLs:
 
 * The URL is fetched directly by the URL metadata client.
@@ -31,6 +37,7 @@ For non-DOI URLs:
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional
 
 from .input_normalizer import normalize_input
@@ -46,6 +53,7 @@ def resolve(
     crossref: ProviderClient,
     mapper: Mapper,
     url_fetcher: Optional[Callable[..., UrlFetchResult]] = None,
+    concurrent: bool = False,
 ) -> ResolveResult:
     """Resolve ``identifier`` into a uniform :class:`ResolveResult`.
 
@@ -59,6 +67,8 @@ def resolve(
             form fields for a found record.
         url_fetcher: Optional callable for fetching arbitrary URL metadata.
             Defaults to :func:`fetch_url_metadata` if not provided.
+        concurrent: Query DataCite and Crossref in parallel for DOI inputs
+            instead of only falling back to Crossref after DataCite.
 
     Returns:
         A :class:`ResolveResult` whose ``status`` is one of ``ok``,
@@ -72,6 +82,8 @@ def resolve(
 
     # 2. Route based on input type.
     if norm.is_doi:
+        if concurrent:
+            return _resolve_doi_concurrent(norm, datacite, crossref, mapper)
         return _resolve_doi(norm, datacite, crossref, mapper)
     else:
         return _resolve_url(norm, mapper, url_fetcher)
@@ -92,7 +104,34 @@ def _resolve_doi(norm, datacite, crossref, mapper) -> ResolveResult:
         )
 
     # DataCite NOT_FOUND -> Crossref fallback.
-    cr = crossref.lookup(norm.bare_doi)
+    return _crossref_result(crossref.lookup(norm.bare_doi), norm, mapper)
+
+
+def _resolve_doi_concurrent(norm, datacite, crossref, mapper) -> ResolveResult:
+    """Resolve a DOI querying both providers at once, DataCite preferred."""
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        dc_future = executor.submit(datacite.lookup, norm.bare_doi)
+        cr_future = executor.submit(crossref.lookup, norm.bare_doi)
+
+        dc = dc_future.result()
+        if dc.outcome == ProviderLookup.ERROR:
+            return ResolveResult(status='fetch_error')
+        if dc.outcome == ProviderLookup.FOUND:
+            return _build_ok_result(
+                source='datacite',
+                response=dc,
+                norm=norm,
+                mapper=mapper,
+            )
+        return _crossref_result(cr_future.result(), norm, mapper)
+    finally:
+        # Don't wait for an in-flight Crossref request whose answer is unused.
+        executor.shutdown(wait=False)
+
+
+def _crossref_result(cr, norm, mapper) -> ResolveResult:
+    """Map the Crossref fallback response into a ResolveResult."""
     if cr.outcome == ProviderLookup.ERROR:
         return ResolveResult(status='fetch_error')
     if cr.outcome == ProviderLookup.FOUND:
@@ -11,6 +11,10 @@ SSRF Protection:
 - Redirects are followed up to a limit, with each hop validated.
 - Response size is capped.
 
+Results are cached in the shared resolution cache (``unsupported_format``
+as a negative entry; errors and unsafe URLs are not cached) and requests
+reuse one pooled keep-alive session per redirect limit.
+
 This module is free of CKAN imports and independently testable.
 """
 
@@ -26,6 +30,7 @@ from urllib.parse import urlparse
 import requests
 from requests.adapters import HTTPAdapter
 
+from .cache import ResolutionCache, resolution_cache, shared_session
 from .types import ProviderRecord
 
 
@@ -288,11 +293,25 @@ class _SafeRedirectAdapter(HTTPAdapter):
         )
 
 
+def _safe_session(max_redirects: int) -> requests.Session:
+    """Return the pooled SSRF-safe session for *max_redirects*."""
+    def factory():
+        session = requests.Session()
+        session.max_redirects = max_redirects
+        adapter = _SafeRedirectAdapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    return shared_session('url_metadata:{}'.format(max_redirects), factory)
+
+
 def fetch_url_metadata(
     url: str,
     timeout: float = DEFAULT_TIMEOUT,
     max_redirects: int = MAX_REDIRECTS,
     max_response_bytes: int = MAX_RESPONSE_BYTES,
+    cache: Optional[ResolutionCache] = None,
 ) -> UrlFetchResult:
     """Fetch a URL and attempt to parse the response as supported metadata.
 
@@ -301,6 +320,7 @@ def fetch_url_metadata(
         timeout: Request timeout in seconds.
         max_redirects: Maximum number of redirects to follow.
         max_response_bytes: Maximum response body size to read.
+        cache: Resolution cache to use; defaults to the shared cache.
 
     Returns:
         A UrlFetchResult with status and optional ProviderRecord.
@@ -310,18 +330,31 @@ def fetch_url_metadata(
     if parsed.scheme.lower() not in ('http', 'https'):
         return UrlFetchResult(status=UrlFetchStatus.UNSAFE_URL)
 
+    cache = cache if cache is not None else resolution_cache
+    key = ('url', url, max_redirects, max_response_bytes)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = _fetch_url_metadata(url, timeout, max_redirects, max_response_bytes)
+    if result.status == UrlFetchStatus.OK:
+        cache.set(key, result)
+    elif result.status == UrlFetchStatus.UNSUPPORTED_FORMAT:
+        cache.set(key, result, negative=True)
+    return result
+
+
+def _fetch_url_metadata(
+    url: str,
+    timeout: float,
+    max_redirects: int,
+    max_response_bytes: int,
+) -> UrlFetchResult:
     if not _validate_url_safe(url):
         return UrlFetchResult(status=UrlFetchStatus.UNSAFE_URL)
 
-    # Create a session with redirect safety
-    session = requests.Session()
-    session.max_redirects = max_redirects
-    adapter = _SafeRedirectAdapter()
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-
     try:
-        response = session.get(
+        response = _safe_session(max_redirects).get(
             url,
             timeout=timeout,
             headers={'Accept': 'application/json'},
@@ -334,9 +367,14 @@ def fetch_url_metadata(
         return UrlFetchResult(status=UrlFetchStatus.FETCH_ERROR)
     except requests.RequestException:
         return UrlFetchResult(status=UrlFetchStatus.FETCH_ERROR)
-    finally:
-        session.close()
 
+    # Always release the connection back to the pool, even when the body
+    # is only partly read.
+    with response:
+        return _parse_response(response, max_response_bytes)
+
+
+def _parse_response(response, max_response_bytes: int) -> UrlFetchResult:
     # Validate final URL after redirects
     if response.url and not _validate_url_safe(response.url):
         return UrlFetchResult(status=UrlFetchStatus.UNSAFE_URL)
@@ -0,0 +1,97 @@
+"""Cache of facet-only searches shared by the search pages and home page.
+
+The baseline (scope-only) facet counts behind the stable checkbox lists and
+the home page facets are the same for every visitor who can see the same
+datasets, so ``package_search`` results are cached keyed by the search
+parameters (scope fq, include_private, ...) and the caller's visibility
+(CKAN permission labels, i.e. the user's organisations).  The labels of a
+logged-in user include ``creator-<user id>``, so their searches are cached
+per user; anonymous visitors share one entry per search, as do sysadmins
+and ignore_auth callers.  The in-process backend drops expired entries and
+caps its size, so per-user entries do not accumulate.  The plugin's
+dataset write hooks call ``invalidate()``, which bumps the cache version;
+with the Redis backend (see party_cache.BACKEND_CONFIG_KEY) that reaches
+every worker.
+
+Kept in its own module (like party_cache) so plugin.py can invalidate it
+without importing views.py.
+"""
+
+import json
+import threading
+
+import ckan.plugins.toolkit as toolkit
+
+from ckanext.pidinst_theme import party_cache
+
+_FACET_CACHE_TTL = 300  # seconds
+_REDIS_PREFIX = 'ckanext-pidinst-theme:facet-cache'
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the cache backend (created on first use)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = party_cache.backend_from_config(
+                    ttl=_FACET_CACHE_TTL, prefix=_REDIS_PREFIX)
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the cache backend (tests, or a pre-built shared backend)."""
+    global _backend
+    _backend = backend
+
+
+def invalidate():
+    """Drop all cached searches.  Call after any dataset create/update/delete."""
+    get_backend().invalidate()
+
+
+def get_version():
+    """Current cache version; increments on every invalidation."""
+    return get_backend().version()
+
+
+def visibility_key(context):
+    """Return what decides which datasets *context* can see in a search.
+
+    Mirrors package_search: ignore_auth and sysadmins see everything, other
+    users are filtered by their dataset permission labels.  These include
+    the user's own ``creator-`` label (private datasets outside any
+    organisation), so they cannot be narrowed to the organisation labels.
+    """
+    from ckan import authz
+    from ckan.lib.plugins import get_permission_labels
+
+    user = context.get('user')
+    if context.get('ignore_auth') or (user and authz.is_sysadmin(user)):
+        return ('*',)
+    labels = get_permission_labels().get_user_dataset_labels(
+        context.get('auth_user_obj'))
+    return tuple(sorted(labels))
+
+
+def package_search(context, data_dict):
+    """``package_search`` through the cache.
+
+    Meant for facet queries whose result does not depend on the request
+    (no paging through user results).  Callers must not mutate the result.
+    """
+    key = (
+        'package_search',
+        json.dumps(data_dict, sort_keys=True, default=str),
+        visibility_key(context),
+    )
+    backend = get_backend()
+    cached = backend.get(key)
+    if cached is not None:
+        return cached
+    result = toolkit.get_action('package_search')(context, dict(data_dict))
+    backend.set(key, result)
+    return result
@@ -0,0 +1,97 @@
+"""Distinct-term index for the ``/api/field_terms`` autocomplete.
+
+Terms are read from the multi-valued ``vocab_*`` Solr fields populated in
+``PidinstThemePlugin.before_dataset_index`` with a single rows=0 facet
+query, so a lookup never has to decode package dicts and is not capped at
+the first page of search results.  The distinct terms per field are cached
+in-process and cleared from the plugin's dataset write hooks.
+
+Kept in its own module (like party_cache) so plugin.py can invalidate it
+without importing views.py.
+"""
+
+import bisect
+import logging
+import time
+
+import ckan.plugins.toolkit as toolkit
+
+log = logging.getLogger(__name__)
+
+# Autocomplete field name -> indexed Solr field holding its values.
+INDEX_FIELDS = {
+    'user_keywords': 'vocab_user_keyword',
+    'measured_variable': 'vocab_measured_variable',
+    'instrument_type_name': 'vocab_instrument_type',
+}
+
+_FIELD_TERMS_TTL = 60  # seconds; bounds staleness across worker processes
+
+_cache = {}
+
+
+def invalidate():
+    """Drop all cached term lists.  Call after any dataset create/update/delete."""
+    _cache.clear()
+
+
+def _load_terms(field_name):
+    """Return the distinct terms of *field_name* as a sorted list of
+    ``(lowercased, original)`` tuples."""
+    solr_field = INDEX_FIELDS[field_name]
+    result = toolkit.get_action('package_search')({'ignore_auth': True}, {
+        'q': '*:*',
+        'rows': 0,
+        'facet': 'true',
+        'facet.field': [solr_field],
+        'facet.limit': -1,
+        'facet.mincount': 1,
+    })
+    items = result.get('search_facets', {}).get(solr_field, {}).get('items', [])
+    terms = {
+        item['name'].strip()
+        for item in items
+        if isinstance(item.get('name'), str) and item['name'].strip()
+    }
+    return sorted((t.lower(), t) for t in terms)
+
+
+def _get_terms(field_name):
+    entry = _cache.get(field_name)
+    if entry and (time.time() - entry[0]) < _FIELD_TERMS_TTL:
+        return entry[1]
+    terms = _load_terms(field_name)
+    _cache[field_name] = (time.time(), terms)
+    return terms
+
+
+def lookup(field_name, query='', limit=20):
+    """Return up to *limit* distinct terms of *field_name* matching *query*.
+
+    Matching is case-insensitive.  Terms starting with *query* come first,
+    followed by terms that contain it elsewhere; each group is sorted
+    alphabetically.  An empty query returns the first terms alphabetically.
+    """
+    terms = _get_terms(field_name)
+    query = (query or '').strip().lower()
+    if not query:
+        return [t for _, t in terms[:limit]]
+
+    # Prefix matches form a contiguous run of the sorted list.
+    start = bisect.bisect_left(terms, (query,))
+    matching = []
+    pos = start
+    while pos < len(terms) and terms[pos][0].startswith(query):
+        if len(matching) == limit:
+            return matching
+        matching.append(terms[pos][1])
+        pos += 1
+
+    for i, (lowered, term) in enumerate(terms):
+        if len(matching) == limit:
+            break
+        if start <= i < pos:
+            continue
+        if query in lowered:
+            matching.append(term)
+    return matching
@@ -1,5 +1,4 @@
 from ckan.plugins import toolkit
-import ckan.logic as logic
 import ckan.authz as authz
 from datetime import date
 from ckan.logic import NotFound
@@ -9,6 +8,8 @@ import logging
 import os
 from markupsafe import Markup, escape
 from ckanext.pidinst_theme import doi_policy
+from ckanext.pidinst_theme import facet_cache
+from ckanext.pidinst_theme import party_cache
 
 # ---------------------------------------------------------------------------
 # Taxonomy name configuration – single source of truth
@@ -150,7 +151,7 @@ def get_search_facets():
         'fq': 'capacity:"public"'
     }
     try:
-        query = logic.get_action('package_search')(context, data_dict)
+        query = facet_cache.package_search(context, data_dict)
         return query['search_facets']
     except toolkit.ObjectNotFound:
         return {}
@@ -676,35 +677,14 @@ def get_party_list():
     Plus any extras stored on the group (e.g. party_contact, ror_id …).
     The list is sorted alphabetically by title.
 
-    Uses group_show per party (not group_list) because group_list's
-    include_extras parameter is unreliable across CKAN versions — it may
-    return an empty extras list even when extras exist.
+    Reads group and extra rows directly (see party_cache.load_party_metadata)
+    rather than issuing one group_show per party; the result is cached until
+    the next party change.
     """
     try:
-        context = {'ignore_auth': True}
-        # Get the list of party slugs first
-        names = toolkit.get_action('group_list')(context, {
-            'type': 'party',
-        })
-        result = []
-        for name in names:
-            try:
-                g = toolkit.get_action('group_show')(context, {
-                    'id': name,
-                    'include_extras': True,
-                })
-                # Start with ALL top-level keys — ckanext-scheming returns
-                # custom fields (e.g. party_contact) as top-level keys on
-                # group_show, not inside the extras list.
-                item = dict(g)
-                # Also flatten extras list in case any extras weren't promoted
-                for e in g.get('extras', []):
-                    item[e['key']] = e['value']
-                result.append(item)
-            except Exception:
-                pass
-        return sorted(result, key=lambda x: x.get('title', '').lower())
+        return party_cache.get_party_list()
     except Exception:
+        logging.exception('Failed to load party list')
         return []
 
 
@@ -898,7 +878,9 @@ def taxonomy_blocking_packages(taxonomy_id):
 def pidinst_group_filter_facet_items(group_dict, group_type):
     """Return stable filter_facet_items for an org or party read page.
 
-    Performs a rows=0 baseline Solr query (no checkbox filters) so the
+    Uses the baseline (no checkbox filters) facet counts fetched with the
+    page's main search (see plugin._tag_group_page_filters), or performs a
+    rows=0 baseline Solr query when those are not available, so the
     checkbox lists stay stable when the user applies facet selections.
     Active-but-absent values are injected with count=0.
 
@@ -916,6 +898,9 @@ def pidinst_group_filter_facet_items(group_dict, group_type):
             values = toolkit.request.args.getlist(field)
             if values:
                 fields_grouped[field] = values
+        stable = getattr(toolkit.g, 'pidinst_group_stable_facets', None)
+        if stable is not None:
+            return views._build_filter_facet_items(stable, fields_grouped)
         is_logged_in = bool(toolkit.c.user)
         return views._build_group_stable_facets(forced_fq, fields_grouped, is_logged_in)
     except Exception:
@@ -25,6 +25,7 @@ from ckanext.pidinst_theme import (
     propagation_helpers,
     taxonomy_protection,
 )
+from ckanext.pidinst_theme.doi_resolution.cache import resolution_cache
 from ckanext.pidinst_theme.doi_resolution.mapper import Mapper
 from ckanext.pidinst_theme.doi_resolution.providers import (
     CrossrefClient,
@@ -248,7 +249,11 @@ def pidinst_resolve_doi_metadata(context, data_dict):
         crossref,
         Mapper(),
         url_fetcher=lambda url: fetch_url_metadata(url, timeout=timeout),
+        concurrent=tk.asbool(tk.config.get(
+            'ckanext.pidinst_theme.doi_resolution.concurrent', True
+        )),
     )
+    _log.debug('DOI resolution cache stats: %s', resolution_cache.stats())
     out = result.to_dict()
     if out.get('status') == 'ok':
         out['matched_suggestions'] = doi_reconciliation.reconcile(
@@ -789,9 +794,17 @@ def package_withdraw(context, data_dict):
 
 
 # ---------------------------------------------------------------------------
-# Taxonomy term – update propagation & delete guard
+# Taxonomy term – cache invalidation, update propagation & delete guard
 # ---------------------------------------------------------------------------
 
+@tk.chained_action
+def taxonomy_term_create(next_action, context, data_dict):
+    """After a taxonomy term is created, drop the cached reconciliation terms."""
+    result = next_action(context, data_dict)
+    doi_reconciliation.invalidate_taxonomy_terms()
+    return result
+
+
 @tk.chained_action
 def taxonomy_term_update(next_action, context, data_dict):
     """Propagate taxonomy term metadata changes into referencing instruments."""
@@ -803,6 +816,7 @@ def taxonomy_term_update(next_action, context, data_dict):
         old_term = None
 
     result = next_action(context, data_dict)
+    doi_reconciliation.invalidate_taxonomy_terms()
 
     if old_term:
         try:
@@ -849,7 +863,9 @@ def taxonomy_term_delete(next_action, context, data_dict):
             'message': [check['message']],
             'packages': check['packages'],
         })
-    return next_action(context, data_dict)
+    result = next_action(context, data_dict)
+    doi_reconciliation.invalidate_taxonomy_terms()
+    return result
 
 
 def _gather_term_and_descendants(root_id, all_terms):
@@ -896,7 +912,9 @@ def taxonomy_delete(next_action, context, data_dict):
                 'message': [check['message']],
                 'packages': check['packages'],
             })
-    return next_action(context, data_dict)
+    result = next_action(context, data_dict)
+    doi_reconciliation.invalidate_taxonomy_terms()
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -1009,6 +1027,7 @@ def get_actions():
         'group_create': group_create,
         'group_update': group_update,
         'group_delete': group_delete,
+        'taxonomy_term_create': taxonomy_term_create,
         'taxonomy_term_update': taxonomy_term_update,
         'taxonomy_term_delete': taxonomy_term_delete,
         'taxonomy_delete': taxonomy_delete,
@@ -10,10 +10,12 @@ from __future__ import annotations
 
 import logging
 import json
-from typing import Any, Dict, Iterable, List, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import ckan.plugins.toolkit as tk
 
+from ckanext.pidinst_theme import party_cache
 from ckanext.pidinst_theme.helpers import get_taxonomy_name
 
 
@@ -27,6 +29,21 @@ MATCH_GROUPS = (
     'measured_variable',
 )
 
+_TAXONOMY_KEYS = ('instrument', 'platform', 'measured_variable')
+_TAXONOMY_TERMS_TTL = 300  # seconds; bounds staleness across worker processes
+
+# Flattened taxonomy terms, stamped with the version they were read at.
+_taxonomy_terms_cache = {}
+_taxonomy_version = 0
+
+# Identifier indexes for the most recent party list / term list, keyed by
+# role (parties) or suggested field (terms).  Rebuilt when the stamp the
+# list was read under changes: the load time cached with the party list,
+# the taxonomy cache version and load time for terms.  List identity is no
+# use here, as the Redis party cache returns a new list on every read.
+_party_index = {'stamp': None, 'by_role': {}}
+_term_index = {'stamp': None, 'by_field': {}}
+
 
 def reconcile(resolved_fields: Dict[str, Any], context: Optional[dict] = None) -> dict:
     """Return matched_suggestions grouped by target field.
@@ -37,34 +54,45 @@ def reconcile(resolved_fields: Dict[str, Any], context: Optional[dict] = None) -
     resolved_fields = resolved_fields or {}
     context = _read_context(context)
 
-    parties = _read_parties(context)
-    taxonomy_terms = _read_taxonomy_terms(context)
+    parties, party_stamp = _read_parties(context)
+    taxonomy_terms, terms_stamp = _read_taxonomy_terms(context)
 
     return {
         'manufacturer': match_manufacturer(
-            resolved_fields.get('manufacturer_suggestions') or [], parties
+            resolved_fields.get('manufacturer_suggestions') or [], parties,
+            stamp=party_stamp,
         ),
         'owner': match_owner(
-            resolved_fields.get('owner_suggestions') or [], parties
+            resolved_fields.get('owner_suggestions') or [], parties,
+            stamp=party_stamp,
         ),
         'funder': match_funder(
-            resolved_fields.get('funder_suggestions') or [], parties
+            resolved_fields.get('funder_suggestions') or [], parties,
+            stamp=party_stamp,
         ),
         'instrument_type': match_instrument_type(
             resolved_fields.get('instrument_type_suggestions') or [],
             taxonomy_terms,
+            stamp=terms_stamp,
         ),
         'measured_variable': match_measured_variable(
             resolved_fields.get('taxonomy_suggestions') or [],
             taxonomy_terms,
+            stamp=terms_stamp,
         ),
     }
 
 
-def match_manufacturer(suggestions: Iterable[dict], parties: List[dict]) -> List[dict]:
+def match_manufacturer(
+    suggestions: Iterable[dict],
+    parties: List[dict],
+    *,
+    stamp: Any = None,
+) -> List[dict]:
     return _match_party_suggestions(
         suggestions,
         parties,
+        stamp=stamp,
         suggested_field='manufacturer',
         role='Manufacturer',
         value_keys=('name',),
@@ -73,10 +101,16 @@ def match_manufacturer(suggestions: Iterable[dict], parties: List[dict]) -> List
     )
 
 
-def match_owner(suggestions: Iterable[dict], parties: List[dict]) -> List[dict]:
+def match_owner(
+    suggestions: Iterable[dict],
+    parties: List[dict],
+    *,
+    stamp: Any = None,
+) -> List[dict]:
     return _match_party_suggestions(
         suggestions,
         parties,
+        stamp=stamp,
         suggested_field='owner',
         role='Owner',
         value_keys=('name',),
@@ -85,10 +119,16 @@ def match_owner(suggestions: Iterable[dict], parties: List[dict]) -> List[dict]:
     )
 
 
-def match_funder(suggestions: Iterable[dict], parties: List[dict]) -> List[dict]:
+def match_funder(
+    suggestions: Iterable[dict],
+    parties: List[dict],
+    *,
+    stamp: Any = None,
+) -> List[dict]:
     return _match_party_suggestions(
         suggestions,
         parties,
+        stamp=stamp,
         suggested_field='funder',
         role='Funder',
         value_keys=('funderName', 'name'),
@@ -100,10 +140,13 @@ def match_funder(suggestions: Iterable[dict], parties: List[dict]) -> List[dict]
 def match_instrument_type(
     suggestions: Iterable[dict],
     taxonomy_terms: List[dict],
+    *,
+    stamp: Any = None,
 ) -> List[dict]:
     return _match_taxonomy_suggestions(
         suggestions,
         taxonomy_terms,
+        stamp=stamp,
         suggested_field='instrument_type',
         taxonomy_key='instrument',
         value_keys=('instrument_type_name', 'label', 'subject'),
@@ -114,10 +157,13 @@ def match_instrument_type(
 def match_measured_variable(
     suggestions: Iterable[dict],
     taxonomy_terms: List[dict],
+    *,
+    stamp: Any = None,
 ) -> List[dict]:
     return _match_taxonomy_suggestions(
         suggestions,
         taxonomy_terms,
+        stamp=stamp,
         suggested_field='measured_variable',
         taxonomy_key='measured_variable',
         value_keys=('subject', 'label', 'name'),
@@ -131,29 +177,38 @@ def _read_context(context: Optional[dict]) -> dict:
     return merged
 
 
-def _read_parties(context: dict) -> List[dict]:
+def _read_parties(context: dict) -> Tuple[List[dict], Any]:
+    # Bulk-loaded and cached in party_cache; the reconciliation context is
+    # already ignore_auth, so no per-party group_show is needed.
     try:
-        names = tk.get_action('group_list')(context, {'type': 'party'})
+        parties, loaded_at = party_cache.get_party_list_stamped()
+        return parties, ('parties', loaded_at)
     except Exception:
         log.exception('Failed to list local parties for DOI reconciliation')
-        return []
+        return [], None
+
+
+def invalidate_taxonomy_terms() -> None:
+    """Drop the cached taxonomy terms.  Call after any taxonomy term change."""
+    global _taxonomy_version
+    _taxonomy_terms_cache.clear()
+    _taxonomy_version += 1
 
-    parties = []
-    for name in names or []:
-        try:
-            party = tk.get_action('group_show')(
-                context, {'id': name, 'include_extras': True}
-            )
-        except Exception:
-            log.exception('Failed to read party %r for DOI reconciliation', name)
-            continue
-        parties.append(_flatten_extras(party))
-    return parties
 
+def _read_taxonomy_terms(context: dict) -> Tuple[List[dict], Any]:
+    """Return (terms, stamp); the stamp is None for an uncached partial read."""
+    entry = _taxonomy_terms_cache.get('terms')
+    if (
+        entry
+        and entry[0] == _taxonomy_version
+        and (time.time() - entry[1]) < _TAXONOMY_TERMS_TTL
+    ):
+        return entry[2], ('terms', entry[0], entry[1])
 
-def _read_taxonomy_terms(context: dict) -> List[dict]:
+    version = _taxonomy_version
     terms = []
-    for logical_key in ('instrument', 'platform', 'measured_variable'):
+    complete = True
+    for logical_key in _TAXONOMY_KEYS:
         taxonomy_name = get_taxonomy_name(logical_key)
         try:
             listed = tk.get_action('taxonomy_term_list')(
@@ -164,21 +219,20 @@ def _read_taxonomy_terms(context: dict) -> List[dict]:
                 'Failed to list taxonomy %r for DOI reconciliation',
                 taxonomy_name,
             )
+            complete = False
             continue
         for term in _flatten_terms(listed):
             item = dict(term)
             item['taxonomy_key'] = logical_key
             item['taxonomy_name'] = taxonomy_name
             terms.append(item)
-    return terms
 
-
-def _flatten_extras(item: dict) -> dict:
-    flattened = dict(item or {})
-    for extra in flattened.get('extras') or []:
-        if isinstance(extra, dict) and extra.get('key'):
-            flattened[extra['key']] = extra.get('value')
-    return flattened
+    # Don't cache a partial read; the next request retries the failed taxonomy.
+    if not complete:
+        return terms, None
+    loaded_at = time.time()
+    _taxonomy_terms_cache['terms'] = (version, loaded_at, terms)
+    return terms, ('terms', version, loaded_at)
 
 
 def _flatten_terms(terms: Iterable[dict]) -> List[dict]:
@@ -197,6 +251,7 @@ def _match_party_suggestions(
     suggestions: Iterable[dict],
     parties: List[dict],
     *,
+    stamp: Any,
     suggested_field: str,
     role: str,
     value_keys: Iterable[str],
@@ -204,10 +259,7 @@ def _match_party_suggestions(
     name_identifier_key: str,
 ) -> List[dict]:
     records = []
-    role_parties = [
-        party for party in parties
-        if _party_has_role(party, role)
-    ]
+    index = _party_identifier_index(parties, role, stamp)
     for suggestion in suggestions:
         if not isinstance(suggestion, dict):
             continue
@@ -220,7 +272,7 @@ def _match_party_suggestions(
             source_identifier,
             suggestion,
         )
-        matches = _find_party_matches(source_identifier, role_parties)
+        matches = list(index.get(_normalize_identifier(source_identifier), []))
         records.append(_matched_suggestion(
             suggestion,
             source_value=source_value,
@@ -237,26 +289,21 @@ def _match_taxonomy_suggestions(
     suggestions: Iterable[dict],
     taxonomy_terms: List[dict],
     *,
+    stamp: Any,
     suggested_field: str,
     taxonomy_key: str,
     value_keys: Iterable[str],
     identifier_keys: Iterable[str],
 ) -> List[dict]:
     records = []
-    scoped_terms = [
-        term for term in taxonomy_terms
-        if term.get('taxonomy_key') == taxonomy_key
-        or (
-            suggested_field == 'instrument_type'
-            and term.get('taxonomy_key') == 'platform'
-        )
-    ]
+    index = _term_identifier_index(
+        taxonomy_terms, suggested_field, taxonomy_key, stamp)
     for suggestion in suggestions:
         if not isinstance(suggestion, dict):
             continue
         source_value = _first_value(suggestion, value_keys)
         source_identifier = _first_value(suggestion, identifier_keys)
-        matches = _find_taxonomy_matches(source_identifier, scoped_terms)
+        matches = list(index.get(_normalize_identifier(source_identifier), []))
         records.append(_matched_suggestion(
             suggestion,
             source_value=source_value,
@@ -309,32 +356,69 @@ def _match_status(matches: List[dict]) -> str:
     return 'no_match'
 
 
-def _find_party_matches(identifier: str, parties: List[dict]) -> List[dict]:
-    normalized = _normalize_identifier(identifier)
-    if not normalized:
-        return []
-    return [
-        party for party in parties
-        if normalized in {
-            _normalize_identifier(party.get('party_identifier_ror')),
-            _normalize_identifier(party.get('party_identifier')),
-        }
-    ]
-
-
-def _find_taxonomy_matches(identifier: str, terms: List[dict]) -> List[dict]:
-    normalized = _normalize_identifier(identifier)
-    if not normalized:
-        return []
-    return [
-        term for term in terms
-        if normalized in {
-            _normalize_identifier(term.get('uri')),
-            _normalize_identifier(term.get('identifier')),
-            _normalize_identifier(term.get('value_uri')),
-            _normalize_identifier(term.get('valueURI')),
-        }
-    ]
+def _party_identifier_index(
+    parties: List[dict],
+    role: str,
+    stamp: Any = None,
+) -> Dict[str, List[dict]]:
+    """Return {normalized identifier: [party, ...]} for parties with *role*.
+
+    Memoized on *stamp*, so the party list is indexed once per party_cache
+    version rather than once per request.  Lists passed without a stamp are
+    indexed afresh.
+    """
+    global _party_index
+    if stamp is None or _party_index['stamp'] != stamp:
+        _party_index = {'stamp': stamp, 'by_role': {}}
+    by_role = _party_index['by_role']
+    if role not in by_role:
+        index = {}
+        for party in parties:
+            if not _party_has_role(party, role):
+                continue
+            for key in {
+                _normalize_identifier(party.get('party_identifier_ror')),
+                _normalize_identifier(party.get('party_identifier')),
+            } - {''}:
+                index.setdefault(key, []).append(party)
+        by_role[role] = index
+    return by_role[role]
+
+
+def _term_identifier_index(
+    terms: List[dict],
+    suggested_field: str,
+    taxonomy_key: str,
+    stamp: Any = None,
+) -> Dict[str, List[dict]]:
+    """Return {normalized identifier: [term, ...]} for terms in scope.
+
+    Instrument types may also match platform terms.  Memoized on *stamp*
+    like _party_identifier_index.
+    """
+    global _term_index
+    if stamp is None or _term_index['stamp'] != stamp:
+        _term_index = {'stamp': stamp, 'by_field': {}}
+    by_field = _term_index['by_field']
+    cache_key = (suggested_field, taxonomy_key)
+    if cache_key not in by_field:
+        index = {}
+        for term in terms:
+            in_scope = term.get('taxonomy_key') == taxonomy_key or (
+                suggested_field == 'instrument_type'
+                and term.get('taxonomy_key') == 'platform'
+            )
+            if not in_scope:
+                continue
+            for key in {
+                _normalize_identifier(term.get('uri')),
+                _normalize_identifier(term.get('identifier')),
+                _normalize_identifier(term.get('value_uri')),
+                _normalize_identifier(term.get('valueURI')),
+            } - {''}:
+                index.setdefault(key, []).append(term)
+        by_field[cache_key] = index
+    return by_field[cache_key]
 
 
 def _party_has_role(party: dict, role: str) -> bool:
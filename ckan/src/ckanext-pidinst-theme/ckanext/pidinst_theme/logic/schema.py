@@ -63,6 +63,11 @@ def pidinst_resolve_doi_metadata():
         'identifier': [not_empty, unicode_safe],
     }
 
+
+# Appended to every dataset search by before_dataset_search.
+_EXCLUDED_STATUS_FQ = '-extras_publication_status:withdrawn -extras_publication_status:duplicate'
+
+
 @tk.chained_action
 def before_dataset_search(search_params):
     """
@@ -71,8 +76,7 @@ def before_dataset_search(search_params):
     search_params['include_private'] = 'True'
     # Append to any existing fq rather than overwriting it.
     existing_fq = search_params.get('fq', '')
-    exclude_statuses = '-extras_publication_status:withdrawn -extras_publication_status:duplicate'
-    fq = (existing_fq + ' ' + exclude_statuses).strip()
+    fq = (existing_fq + ' ' + _EXCLUDED_STATUS_FQ).strip()
 
     # --- Date range filters ---
     # Strip invalid fq clauses CKAN's group controller may have added,
@@ -85,6 +89,9 @@ def before_dataset_search(search_params):
         return search_params
 
     if any(request_args.get(p) for p in _DATE_PARAMS):
+        # Range clauses may already be in fq, or in a tagged fq_list entry
+        # (single-query search on /instruments and /platforms).
+        applied = ' '.join([fq] + list(search_params.get('fq_list') or []))
         # Strip invalid fq clauses CKAN's group controller may have added
         for param in _DATE_PARAMS:
             fq = re.sub(r'\s*\+?' + re.escape(param) + r':"[^"]*"', '', fq)
@@ -95,9 +102,9 @@ def before_dataset_search(search_params):
             q_start = _parse_date_bound(from_val, is_end=False)
             q_end = _parse_date_bound(to_val, is_end=True)
             # Only add if not already present (avoids double-applying on /instruments)
-            if q_start is not None and f'{end_field}:[{q_start}' not in fq:
+            if q_start is not None and f'{end_field}:[{q_start}' not in applied:
                 fq += f' +{end_field}:[{q_start} TO *]'
-            if q_end is not None and f'{start_field}:[* TO {q_end}]' not in fq:
+            if q_end is not None and f'{start_field}:[* TO {q_end}]' not in applied:
                 fq += f' +{start_field}:[* TO {q_end}]'
 
     search_params['fq'] = fq
@@ -2,33 +2,172 @@
 
 Extracted into its own module so it can be imported by both views.py
 (cache population) and logic/action.py (invalidation) without creating
-circular imports.
+circular imports.  Storage is pluggable (see ``BACKEND_CONFIG_KEY``): a
+per-process dict by default, or Redis so that invalidations and rebuilt
+trees are shared across uWSGI workers.  Also home to the bulk party loader
+shared by the party trees, the party select helpers and DOI reconciliation.
 """
 
+import logging
+import pickle
+import threading
 import time
 
-_cache = {}
+log = logging.getLogger(__name__)
+
 _PARTY_CACHE_TTL = 300  # seconds
+_MEMORY_MAX_ENTRIES = 1000
+
+# Backend selection: "memory" (per-process dict, the default) or "redis"
+# (shared by every worker through CKAN's own Redis connection).
+BACKEND_CONFIG_KEY = 'ckanext.pidinst_theme.party_cache.backend'
+_REDIS_PREFIX = 'ckanext-pidinst-theme:party-cache'
+
+
+class MemoryBackend:
+    """Per-process dict.  invalidate() only reaches the current worker.
+
+    Expired entries are dropped when read, and when the dict reaches
+    ``max_entries`` a write first drops every expired entry and then, if
+    still full, the oldest ones.
+    """
+
+    def __init__(self, ttl=_PARTY_CACHE_TTL, max_entries=_MEMORY_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache = {}
+        self._version = 0  # incremented on every invalidation
+
+    def get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if (time.time() - entry[0]) < self.ttl:
+            return entry[1]
+        self._cache.pop(key, None)
+        return None
+
+    def set(self, key, value):
+        if key not in self._cache and len(self._cache) >= self.max_entries:
+            self._evict()
+        self._cache[key] = (time.time(), value)
+
+    def _evict(self):
+        now = time.time()
+        entries = sorted(self._cache.items(), key=lambda item: item[1][0])
+        excess = len(entries) - self.max_entries + 1
+        for i, (key, (stored_at, _value)) in enumerate(entries):
+            if i >= excess and (now - stored_at) < self.ttl:
+                break
+            self._cache.pop(key, None)
+
+    def invalidate(self):
+        self._cache.clear()
+        self._version += 1
+
+    def version(self):
+        return self._version
+
+
+class RedisBackend:
+    """Cache shared by all workers, with a global version counter.
+
+    Entries are stored under the current version, so invalidate() is a
+    single INCR that every worker sees on its next lookup; entries of
+    older versions simply expire.  A value built by one worker is reused
+    by the others.  Redis errors are logged and treated as cache misses.
+    """
+
+    def __init__(self, client, ttl=_PARTY_CACHE_TTL, prefix=_REDIS_PREFIX):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _version_key(self):
+        return f'{self.prefix}:version'
+
+    def _entry_key(self, version, key):
+        return f'{self.prefix}:{version}:{key!r}'
+
+    def get(self, key):
+        try:
+            raw = self.client.get(self._entry_key(self.version(), key))
+        except Exception as e:
+            log.warning('Party cache read failed: %s', e)
+            return None
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        try:
+            self.client.set(
+                self._entry_key(self.version(), key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                ex=self.ttl,
+            )
+        except Exception as e:
+            log.warning('Party cache write failed: %s', e)
+
+    def invalidate(self):
+        try:
+            self.client.incr(self._version_key())
+        except Exception as e:
+            log.warning('Party cache invalidation failed: %s', e)
+
+    def version(self):
+        return int(self.client.get(self._version_key()) or 0)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend_from_config(ttl=_PARTY_CACHE_TTL, prefix=_REDIS_PREFIX):
+    """Create the backend selected by ``BACKEND_CONFIG_KEY``.
 
-_version = 0  # incremented on every invalidation
+    Also used by facet_cache, with its own TTL and Redis key prefix.
+    """
+    import ckan.plugins.toolkit as toolkit
+
+    name = (toolkit.config.get(BACKEND_CONFIG_KEY) or 'memory').strip().lower()
+    if name == 'redis':
+        from ckan.lib.redis import connect_to_redis
+        return RedisBackend(connect_to_redis(), ttl=ttl, prefix=prefix)
+    if name != 'memory':
+        log.warning('Unknown %s %r; using the in-process cache',
+                    BACKEND_CONFIG_KEY, name)
+    return MemoryBackend(ttl=ttl)
+
+
+def get_backend():
+    """Return the configured cache backend (created on first use)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = backend_from_config()
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the cache backend, e.g. with a ``RedisBackend`` in tests."""
+    global _backend
+    _backend = backend
 
 
 def cache_get(key):
-    entry = _cache.get(key)
-    if entry and (time.time() - entry[0]) < _PARTY_CACHE_TTL:
-        return entry[1]
-    return None
+    return get_backend().get(key)
 
 
 def cache_set(key, value):
-    _cache[key] = (time.time(), value)
+    get_backend().set(key, value)
 
 
 def invalidate():
-    """Clear the party tree cache.  Call after any party create/update/delete."""
-    global _version
-    _cache.clear()
-    _version += 1
+    """Clear the party tree cache.  Call after any party create/update/delete.
+
+    With the Redis backend this reaches every worker.
+    """
+    get_backend().invalidate()
 
 
 def get_version():
@@ -37,4 +176,102 @@ def get_version():
     Increments on every invalidation; clients can use this to detect
     when their cached copy is stale.
     """
-    return _version
+    try:
+        return get_backend().version()
+    except Exception as e:
+        log.warning('Party cache version read failed: %s', e)
+        return 0
+
+
+def load_party_metadata():
+    """Load all party groups with merged extras.  Returns {slug: merged_dict}.
+
+    Uses two raw SQL queries total, bypassing the CKAN group_list/group_show
+    action layer which computes package counts, member counts and image URLs
+    for every group — a significant source of latency we don't need here.
+
+    The result is cached until the next invalidate() (i.e. for the current
+    get_version()) or the TTL expires.  Callers must not mutate it.
+    """
+    cached = cache_get('_party_metadata')
+    if cached is not None:
+        log.debug('[PERF] load_party_metadata: cache HIT')
+        return cached
+
+    import ckan.model as _model  # local import to keep module-level imports clean
+
+    _t0 = time.time()
+
+    # Query 1: only the three columns we actually use — no computed fields.
+    group_rows = (
+        _model.Session.query(
+            _model.Group.id,
+            _model.Group.name,
+            _model.Group.title,
+        )
+        .filter(_model.Group.type == 'party')
+        .filter(_model.Group.state == 'active')
+        .all()
+    )
+    _t1 = time.time()
+    log.info('[PERF] load_party_metadata: SQL group query returned %d parties in %.3fs',
+             len(group_rows), _t1 - _t0)
+
+    # Query 2: all extras for those groups in a single IN(...) query.
+    group_ids = [row.id for row in group_rows]
+    extras_by_group = {}
+    if group_ids:
+        extra_rows = (
+            _model.Session.query(_model.GroupExtra)
+            .filter(_model.GroupExtra.group_id.in_(group_ids))
+            .filter(_model.GroupExtra.state == 'active')
+            .all()
+        )
+        for row in extra_rows:
+            extras_by_group.setdefault(row.group_id, {})[row.key] = row.value
+    _t2 = time.time()
+    log.info('[PERF] load_party_metadata: batched extras query returned %d rows in %.3fs',
+             sum(len(v) for v in extras_by_group.values()), _t2 - _t1)
+
+    parties = {}
+    for row in group_rows:
+        merged = {
+            'id':    row.id,
+            'name':  row.name,
+            'title': row.title or row.name,
+        }
+        merged.update(extras_by_group.get(row.id, {}))
+        parties[row.name] = merged
+
+    cache_set('_party_metadata', parties)
+    log.info('[PERF] load_party_metadata: total MISS path %.3fs', time.time() - _t0)
+    return parties
+
+
+def get_party_list():
+    """Return all parties from load_party_metadata() sorted by title.
+
+    The sorted list is cached alongside the metadata.  Callers must not
+    mutate it.
+    """
+    return get_party_list_stamped()[0]
+
+
+def get_party_list_stamped():
+    """Return ``(parties, loaded_at)``: get_party_list() and its build time.
+
+    ``loaded_at`` is stored with the cached list, so it is the same for
+    every cache hit (on every worker, with Redis) and changes whenever the
+    list is rebuilt, after an invalidation or when the TTL expires.
+    Callers can key derived data on it.
+    """
+    cached = cache_get('_party_list')
+    if cached is not None:
+        return cached
+    parties = sorted(
+        load_party_metadata().values(),
+        key=lambda x: (x.get('title') or '').lower(),
+    )
+    entry = (parties, time.time())
+    cache_set('_party_list', entry)
+    return entry
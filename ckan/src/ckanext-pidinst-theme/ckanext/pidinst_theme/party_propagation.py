@@ -86,13 +86,44 @@ def _package_references_party(pkg, party_name):
     return False
 
 
+def party_slugs_from_package(pkg):
+    """Return the set of party slugs referenced by *pkg*'s party composites."""
+    slugs = set()
+    for comp_field, cfg in _FIELD_MAP.items():
+        for entry in parse_composite(pkg.get(comp_field)):
+            slug = (entry.get(cfg['party_id_key']) or '').strip()
+            if slug:
+                slugs.add(slug)
+    return slugs
+
+
+def _party_search_fq(party_name):
+    """Solr filter matching packages that reference *party_name*.
+
+    ``vocab_party_slug`` is populated from the owner/funder/manufacturer
+    composites in ``before_dataset_index``.  ``groups`` (kept in sync by
+    ``PidinstThemePlugin._sync_party_groups``) is ORed in so packages indexed
+    before ``vocab_party_slug`` existed are still found.
+    """
+    slug = party_name.replace('\\', '\\\\').replace('"', '\\"')
+    return f'vocab_party_slug:"{slug}" OR groups:"{slug}"'
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 def find_instruments_referencing_party(party_name):
-    """Return instrument package dicts that reference *party_name*."""
-    return [pkg for pkg in search_instruments()
+    """Return instrument package dicts that reference *party_name*.
+
+    Only the packages indexed against the party slug are fetched, so the
+    cost is proportional to the number of referencing instruments rather
+    than the size of the registry.  Each candidate is re-checked against its
+    composites to drop stale index hits.
+    """
+    if not party_name:
+        return []
+    return [pkg for pkg in search_instruments(fq=_party_search_fq(party_name))
             if _package_references_party(pkg, party_name)]
 
 
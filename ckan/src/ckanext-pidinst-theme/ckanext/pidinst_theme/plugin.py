@@ -1,4 +1,5 @@
 import json
+import re
 
 import ckan.plugins as plugins
 import ckan.plugins.toolkit as toolkit
@@ -12,6 +13,10 @@ from ckanext.pidinst_theme import helpers
 from ckanext.pidinst_theme import analytics
 from ckanext.pidinst_theme import doi_policy
 from ckanext.pidinst_theme import relation_sync
+from ckanext.pidinst_theme import party_cache
+from ckanext.pidinst_theme import party_propagation
+from ckanext.pidinst_theme import facet_cache
+from ckanext.pidinst_theme import field_terms_index
 from ckanext.pidinst_theme import smtp_compat  # noqa: F401  (patches smtplib on import)
 
 import ckan.model as model
@@ -100,6 +105,92 @@ def _apply_or_within_block_for_group_page(fq):
     return fq.strip()
 
 
+def _owner_or_funder_party_values(owners, funders):
+    """Distinct owner/funder parties of a package, as party slugs.
+
+    An entry may reference its party by slug, group id or just the party's
+    name, so each is resolved through the party metadata before
+    de-duplicating; otherwise a party listed once by slug and once by name
+    would be counted twice.  Unknown parties fall back to the lower-cased
+    name.
+    """
+    parties = party_cache.load_party_metadata()
+    lookup = views._party_slug_lookup(
+        parties, {slug: p.get('title') for slug, p in parties.items()})
+    for slug, party in parties.items():
+        if party.get('id'):
+            lookup.setdefault(party['id'], slug)
+
+    values = set()
+    for items, id_key, name_key in ((owners, "owner_party_id", "owner_name"),
+                                    (funders, "funder_party_id", "funder_name")):
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            refs = [str(item.get(key) or "").strip() for key in (id_key, name_key)]
+            refs = [ref for ref in refs if ref]
+            if not refs:
+                continue
+            slugs = (views._lookup_party_slug(ref, lookup) for ref in refs)
+            values.add(next((slug for slug in slugs if slug), refs[0].lower()))
+    return sorted(values)
+
+
+def _group_page_request():
+    """Return (request path, whether it is an org/party page)."""
+    try:
+        path = toolkit.request.path
+    except RuntimeError:
+        return '<no-request>', False
+    return path, path.startswith('/organization/') or path.startswith('/party/')
+
+
+# Scope clause CKAN's group read view puts at the start of its fq.
+_GROUP_SCOPE_FQ_RE = re.compile(r'\s*((?:owner_org|groups):"[^"]*")(.*)$', re.S)
+
+
+def _tag_group_page_filters(search_params):
+    """Fetch an org/party page's stable checkbox facets with its main query.
+
+    The group read view's fq is its scope clause followed by the filter
+    clauses.  Moving the filters into a tagged fq_list entry and requesting
+    the checkbox facets again with that tag excluded (see views._FILTER_TAG)
+    lets after_dataset_search hand the baseline counts to
+    h.pidinst_group_filter_facet_items without a second query.  Only the
+    page's main query (rows > 0, no text query) is rewritten; anything
+    unexpected leaves search_params unchanged.
+    """
+    if search_params.get('q') not in (None, '', '*:*'):
+        return search_params
+    try:
+        rows = int(search_params.get('rows') or 0)
+    except (TypeError, ValueError):
+        return search_params
+    if rows <= 0 or not search_params.get('facet.field'):
+        return search_params
+
+    match = _GROUP_SCOPE_FQ_RE.match(search_params.get('fq', ''))
+    if not match or schema._EXCLUDED_STATUS_FQ not in match.group(2):
+        return search_params
+    scope, rest = match.groups()
+    filters = re.sub(
+        r'\s*' + re.escape(schema._EXCLUDED_STATUS_FQ), '', rest, count=1).strip()
+
+    search_params['fq'] = f'{scope} {schema._EXCLUDED_STATUS_FQ}'
+    if filters:
+        search_params['fq_list'] = list(search_params.get('fq_list') or []) + [
+            views._tagged_filter_query([filters])]
+    search_params['facet.field'] = list(search_params['facet.field']) + (
+        views._stable_facet_field_params(views._CHECKBOX_FACET_FIELDS))
+    try:
+        limit = int(search_params.get('facet.limit') or 0)
+    except (TypeError, ValueError):
+        limit = 0
+    if limit != -1 and limit < views._STABLE_FACET_LIMIT:
+        search_params['facet.limit'] = views._STABLE_FACET_LIMIT
+    return search_params
+
+
 class PidinstThemePlugin(plugins.SingletonPlugin):
     plugins.implements(plugins.IConfigurer)
     plugins.implements(plugins.IPackageController, inherit=True)
@@ -180,6 +271,13 @@ class PidinstThemePlugin(plugins.SingletonPlugin):
         toolkit.add_public_directory(config_, '/shared/public')
         toolkit.add_public_directory(config_, "public")
         toolkit.add_resource("assets", "pidinst_theme")
+        # The search pages send {!lucene tag=...}/{!lucene ex=...} local params
+        # to get stable facets from the same query (see views._FILTER_TAG).
+        allowed_parsers = toolkit.aslist(
+            config_.get('ckan.search.solr_allowed_query_parsers') or [])
+        if 'lucene' not in allowed_parsers:
+            config_['ckan.search.solr_allowed_query_parsers'] = (
+                allowed_parsers + ['lucene'])
         # Initialise backend analytics eagerly so startup logs reveal config problems
         # (SDK missing, WRITE_KEY absent, etc.) instead of silently failing on first event.
         analytics.AnalyticsTracker.initialize()
@@ -261,6 +359,17 @@ class PidinstThemePlugin(plugins.SingletonPlugin):
         funders = _load_list(pkg_dict.get("funder"))
         pkg_dict["vocab_funder_party"] = _extract_names(funders, "funder_name")
 
+        # Distinct owner/funder parties so the party tree can count packages
+        # per party from a single facet query even when a package lists the
+        # same party in both roles.
+        pkg_dict["vocab_owner_or_funder_party"] = _owner_or_funder_party_values(
+            owners, funders)
+
+        # Party slugs referenced by any owner/funder/manufacturer entry, so
+        # party propagation can query the referencing packages directly.
+        pkg_dict["vocab_party_slug"] = sorted(
+            party_propagation.party_slugs_from_package(pkg_dict))
+
         measured_vars = _load_list(pkg_dict.get("measured_variable"))
         all_mv, gcmd_mv, custom_mv = _split_by_source(measured_vars, "measured_variable_name")
         pkg_dict["vocab_measured_variable"] = all_mv
@@ -447,7 +556,13 @@ class PidinstThemePlugin(plugins.SingletonPlugin):
         # Sync party group membership
         self._sync_party_groups(context, pkg_dict)
 
+        field_terms_index.invalidate()
+        facet_cache.invalidate()
+
     def after_dataset_update(self, context, pkg_dict):
+        field_terms_index.invalidate()
+        facet_cache.invalidate()
+
         # Skip analytics tracking when the update was triggered internally
         # (e.g. the package_patch call inside after_dataset_create that sets
         # version_handler_id).  The caller sets _analytics_suppress=True to
@@ -507,6 +622,9 @@ class PidinstThemePlugin(plugins.SingletonPlugin):
                 logging.error('Failed to cleanup reciprocals: %s', e)
 
     def after_dataset_delete(self, context, pkg_dict):
+        field_terms_index.invalidate()
+        facet_cache.invalidate()
+
         try:
             relation_sync.cleanup_reciprocals(context, pkg_dict)
         except Exception as e:
@@ -522,90 +640,101 @@ class PidinstThemePlugin(plugins.SingletonPlugin):
         Reads party IDs from the ``owner``, ``funder``, and
         ``manufacturer`` composite fields and ensures the package is a
         member of exactly those party groups.
+
+        Runs on every dataset create/update (including bulk ingests and
+        propagation jobs), so it is kept cheap: the current memberships
+        (with their group names) come from one query, and when they
+        already match the composites (the composites did not change)
+        nothing is written.  Group ids for new memberships come from the
+        cached ``party_cache.load_party_metadata()``, falling back to the
+        DB for names the cache does not know yet.
+        Otherwise all membership rows are changed in one transaction, the
+        way ``member_create``/``member_delete`` would.
         """
         try:
             pkg_id = pkg_dict.get('id')
             if not pkg_id:
                 return
 
-            # ---- Desired party IDs from composite fields ------------- #
-            desired = set()
-
-            # Helper to extract party IDs from a composite repeating field
-            def _collect_party_ids(field_name, id_key):
-                raw = pkg_dict.get(field_name)
-                if not raw:
-                    return
-                if isinstance(raw, str):
-                    try:
-                        entries = json.loads(raw)
-                    except (json.JSONDecodeError, ValueError):
-                        entries = []
-                elif isinstance(raw, list):
-                    entries = raw
-                else:
-                    entries = []
-                for entry in entries:
-                    party_id = (entry.get(id_key) or '').strip()
-                    if party_id:
-                        desired.add(party_id)
-
-            _collect_party_ids('owner', 'owner_party_id')
-            _collect_party_ids('funder', 'funder_party_id')
-            _collect_party_ids('manufacturer', 'manufacturer_party_id')
+            # ---- Desired party groups from composite fields ----------- #
+            desired = party_propagation.party_slugs_from_package(pkg_dict)
 
             # ---- Current party group memberships --------------------- #
-            ctx = {'ignore_auth': True}
-
-            # All party group names in the system
-            all_party_names = set(
-                toolkit.get_action('group_list')(ctx, {'type': 'party'})
+            # All rows (any state) so removed memberships can be revived,
+            # keyed by the group name from the DB rather than the party
+            # cache: a party created on another worker may not be in this
+            # process's cache yet, and its membership must not be dropped.
+            rows = (
+                model.Session.query(model.Member, model.Group.name)
+                .join(model.Group, model.Group.id == model.Member.group_id)
+                .filter(model.Member.table_name == 'package')
+                .filter(model.Member.table_id == pkg_id)
+                .filter(model.Group.type == 'party')
+                .filter(model.Group.state == 'active')
+                .order_by(model.Member.state.asc())
+                .all()
             )
-
-            # Current groups this package belongs to.
-            # pkg_dict is the full package result already returned by
-            # package_create / package_update, so no extra package_show is needed.
-            current_party_groups = {
-                g['name'] for g in pkg_dict.get('groups', [])
-                if g.get('name') in all_party_names
+            rows_by_name = {}
+            for row, name in rows:
+                rows_by_name.setdefault(name, row)  # 'active' first
+            current = {
+                name for name, row in rows_by_name.items()
+                if row.state == 'active'
             }
 
             # ---- Reconcile ------------------------------------------------ #
-            to_add = (desired & all_party_names) - current_party_groups
-            to_remove = current_party_groups - desired
+            to_add = desired - current
+            to_remove = current - desired
+            if not to_add and not to_remove:
+                return
 
-            for fac_id in to_add:
-                try:
-                    toolkit.get_action('member_create')(ctx, {
-                        'id': fac_id,
-                        'object': pkg_id,
-                        'object_type': 'package',
-                        'capacity': 'public',
-                    })
-                except Exception as e:
-                    logging.error(
-                        'Failed to add package %s to party group %s: %s',
-                        pkg_id, fac_id, e,
+            group_ids = {
+                name: rows_by_name[name].group_id
+                for name in to_add if name in rows_by_name
+            }
+            parties = party_cache.load_party_metadata()
+            for name in to_add - set(group_ids):
+                if name in parties:
+                    group_ids[name] = parties[name]['id']
+            missing = to_add - set(group_ids)
+            if missing:
+                # Not in the (possibly stale) cache: ask the DB; names
+                # that are not party groups at all are ignored.
+                group_ids.update(
+                    (name, group_id) for group_id, name in (
+                        model.Session.query(model.Group.id, model.Group.name)
+                        .filter(model.Group.name.in_(missing))
+                        .filter(model.Group.type == 'party')
+                        .filter(model.Group.state == 'active')
+                        .all()
                     )
+                )
+            added = set(group_ids)
+            if not added and not to_remove:
+                return
 
-            for fac_id in to_remove:
-                try:
-                    toolkit.get_action('member_delete')(ctx, {
-                        'id': fac_id,
-                        'object': pkg_id,
-                        'object_type': 'package',
-                    })
-                except Exception as e:
-                    logging.error(
-                        'Failed to remove package %s from party group %s: %s',
-                        pkg_id, fac_id, e,
+            for name, group_id in group_ids.items():
+                member = rows_by_name.get(name)
+                if member is None:
+                    member = model.Member(
+                        table_name='package',
+                        table_id=pkg_id,
+                        group_id=group_id,
                     )
+                member.state = 'active'
+                member.capacity = 'public'
+                model.Session.add(member)
 
-            if to_add or to_remove:
-                logging.info(
-                    'Party group sync for %s: added=%s removed=%s',
-                    pkg_id, to_add, to_remove,
-                )
+            for name in to_remove:
+                rows_by_name[name].state = 'deleted'
+
+            if not context.get('defer_commit'):
+                model.repo.commit()
+
+            logging.info(
+                'Party group sync for %s: added=%s removed=%s',
+                pkg_id, added, to_remove,
+            )
 
         except Exception as e:
             logging.exception('Failed to sync party groups for %s: %s',
@@ -627,13 +756,7 @@ class PidinstThemePlugin(plugins.SingletonPlugin):
 
     def before_dataset_search(self, search_params):
         search_params = schema.before_dataset_search(search_params)
-        path = '<no-request>'
-        is_group_page = False
-        try:
-            path = toolkit.request.path
-            is_group_page = path.startswith('/organization/') or path.startswith('/party/')
-        except RuntimeError:
-            pass
+        path, is_group_page = _group_page_request()
         if is_group_page:
             original_fq = search_params.get('fq', '')
             rewritten_fq = _apply_or_within_block_for_group_page(original_fq)
@@ -642,8 +765,25 @@ class PidinstThemePlugin(plugins.SingletonPlugin):
                 path, original_fq, rewritten_fq,
             )
             search_params['fq'] = rewritten_fq
+            search_params = _tag_group_page_filters(search_params)
         return search_params
 
+    def after_dataset_search(self, search_results, search_params):
+        if not _group_page_request()[1]:
+            return search_results
+        stable = views._pop_stable_facets(
+            search_results.get('search_facets', {}), views._CHECKBOX_FACET_FIELDS)
+        if stable is not None:
+            # Popped before package_search sorts its facets, so match the
+            # order CKAN gives the ones left behind.
+            for facet in stable.values():
+                facet['items'] = sorted(
+                    facet.get('items', []),
+                    key=lambda item: item['display_name'], reverse=True)
+            # Read by h.pidinst_group_filter_facet_items later in the request.
+            toolkit.g.pidinst_group_stable_facets = stable
+        return search_results
+
     # IAuthFunctions
 
     def get_auth_functions(self):
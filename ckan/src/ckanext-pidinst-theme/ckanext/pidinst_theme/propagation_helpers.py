@@ -18,7 +18,11 @@ log = logging.getLogger(__name__)
 # Job state is stored in CKAN's ``task_status`` table so that any worker
 # process can read the progress of a job started on another worker.  An
 # in-process write-through cache keyed by entity_key avoids issuing a DB
-# query on every progress poll from the same worker.
+# query on every progress poll from the same worker.  Per-instrument
+# progress is buffered in the running worker and flushed on a time/count
+# cadence (see ``_FLUSH_INTERVAL``).  There is no timer: the flush happens
+# on the next tick, so pollers on other workers lag by up to the interval
+# plus the time spent on one instrument.
 #
 # NOTE: ``task_status`` is a core CKAN model table that exists in every
 # deployment, so no migration is needed.
@@ -33,6 +37,20 @@ _JOB_TTL = 120
 
 _TASK_TYPE = 'pidinst_propagation'
 
+# Progress from job_tick / job_fail is buffered in memory and written to
+# task_status by the first call made _FLUSH_INTERVAL seconds after the
+# job's last write, or after _FLUSH_EVERY calls, instead of one
+# read-modify-write + commit per instrument.
+# job_finish (and run_propagation, even on error) always flushes.
+_FLUSH_INTERVAL = 0.25  # seconds
+_FLUSH_EVERY = 50
+
+_progress_lock = threading.Lock()
+# Maps job_id -> unflushed counter deltas for jobs running in this process.
+_pending_progress: dict = {}
+# Maps job_id -> time.monotonic() of the job's last task_status write.
+_last_flush: dict = {}
+
 
 def _task_id(job_id: str) -> str:
     """Stable task_status entity_id for a propagation job."""
@@ -132,31 +150,84 @@ def _update_task_field(job_id: str, **fields) -> None:
 def job_set_total(job_id: str, total: int) -> None:
     """Called once the total instrument count is known."""
     _update_task_field(job_id, total=total, status='running')
+    with _progress_lock:
+        _last_flush[job_id] = time.monotonic()
+
+
+def _record_progress(job_id: str, **deltas) -> None:
+    """Add *deltas* to the job's buffered counters; flush when due."""
+    now = time.monotonic()
+    with _progress_lock:
+        pending = _pending_progress.get(job_id)
+        if pending is None:
+            pending = _pending_progress[job_id] = {
+                'done': 0, 'updated': 0, 'failures': 0, 'calls': 0,
+            }
+        for name, delta in deltas.items():
+            pending[name] += delta
+        pending['calls'] += 1
+        due = (pending['calls'] >= _FLUSH_EVERY
+               or now - _last_flush.setdefault(job_id, now) >= _FLUSH_INTERVAL)
+    if due:
+        job_flush(job_id)
+
+
+def _take_pending(job_id: str) -> dict | None:
+    """Pop the buffered counters for *job_id* (None if there are none)."""
+    with _progress_lock:
+        pending = _pending_progress.pop(job_id, None)
+        if pending is None or not pending['calls']:
+            return None
+        _last_flush[job_id] = time.monotonic()
+    return pending
 
 
-def job_tick(job_id: str, updated: bool) -> None:
-    """Record one processed instrument."""
-    state = _read_task(job_id)
-    if state is None:
+def _forget_job(job_id: str) -> None:
+    """Drop this process's buffered state for *job_id* once it has stopped."""
+    with _progress_lock:
+        _pending_progress.pop(job_id, None)
+        _last_flush.pop(job_id, None)
+
+
+def _apply_pending(state: dict, pending: dict | None) -> None:
+    if pending is None:
         return
-    state['done'] = state.get('done', 0) + 1
-    if updated:
-        state['updated'] = state.get('updated', 0) + 1
-    _write_task(job_id, state)
+    for name in ('done', 'updated', 'failures'):
+        state[name] = state.get(name, 0) + pending[name]
+
+
+def job_tick(job_id: str, updated: bool) -> None:
+    """Record one processed instrument (buffered; see ``job_flush``)."""
+    _record_progress(job_id, done=1, updated=1 if updated else 0)
 
 
 def job_fail(job_id: str) -> None:
-    """Record one failed instrument."""
+    """Record one failed instrument (buffered; see ``job_flush``)."""
+    _record_progress(job_id, failures=1)
+
+
+def job_flush(job_id: str) -> None:
+    """Write buffered progress for *job_id* to task_status now."""
+    pending = _take_pending(job_id)
+    if pending is None:
+        return
     state = _read_task(job_id)
     if state is None:
         return
-    state['failures'] = state.get('failures', 0) + 1
+    _apply_pending(state, pending)
     _write_task(job_id, state)
 
 
 def job_finish(job_id: str) -> None:
-    """Mark the job as done."""
-    _update_task_field(job_id, status='done', finished_at=time.time())
+    """Flush buffered progress and mark the job as done (one write)."""
+    pending = _take_pending(job_id)
+    _forget_job(job_id)
+    state = _read_task(job_id)
+    if state is None:
+        return
+    _apply_pending(state, pending)
+    state.update(status='done', finished_at=time.time())
+    _write_task(job_id, state)
 
 
 def _find_job_id_by_entity_key(entity_key: str) -> str | None:
@@ -258,22 +329,29 @@ def parse_composite(raw):
 _SEARCH_PAGE_SIZE = 500
 
 
-def search_instruments():
+def search_instruments(fq=None):
     """Return all instrument packages via paginated package_search.
 
     Fetches in pages of ``_SEARCH_PAGE_SIZE`` records so that the function
     remains correct as the registry grows beyond a few thousand instruments,
     rather than relying on a fixed ``rows=10000`` cap.
+
+    *fq* is an optional extra Solr filter ANDed with the instrument type
+    filter, letting callers fetch only the packages they care about instead
+    of paging through the whole registry.
     """
     results = []
     start = 0
     action = toolkit.get_action('package_search')
     ctx = {'ignore_auth': True}
+    search_fq = 'dataset_type:instrument'
+    if fq:
+        search_fq = f'+{search_fq} +({fq})'
     try:
         while True:
             page = action(ctx, {
                 'q': '*:*',
-                'fq': 'dataset_type:instrument',
+                'fq': search_fq,
                 'rows': _SEARCH_PAGE_SIZE,
                 'start': start,
             })
@@ -323,22 +401,32 @@ def run_propagation(instruments, update_fn, entity_label, job_id=None):
         'instruments_updated': 0,
         'failures': [],
     }
-    for pkg in instruments:
-        updated = False
-        try:
-            updated = update_fn(pkg)
-            if updated:
-                summary['instruments_updated'] += 1
-        except Exception as exc:
-            pkg_id = pkg.get('id', '?')
-            log.error('Propagation FAILED for %s (%s): %s',
-                      pkg_id, entity_label, exc)
-            summary['failures'].append({'id': pkg_id, 'error': str(exc)})
-            if job_id:
-                job_fail(job_id)
-        finally:
-            if job_id:
-                job_tick(job_id, updated=updated)
+    try:
+        for pkg in instruments:
+            updated = False
+            try:
+                updated = update_fn(pkg)
+                if updated:
+                    summary['instruments_updated'] += 1
+            except Exception as exc:
+                pkg_id = pkg.get('id', '?')
+                log.error('Propagation FAILED for %s (%s): %s',
+                          pkg_id, entity_label, exc)
+                summary['failures'].append({'id': pkg_id, 'error': str(exc)})
+                if job_id:
+                    job_fail(job_id)
+            finally:
+                if job_id:
+                    job_tick(job_id, updated=updated)
+    except BaseException:
+        # Never leave progress buffered if the loop is interrupted;
+        # job_finish below does the final flush on the normal path.
+        if job_id:
+            try:
+                job_flush(job_id)
+            finally:
+                _forget_job(job_id)
+        raise
 
     if job_id:
         job_finish(job_id)
@@ -35,33 +35,65 @@ def _entry_matches_term(entry, cfg, term_uri, term_label):
     return False
 
 
-def _package_references_term(pkg, term_uri, term_label):
-    for field_name, cfg in _FIELD_MAP.items():
-        for entry in parse_composite(pkg.get(field_name)):
-            if _entry_matches_term(entry, cfg, term_uri, term_label):
-                return True
-    return False
-
-
 def _term_match_values(term_dict, old_term=None):
     """Return (uri, label) to search for, preferring old_term when given."""
     source = old_term if old_term else term_dict
     return (source.get('uri') or '').strip(), (source.get('label') or '').strip()
 
 
+def _package_summary(pkg):
+    return {'id': pkg['id'], 'name': pkg.get('name', ''),
+            'title': pkg.get('title') or pkg.get('name', '')}
+
+
+def _index_terms(terms):
+    """Return (uri -> [term positions], label -> [term positions]) for *terms*."""
+    by_uri = {}
+    by_label = {}
+    for pos, term in enumerate(terms):
+        term_uri, term_label = _term_match_values(term)
+        if term_uri:
+            by_uri.setdefault(term_uri, []).append(pos)
+        if term_label:
+            by_label.setdefault(term_label, []).append(pos)
+    return by_uri, by_label
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+def find_packages_referencing_terms(terms):
+    """Return, for each term in *terms*, the instruments referencing it.
+
+    The registry is scanned once and every composite entry is matched
+    against URI and label lookup tables built from all *terms*, using the
+    same identifier-then-label rule as ``_entry_matches_term``.  The result
+    is a list parallel to *terms* of ``[{id, name, title}]`` lists.
+    """
+    matches = [[] for _ in terms]
+    by_uri, by_label = _index_terms(terms)
+    if not by_uri and not by_label:
+        return matches
+
+    for pkg in search_instruments():
+        hits = set()
+        for field_name, cfg in _FIELD_MAP.items():
+            for entry in parse_composite(pkg.get(field_name)):
+                entry_uri = (entry.get(cfg['identifier_key']) or '').strip()
+                entry_label = (entry.get(cfg['name_key']) or '').strip()
+                hits.update(by_uri.get(entry_uri, ()))
+                hits.update(by_label.get(entry_label, ()))
+        if hits:
+            summary = _package_summary(pkg)
+            for pos in hits:
+                matches[pos].append(summary)
+    return matches
+
+
 def find_packages_referencing_term(term_dict, old_term=None):
     """Return [{id, name, title}] for instruments referencing *term_dict*."""
-    term_uri, term_label = _term_match_values(term_dict, old_term)
-    return [
-        {'id': pkg['id'], 'name': pkg.get('name', ''),
-         'title': pkg.get('title') or pkg.get('name', '')}
-        for pkg in search_instruments()
-        if _package_references_term(pkg, term_uri, term_label)
-    ]
+    return find_packages_referencing_terms([old_term or term_dict])[0]
 
 
 def check_term_deletable(term_dict):
@@ -100,8 +132,7 @@ def check_terms_deletable(terms):
     blocking_packages = {}   # keyed by package id to deduplicate
     blocking_term_labels = []
 
-    for term in terms:
-        pkgs = find_packages_referencing_term(term)
+    for term, pkgs in zip(terms, find_packages_referencing_terms(terms)):
         if pkgs:
             blocking_term_labels.append(term.get('label') or term.get('id', ''))
             for pkg in pkgs:
@@ -785,6 +785,52 @@ def test_provider_error_and_double_not_found_have_distinct_statuses():
     assert resolve('10.1234/example', datacite, crossref, Mapper()).status == 'not_found'
 
 
+def test_concurrent_resolve_queries_both_and_keeps_datacite_precedence():
+    import threading
+
+    release = threading.Event()
+
+    class SlowCrossref(StubClient):
+        def lookup(self, bare_doi):
+            self.calls.append(bare_doi)
+            release.wait(5)
+            return self.response
+
+    record = ProviderRecord(source='datacite', title='DataCite title')
+    datacite = StubClient(ProviderResponse(ProviderLookup.FOUND, record))
+    crossref = SlowCrossref(ProviderResponse(ProviderLookup.FOUND, ProviderRecord(
+        source='crossref', title='Crossref title',
+    )))
+
+    # DataCite wins without waiting for the still-running Crossref lookup.
+    result = resolve('10.1234/example', datacite, crossref, Mapper(), concurrent=True)
+    release.set()
+
+    assert result.status == 'ok'
+    assert result.source == 'datacite'
+    assert result.resolved_fields.title == 'DataCite title'
+
+
+def test_concurrent_resolve_matches_sequential_outcomes():
+    record = ProviderRecord(source='crossref', title='Crossref title')
+    cases = [
+        (ProviderLookup.NOT_FOUND, ProviderResponse(ProviderLookup.FOUND, record), 'ok'),
+        (ProviderLookup.NOT_FOUND, ProviderResponse(ProviderLookup.NOT_FOUND), 'not_found'),
+        (ProviderLookup.NOT_FOUND, ProviderResponse(ProviderLookup.ERROR), 'fetch_error'),
+        (ProviderLookup.ERROR, ProviderResponse(ProviderLookup.FOUND, record), 'fetch_error'),
+    ]
+    for dc_outcome, cr_response, expected in cases:
+        datacite = StubClient(ProviderResponse(dc_outcome))
+        crossref = StubClient(cr_response)
+
+        result = resolve('10.1234/example', datacite, crossref, Mapper(), concurrent=True)
+
+        assert result.status == expected
+        assert datacite.calls == ['10.1234/example']
+        if expected == 'ok':
+            assert result.source == 'crossref'
+
+
 def test_resolve_dialog_template_has_full_metadata_and_unmapped_sections():
     template = (
         Path(__file__).parents[2]
@@ -1,6 +1,11 @@
+import pytest
 import requests
 
 from ckanext.pidinst_theme.doi_resolution import providers
+from ckanext.pidinst_theme.doi_resolution.cache import (
+    ResolutionCache,
+    resolution_cache,
+)
 from ckanext.pidinst_theme.doi_resolution.providers import (
     CrossrefClient,
     DataCiteClient,
@@ -8,6 +13,13 @@ from ckanext.pidinst_theme.doi_resolution.providers import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_resolution_cache():
+    resolution_cache.clear()
+    yield
+    resolution_cache.clear()
+
+
 class FakeResponse:
     def __init__(self, status_code=200, payload=None, json_error=None):
         self.status_code = status_code
@@ -36,7 +48,7 @@ def test_datacite_parses_descriptive_metadata(monkeypatch):
         'included': [{'type': 'client'}],
     }
     monkeypatch.setattr(
-        providers.requests, 'get', lambda *args, **kwargs: FakeResponse(payload=payload)
+        providers.requests.Session, 'get', lambda *args, **kwargs: FakeResponse(payload=payload)
     )
 
     response = DataCiteClient('https://example.test/dois/', 3).lookup(
@@ -74,7 +86,7 @@ def test_crossref_parses_descriptive_metadata(monkeypatch):
         }
     }
     monkeypatch.setattr(
-        providers.requests, 'get', lambda *args, **kwargs: FakeResponse(payload=payload)
+        providers.requests.Session, 'get', lambda *args, **kwargs: FakeResponse(payload=payload)
     )
 
     response = CrossrefClient('https://example.test/works', 3).lookup(
@@ -93,19 +105,68 @@ def test_provider_outcomes_are_contained(monkeypatch):
     client = DataCiteClient('https://example.test/dois', 3)
 
     monkeypatch.setattr(
-        providers.requests, 'get', lambda *args, **kwargs: FakeResponse(status_code=404)
+        providers.requests.Session, 'get', lambda *args, **kwargs: FakeResponse(status_code=404)
     )
     assert client.lookup('10.1234/missing').outcome == ProviderLookup.NOT_FOUND
 
     def timeout(*args, **kwargs):
         raise requests.Timeout()
 
-    monkeypatch.setattr(providers.requests, 'get', timeout)
+    monkeypatch.setattr(providers.requests.Session, 'get', timeout)
     assert client.lookup('10.1234/timeout').outcome == ProviderLookup.ERROR
 
     monkeypatch.setattr(
-        providers.requests,
+        providers.requests.Session,
         'get',
         lambda *args, **kwargs: FakeResponse(json_error=ValueError('bad json')),
     )
     assert client.lookup('10.1234/bad-json').outcome == ProviderLookup.ERROR
+
+
+def test_lookup_caches_found_and_not_found_but_not_errors(monkeypatch):
+    calls = []
+    responses = {
+        '10.1234/found': FakeResponse(payload={'message': {'title': ['Cached']}}),
+        '10.1234/missing': FakeResponse(status_code=404),
+        '10.1234/broken': FakeResponse(status_code=503),
+    }
+
+    def fake_get(self, url, **kwargs):
+        calls.append(url)
+        return responses[url.rsplit('/', 2)[-2] + '/' + url.rsplit('/', 1)[-1]]
+
+    monkeypatch.setattr(providers.requests.Session, 'get', fake_get)
+    client = CrossrefClient('https://example.test/works', 3)
+
+    for _ in range(2):
+        found = client.lookup('10.1234/found')
+        assert found.outcome == ProviderLookup.FOUND
+        assert client.lookup('10.1234/missing').outcome == ProviderLookup.NOT_FOUND
+        assert client.lookup('10.1234/broken').outcome == ProviderLookup.ERROR
+
+    # Cached records are copies; mutating one doesn't leak into the cache.
+    found.record.title = 'Mutated'
+    assert client.lookup('10.1234/FOUND').record.title == 'Cached'
+
+    assert len(calls) == 4
+    assert resolution_cache.stats() == {
+        'hits': 2, 'negative_hits': 1, 'misses': 4, 'evictions': 0, 'size': 2,
+    }
+
+
+def test_resolution_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = ResolutionCache(max_entries=2, ttl=10, negative_ttl=1,
+                            clock=lambda: now[0])
+
+    cache.set('a', 1)
+    cache.set('b', 2, negative=True)
+    assert cache.get('a') == 1
+    cache.set('c', 3)  # evicts 'b', the least recently used
+
+    assert cache.get('b') is None
+    now[0] = 10
+    assert cache.get('a') is None
+    assert cache.get('c') is None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['size'] == 0
@@ -608,3 +608,64 @@ class TestUrlResultFields:
         assert d['resolved_fields']['identifier_url'] == (
             'https://my-custom-repo.org/instrument/42'
         )
+
+
+# =============================================================================
+# fetch_url_metadata: pooled session and shared cache
+# =============================================================================
+
+
+class _FakeStreamResponse:
+    def __init__(self, body, content_type='application/json'):
+        self.url = 'https://repo.example.org/instrument/1'
+        self.status_code = 200
+        self.headers = {'content-type': content_type}
+        self._body = body
+        self.closed = False
+
+    def iter_content(self, chunk_size=8192):
+        yield self._body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+class TestFetchUrlMetadataCache:
+    """Repeated fetches of the same URL are served from the cache."""
+
+    def test_ok_and_unsupported_results_are_cached(self, monkeypatch):
+        from ckanext.pidinst_theme.doi_resolution import url_metadata_client
+        from ckanext.pidinst_theme.doi_resolution.cache import ResolutionCache
+
+        bodies = {
+            'https://repo.example.org/instrument/1': json.dumps({
+                'message': {'title': ['Cached instrument']},
+            }).encode(),
+            'https://repo.example.org/page.html': b'<html></html>',
+        }
+        responses = []
+
+        def fake_get(self, url, **kwargs):
+            content_type = 'text/html' if url.endswith('.html') else 'application/json'
+            response = _FakeStreamResponse(bodies[url], content_type)
+            responses.append(response)
+            return response
+
+        monkeypatch.setattr(url_metadata_client, '_validate_url_safe', lambda url: True)
+        monkeypatch.setattr(url_metadata_client.requests.Session, 'get', fake_get)
+        cache = ResolutionCache()
+
+        for _ in range(2):
+            ok = fetch_url_metadata('https://repo.example.org/instrument/1', cache=cache)
+            html = fetch_url_metadata('https://repo.example.org/page.html', cache=cache)
+            assert ok.status == UrlFetchStatus.OK
+            assert ok.record.title == 'Cached instrument'
+            assert html.status == UrlFetchStatus.UNSUPPORTED_FORMAT
+
+        assert len(responses) == 2
+        assert all(response.closed for response in responses)
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['negative_hits'] == 1
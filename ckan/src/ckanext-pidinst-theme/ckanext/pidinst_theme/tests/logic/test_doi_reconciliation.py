@@ -1,45 +1,55 @@
+import pickle
+import time
+
+import pytest
+
+from ckanext.pidinst_theme import party_cache
 from ckanext.pidinst_theme.logic import doi_reconciliation
 
 
+PARTIES = {
+    'maker-party': {
+        'id': 'maker-id',
+        'name': 'maker-party',
+        'title': 'Maker Party',
+        'party_role': '["Manufacturer"]',
+        'party_identifier_type': 'ROR',
+        'party_identifier_ror': 'https://ror.org/abc123',
+    },
+    'owner-party': {
+        'id': 'owner-id',
+        'name': 'owner-party',
+        'title': 'Owner Party',
+        'party_role': '["Owner"]',
+        'party_identifier_type': 'ROR',
+        'party_identifier_ror': 'https://ror.org/own123',
+    },
+    'other-maker': {
+        'id': 'other-maker-id',
+        'name': 'other-maker',
+        'title': 'Other Maker',
+        'party_role': '["Manufacturer"]',
+        'party_identifier_type': 'ROR',
+        'party_identifier_ror': 'https://ror.org/other',
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    party_cache.invalidate()
+    doi_reconciliation.invalidate_taxonomy_terms()
+    yield
+    party_cache.invalidate()
+    doi_reconciliation.invalidate_taxonomy_terms()
+
+
 def test_reconcile_matches_existing_records_by_exact_identifier(monkeypatch):
     actions_called = []
 
     def fake_get_action(name):
         actions_called.append(name)
 
-        def group_list(context, data_dict):
-            assert data_dict == {'type': 'party'}
-            return ['maker-party', 'owner-party', 'other-maker']
-
-        def group_show(context, data_dict):
-            parties = {
-                'maker-party': {
-                    'id': 'maker-id',
-                    'name': 'maker-party',
-                    'title': 'Maker Party',
-                    'party_role': ['Manufacturer'],
-                    'party_identifier_type': 'ROR',
-                    'party_identifier_ror': 'https://ror.org/abc123',
-                },
-                'owner-party': {
-                    'id': 'owner-id',
-                    'name': 'owner-party',
-                    'title': 'Owner Party',
-                    'party_role': ['Owner'],
-                    'party_identifier_type': 'ROR',
-                    'party_identifier_ror': 'https://ror.org/own123',
-                },
-                'other-maker': {
-                    'id': 'other-maker-id',
-                    'name': 'other-maker',
-                    'title': 'Other Maker',
-                    'party_role': ['Manufacturer'],
-                    'party_identifier_type': 'ROR',
-                    'party_identifier_ror': 'https://ror.org/other',
-                },
-            }
-            return parties[data_dict['id']]
-
         def taxonomy_term_list(context, data_dict):
             if data_dict['id'] == 'instruments':
                 return [{
@@ -56,12 +66,11 @@ def test_reconcile_matches_existing_records_by_exact_identifier(monkeypatch):
             return []
 
         return {
-            'group_list': group_list,
-            'group_show': group_show,
             'taxonomy_term_list': taxonomy_term_list,
         }[name]
 
     monkeypatch.setattr(doi_reconciliation.tk, 'get_action', fake_get_action)
+    monkeypatch.setattr(party_cache, 'load_party_metadata', lambda: PARTIES)
     monkeypatch.setattr(
         doi_reconciliation,
         'get_taxonomy_name',
@@ -112,6 +121,7 @@ def test_reconcile_matches_existing_records_by_exact_identifier(monkeypatch):
         'https://example.test/term/helium'
     )
     assert result['measured_variable'][0]['matched_local_record_id'] == 'variable-id'
+    assert 'group_show' not in actions_called
     assert 'group_create' not in actions_called
     assert 'group_update' not in actions_called
     assert 'package_update' not in actions_called
@@ -144,3 +154,135 @@ def test_match_status_marks_duplicate_exact_identifier_as_ambiguous():
     assert result[0]['match_status'] == 'ambiguous'
     assert result[0]['apply_allowed'] is False
     assert result[0]['matched_local_id'] == ''
+
+
+def test_taxonomy_terms_are_read_once_until_invalidated(monkeypatch):
+    listed = []
+
+    def fake_get_action(name):
+        assert name == 'taxonomy_term_list'
+
+        def taxonomy_term_list(context, data_dict):
+            listed.append(data_dict['id'])
+            if data_dict['id'] != 'instruments':
+                return []
+            return [{
+                'id': 'parent-id',
+                'label': 'Spectrometers',
+                'uri': 'https://example.test/term/spec',
+                'children': [{
+                    'id': 'child-id',
+                    'label': 'Mass spectrometer',
+                    'uri': 'https://example.test/term/mass/',
+                }],
+            }]
+
+        return taxonomy_term_list
+
+    monkeypatch.setattr(doi_reconciliation.tk, 'get_action', fake_get_action)
+    monkeypatch.setattr(party_cache, 'load_party_metadata', lambda: {})
+    monkeypatch.setattr(doi_reconciliation, 'get_taxonomy_name', lambda key: key + 's')
+    resolved = {'instrument_type_suggestions': [{
+        'instrument_type_identifier': 'HTTPS://example.test/term/mass',
+    }]}
+
+    first = doi_reconciliation.reconcile(resolved, {})
+    second = doi_reconciliation.reconcile(resolved, {})
+
+    assert len(listed) == 3
+    for result in (first, second):
+        assert result['instrument_type'][0]['match_status'] == 'exact_unique'
+        assert result['instrument_type'][0]['matched_local_record_id'] == 'child-id'
+
+    doi_reconciliation.invalidate_taxonomy_terms()
+    doi_reconciliation.reconcile(resolved, {})
+    assert len(listed) == 6
+
+
+def test_match_funder_ignores_parties_without_the_role():
+    parties = [
+        {'id': 'owner', 'name': 'owner', 'party_role': '["Owner"]',
+         'party_identifier_ror': 'https://ror.org/shared'},
+        {'id': 'funder', 'name': 'funder', 'party_role': '["Funder"]',
+         'party_identifier': 'https://ror.org/shared/'},
+    ]
+
+    result = doi_reconciliation.match_funder(
+        [{'funderName': 'Agency', 'funderIdentifier': 'https://ror.org/shared'}],
+        parties,
+    )
+
+    assert result[0]['match_status'] == 'exact_unique'
+    assert result[0]['matched_local_id'] == 'funder'
+
+
+class _PicklingBackend(party_cache.MemoryBackend):
+    """Like the Redis backend, hands out a new copy on every read."""
+
+    def get(self, key):
+        value = super().get(key)
+        return pickle.loads(pickle.dumps(value)) if value is not None else None
+
+
+@pytest.fixture
+def count_party_index_builds(monkeypatch):
+    """Serve PARTIES through a given cache backend; count role checks."""
+    monkeypatch.setattr(party_cache, 'load_party_metadata',
+                        lambda: {k: dict(p) for k, p in PARTIES.items()})
+    monkeypatch.setattr(doi_reconciliation, '_read_taxonomy_terms',
+                        lambda context: ([], None))
+    role_checks = []
+    has_role = doi_reconciliation._party_has_role
+
+    def counting_has_role(party, role):
+        role_checks.append(role)
+        return has_role(party, role)
+
+    monkeypatch.setattr(doi_reconciliation, '_party_has_role', counting_has_role)
+
+    def use(backend):
+        monkeypatch.setattr(party_cache, '_backend', backend)
+        return role_checks
+
+    return use
+
+
+def test_party_index_survives_fresh_list_copies_until_invalidated(
+        count_party_index_builds):
+    role_checks = count_party_index_builds(_PicklingBackend())
+    resolved = {'manufacturer_suggestions': [{'ror': 'https://ror.org/abc123'}]}
+
+    first = doi_reconciliation.reconcile(resolved, {})
+    built = len(role_checks)
+    second = doi_reconciliation.reconcile(resolved, {})
+
+    assert built == 3 * len(PARTIES)
+    assert len(role_checks) == built
+    for result in (first, second):
+        assert result['manufacturer'][0]['matched_local_record_id'] == 'maker-id'
+
+    party_cache.invalidate()
+    doi_reconciliation.reconcile(resolved, {})
+    assert len(role_checks) == 2 * built
+
+
+def test_party_index_is_rebuilt_when_the_party_list_expires(
+        count_party_index_builds, monkeypatch):
+    role_checks = count_party_index_builds(party_cache.MemoryBackend(ttl=0.01))
+    resolved = {'manufacturer_suggestions': [{'ror': 'https://ror.org/abc123'}]}
+
+    doi_reconciliation.reconcile(resolved, {})
+    built = len(role_checks)
+    time.sleep(0.02)
+    # The reloaded list has a party that the old index does not know.
+    reloaded = dict(PARTIES, **{'new-maker': {
+        'id': 'new-maker-id', 'name': 'new-maker', 'title': 'New Maker',
+        'party_role': '["Manufacturer"]', 'party_identifier_type': 'ROR',
+        'party_identifier_ror': 'https://ror.org/new123',
+    }})
+    monkeypatch.setattr(party_cache, 'load_party_metadata', lambda: reloaded)
+    result = doi_reconciliation.reconcile(
+        {'manufacturer_suggestions': [{'ror': 'https://ror.org/new123'}]}, {})
+
+    assert len(role_checks) > built
+    assert result['manufacturer'][0]['matched_local_record_id'] == 'new-maker-id'
@@ -0,0 +1,62 @@
+"""Tests for facet_cache.py."""
+
+import pytest
+
+from ckanext.pidinst_theme import facet_cache, party_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(facet_cache, '_backend', party_cache.MemoryBackend())
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    calls = []
+
+    def fake_get_action(name):
+        assert name == 'package_search'
+
+        def package_search(context, data_dict):
+            calls.append(data_dict)
+            return {'count': len(calls), 'search_facets': {}}
+
+        return package_search
+
+    monkeypatch.setattr(facet_cache.toolkit, 'get_action', fake_get_action)
+    monkeypatch.setattr(
+        facet_cache, 'visibility_key',
+        lambda context: tuple(context.get('labels', ('*',))))
+    return calls
+
+
+BASELINE = {
+    'q': '*:*',
+    'fq': 'dataset_type:instrument AND extras_is_platform:false',
+    'rows': 0,
+    'facet.field': ['vocab_manufacturer_party'],
+    'include_private': False,
+}
+
+
+def test_package_search_is_cached_per_params_and_visibility(searches):
+    anon = {'labels': ('public',)}
+
+    first = facet_cache.package_search(anon, BASELINE)
+    assert facet_cache.package_search(anon, dict(BASELINE)) is first
+    assert len(searches) == 1
+
+    facet_cache.package_search({'labels': ('member-org-1', 'public')}, BASELINE)
+    facet_cache.package_search(anon, dict(BASELINE, include_private=True))
+    assert len(searches) == 3
+
+
+def test_invalidate_forces_a_fresh_search(searches):
+    facet_cache.package_search({}, BASELINE)
+    version = facet_cache.get_version()
+
+    facet_cache.invalidate()
+
+    assert facet_cache.get_version() == version + 1
+    facet_cache.package_search({}, BASELINE)
+    assert len(searches) == 2
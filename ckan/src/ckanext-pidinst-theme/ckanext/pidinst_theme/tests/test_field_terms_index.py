@@ -0,0 +1,65 @@
+"""Tests for field_terms_index.py."""
+
+import pytest
+
+from ckanext.pidinst_theme import field_terms_index
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    field_terms_index.invalidate()
+    yield
+    field_terms_index.invalidate()
+
+
+def _fake_facets(monkeypatch, names):
+    calls = []
+
+    def fake_get_action(name):
+        assert name == 'package_search'
+
+        def package_search(context, data_dict):
+            calls.append(data_dict)
+            field = data_dict['facet.field'][0]
+            return {'count': 0, 'results': [], 'search_facets': {field: {
+                'items': [{'name': n, 'display_name': n, 'count': 1} for n in names],
+            }}}
+
+        return package_search
+
+    monkeypatch.setattr(field_terms_index.toolkit, 'get_action', fake_get_action)
+    return calls
+
+
+def test_lookup_uses_single_facet_query_and_caches(monkeypatch):
+    calls = _fake_facets(monkeypatch, ['Seismology', 'Geology', ' '])
+
+    assert field_terms_index.lookup('user_keywords') == ['Geology', 'Seismology']
+    assert field_terms_index.lookup('user_keywords', 'geo') == ['Geology']
+
+    assert len(calls) == 1
+    assert calls[0]['rows'] == 0
+    assert calls[0]['facet.field'] == ['vocab_user_keyword']
+    assert calls[0]['facet.limit'] == -1
+
+
+def test_lookup_ranks_prefix_matches_before_substring_matches(monkeypatch):
+    _fake_facets(monkeypatch, ['Marine magnetics', 'Magnetometer', 'magnet', 'Gravity'])
+
+    assert field_terms_index.lookup('instrument_type_name', 'MAGNET') == [
+        'magnet', 'Magnetometer', 'Marine magnetics',
+    ]
+    assert field_terms_index.lookup('instrument_type_name', 'magnet', limit=2) == [
+        'magnet', 'Magnetometer',
+    ]
+
+
+def test_invalidate_forces_reload(monkeypatch):
+    calls = _fake_facets(monkeypatch, ['Temperature'])
+
+    field_terms_index.lookup('measured_variable')
+    field_terms_index.invalidate()
+    field_terms_index.lookup('measured_variable')
+
+    assert len(calls) == 2
+    assert calls[1]['facet.field'] == ['vocab_measured_variable']
@@ -0,0 +1,113 @@
+"""Tests for party_cache.py."""
+
+import pytest
+
+from ckanext.pidinst_theme import party_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    party_cache.invalidate()
+    yield
+    party_cache.invalidate()
+
+
+def test_get_party_list_sorts_by_title_and_caches_until_invalidated(monkeypatch):
+    loads = []
+
+    def fake_load():
+        loads.append(1)
+        return {
+            'b': {'id': '2', 'name': 'b', 'title': 'beta'},
+            'a': {'id': '1', 'name': 'a', 'title': 'Alpha'},
+        }
+
+    monkeypatch.setattr(party_cache, 'load_party_metadata', fake_load)
+
+    assert [p['name'] for p in party_cache.get_party_list()] == ['a', 'b']
+    party_cache.get_party_list()
+    assert len(loads) == 1
+
+    version = party_cache.get_version()
+    party_cache.invalidate()
+    assert party_cache.get_version() == version + 1
+    party_cache.get_party_list()
+    assert len(loads) == 2
+
+
+def test_memory_backend_drops_expired_entries_and_caps_its_size(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(party_cache.time, 'time', lambda: now[0])
+    backend = party_cache.MemoryBackend(ttl=60, max_entries=3)
+
+    backend.set('old', 1)
+    now[0] += 61
+    assert backend.get('old') is None
+    assert 'old' not in backend._cache
+
+    for key in ('a', 'b', 'c'):
+        backend.set(key, key)
+        now[0] += 1
+    backend.set('d', 'd')  # full: the oldest entry makes room
+
+    assert set(backend._cache) == {'b', 'c', 'd'}
+    now[0] += 59.5
+    backend.set('e', 'e')  # expired entries all go before any fresh one
+    assert set(backend._cache) == {'d', 'e'}
+
+
+class _FakeRedis:
+    """Minimal stand-in for the redis-py client calls the backend uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key) or 0) + 1
+        return self.data[key]
+
+
+def test_redis_backend_shares_entries_and_invalidation_across_workers():
+    server = _FakeRedis()
+    worker_a = party_cache.RedisBackend(server)
+    worker_b = party_cache.RedisBackend(server)
+
+    worker_a.set(('party_trees', 'false'), [{'id': 'lab', 'count': 3}])
+    # A tree rebuilt by one worker is reused by the others.
+    assert worker_b.get(('party_trees', 'false')) == [{'id': 'lab', 'count': 3}]
+
+    worker_b.invalidate()
+    assert worker_a.version() == worker_b.version() == 1
+    assert worker_a.get(('party_trees', 'false')) is None
+
+
+def test_module_api_uses_the_configured_backend(monkeypatch):
+    server = _FakeRedis()
+    monkeypatch.setattr(party_cache, '_backend', party_cache.RedisBackend(server))
+
+    party_cache.cache_set('k', {'v': 1})
+    other_worker = party_cache.RedisBackend(server)
+    assert other_worker.get('k') == {'v': 1}
+
+    other_worker.invalidate()
+    assert party_cache.get_version() == 1
+    assert party_cache.cache_get('k') is None
+
+
+def test_redis_backend_errors_are_cache_misses():
+    class _DownRedis:
+        def get(self, *args, **kwargs):
+            raise ConnectionError('redis down')
+
+        set = incr = get
+
+    backend = party_cache.RedisBackend(_DownRedis())
+    backend.set('k', 1)
+    backend.invalidate()
+    assert backend.get('k') is None
@@ -0,0 +1,60 @@
+"""Tests for party_propagation.py."""
+
+import json
+
+from ckanext.pidinst_theme import party_propagation, propagation_helpers
+
+
+def _fake_package_search(monkeypatch, packages):
+    calls = []
+
+    def fake_get_action(name):
+        assert name == 'package_search'
+
+        def package_search(context, data_dict):
+            calls.append(data_dict)
+            return {'count': len(packages), 'results': list(packages)}
+
+        return package_search
+
+    monkeypatch.setattr(propagation_helpers.toolkit, 'get_action', fake_get_action)
+    return calls
+
+
+def test_party_slugs_from_package_reads_all_party_composites():
+    pkg = {
+        'owner': json.dumps([{'owner_party_id': 'owner-a'}, {'owner_party_id': ' '}]),
+        'funder': [{'funder_party_id': 'funder-b'}],
+        'manufacturer': [{'manufacturer_party_id': 'owner-a'}],
+    }
+
+    assert party_propagation.party_slugs_from_package(pkg) == {'owner-a', 'funder-b'}
+
+
+def test_find_instruments_referencing_party_uses_targeted_query(monkeypatch):
+    packages = [
+        {'id': 'ref', 'owner': [{'owner_party_id': 'lab'}]},
+        # Stale index hit: the composites no longer reference the party.
+        {'id': 'stale', 'owner': [{'owner_party_id': 'other-lab'}]},
+    ]
+    calls = _fake_package_search(monkeypatch, packages)
+
+    found = party_propagation.find_instruments_referencing_party('lab')
+
+    assert [p['id'] for p in found] == ['ref']
+    assert len(calls) == 1
+    assert calls[0]['fq'] == (
+        '+dataset_type:instrument '
+        '+(vocab_party_slug:"lab" OR groups:"lab")'
+    )
+
+
+def test_check_party_deletable_counts_referencing_instruments(monkeypatch):
+    _fake_package_search(monkeypatch, [
+        {'id': 'one', 'funder': [{'funder_party_id': 'agency'}]},
+    ])
+
+    result = party_propagation.check_party_deletable('agency')
+
+    assert result['deletable'] is False
+    assert result['reference_count'] == 1
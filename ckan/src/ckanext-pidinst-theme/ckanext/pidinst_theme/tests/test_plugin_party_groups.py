@@ -0,0 +1,150 @@
+"""Tests for PidinstThemePlugin._sync_party_groups."""
+
+import pytest
+
+from ckanext.pidinst_theme import plugin
+
+
+class _Row:
+    def __init__(self, name, state='active'):
+        self.name = name
+        self.group_id = 'g-' + name
+        self.state = state
+        self.capacity = 'public'
+
+
+class _FakeSession:
+    """Answers the membership query with *rows* and the group lookup by
+    name with *groups* (``(id, name)`` pairs)."""
+
+    def __init__(self, rows, groups=()):
+        self.rows = rows
+        self.groups = list(groups)
+        self.added = []
+        self.queries = 0
+        self._results = []
+
+    def query(self, *args):
+        self.queries += 1
+        if args[0] is plugin.model.Member:
+            # Mirror ORDER BY state ASC ('active' < 'deleted').
+            self._results = [
+                (row, row.name)
+                for row in sorted(self.rows, key=lambda r: r.state)
+            ]
+        else:
+            self._results = self.groups
+        return self
+
+    def join(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def all(self):
+        return self._results
+
+    def add(self, obj):
+        self.added.append(obj)
+
+
+@pytest.fixture
+def sync(monkeypatch):
+    parties = {
+        'lab': {'id': 'g-lab', 'name': 'lab'},
+        'agency': {'id': 'g-agency', 'name': 'agency'},
+        'maker': {'id': 'g-maker', 'name': 'maker'},
+    }
+    commits = []
+    monkeypatch.setattr(plugin.party_cache, 'load_party_metadata', lambda: parties)
+    monkeypatch.setattr(plugin.model.repo, 'commit', lambda: commits.append(1))
+
+    def run(rows, pkg_dict, context=None, groups=()):
+        session = _FakeSession(rows, groups)
+        monkeypatch.setattr(plugin.model, 'Session', session)
+        plugin.PidinstThemePlugin._sync_party_groups(
+            None, context or {}, dict({'id': 'pkg-1'}, **pkg_dict))
+        return session
+
+    run.commits = commits
+    return run
+
+
+def test_unchanged_composites_do_not_write(sync):
+    session = sync(
+        [_Row('lab'), _Row('agency')],
+        {'owner': '[{"owner_party_id": "lab"}]',
+         'funder': [{'funder_party_id': 'agency'}]},
+    )
+
+    assert session.queries == 1
+    assert session.added == []
+    assert sync.commits == []
+
+
+def test_membership_changes_are_applied_in_one_commit(sync):
+    stale = _Row('agency')
+    removed_earlier = _Row('maker', state='deleted')
+    session = sync(
+        [stale, removed_earlier],
+        {'owner': [{'owner_party_id': 'lab'}],
+         'manufacturer': [{'manufacturer_party_id': 'maker'},
+                          {'manufacturer_party_id': 'unknown-party'}]},
+    )
+
+    assert stale.state == 'deleted'
+    assert removed_earlier.state == 'active'
+    added_groups = {m.group_id for m in session.added}
+    assert added_groups == {'g-lab', 'g-maker'}
+    new_row = next(m for m in session.added if m.group_id == 'g-lab')
+    assert (new_row.table_id, new_row.table_name, new_row.state) == (
+        'pkg-1', 'package', 'active')
+    assert sync.commits == [1]
+
+
+def test_parties_missing_from_a_stale_cache_are_kept_and_resolved(sync):
+    # 'newlab' was created on another worker; this process's party cache
+    # has not been reloaded since.
+    kept = _Row('newlab')
+    session = sync(
+        [kept],
+        {'owner': [{'owner_party_id': 'newlab'}],
+         'funder': [{'funder_party_id': 'otherlab'}]},
+        groups=[('g-otherlab', 'otherlab')],
+    )
+
+    assert kept.state == 'active'
+    assert [m.group_id for m in session.added] == ['g-otherlab']
+    assert sync.commits == [1]
+
+    session = sync([_Row('newlab')], {'owner': [{'owner_party_id': 'newlab'}]})
+
+    assert session.queries == 1
+    assert session.added == []
+
+
+def test_defer_commit_leaves_commit_to_the_caller(sync):
+    sync([], {'owner': [{'owner_party_id': 'lab'}]}, context={'defer_commit': True})
+
+    assert sync.commits == []
+
+
+def test_owner_or_funder_values_resolve_ids_and_names_to_one_slug(monkeypatch):
+    monkeypatch.setattr(plugin.party_cache, 'load_party_metadata', lambda: {
+        'lab': {'id': 'g-lab', 'name': 'lab', 'title': 'The Lab'},
+        'agency': {'id': 'g-agency', 'name': 'agency', 'title': 'Agency'},
+    })
+
+    values = plugin._owner_or_funder_party_values(
+        [{'owner_party_id': 'lab', 'owner_name': 'The Lab'},
+         {'owner_name': 'Unlisted Org'}],
+        [{'funder_name': 'the lab'},
+         {'funder_party_id': 'g-agency'},
+         'not-a-dict'],
+    )
+
+    assert values == ['agency', 'lab', 'unlisted org']
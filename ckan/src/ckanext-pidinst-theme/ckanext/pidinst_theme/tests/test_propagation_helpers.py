@@ -0,0 +1,111 @@
+"""Tests for propagation_helpers.py job progress buffering."""
+
+import pytest
+
+from ckanext.pidinst_theme import propagation_helpers
+
+
+@pytest.fixture
+def task_store(monkeypatch):
+    """Replace the task_status table with a dict and count writes."""
+    store = {'job': {'status': 'running', 'total': 0, 'done': 0,
+                     'updated': 0, 'failures': 0}}
+    writes = []
+
+    def write_task(job_id, state):
+        writes.append(dict(state))
+        store[job_id] = dict(state)
+
+    monkeypatch.setattr(propagation_helpers, '_read_task',
+                        lambda job_id: dict(store[job_id]) if job_id in store else None)
+    monkeypatch.setattr(propagation_helpers, '_write_task', write_task)
+    monkeypatch.setattr(propagation_helpers, '_pending_progress', {})
+    monkeypatch.setattr(propagation_helpers, '_last_flush', {})
+    # Only the count cadence applies unless a test says otherwise.
+    monkeypatch.setattr(propagation_helpers, '_FLUSH_INTERVAL', 3600)
+    return store, writes
+
+
+def test_job_tick_coalesces_writes(task_store, monkeypatch):
+    store, writes = task_store
+    monkeypatch.setattr(propagation_helpers, '_FLUSH_EVERY', 10)
+
+    for i in range(25):
+        propagation_helpers.job_tick('job', updated=i % 2 == 0)
+
+    assert len(writes) == 2
+    assert store['job']['done'] == 20
+
+    propagation_helpers.job_finish('job')
+
+    assert len(writes) == 3
+    assert store['job']['done'] == 25
+    assert store['job']['updated'] == 13
+    assert store['job']['status'] == 'done'
+
+
+def test_job_tick_flushes_on_interval(task_store, monkeypatch):
+    store, writes = task_store
+    monkeypatch.setattr(propagation_helpers, '_FLUSH_INTERVAL', 0)
+
+    propagation_helpers.job_tick('job', updated=True)
+
+    assert len(writes) == 1
+    assert store['job']['done'] == 1
+
+
+def test_job_tick_interval_counts_from_last_write(task_store, monkeypatch):
+    store, writes = task_store
+    monkeypatch.setattr(propagation_helpers, '_FLUSH_INTERVAL', 10)
+    clock = iter([100.0, 111.0, 111.0, 115.0, 122.0, 122.0])
+    monkeypatch.setattr(propagation_helpers.time, 'monotonic', lambda: next(clock))
+
+    propagation_helpers.job_tick('job', updated=True)   # 100: buffered
+    propagation_helpers.job_tick('job', updated=True)   # 111: written
+    propagation_helpers.job_tick('job', updated=True)   # 115: buffered
+    # 11s after the last write, though only 7s after the buffered tick.
+    propagation_helpers.job_tick('job', updated=True)   # 122: written
+
+    assert len(writes) == 2
+    assert store['job']['done'] == 4
+
+
+def test_run_propagation_flushes_final_progress(task_store):
+    store, writes = task_store
+
+    def update_fn(pkg):
+        if pkg['id'] == 'bad':
+            raise ValueError('boom')
+        return True
+
+    summary = propagation_helpers.run_propagation(
+        [{'id': 'a'}, {'id': 'bad'}, {'id': 'b'}], update_fn, 'party x',
+        job_id='job',
+    )
+
+    assert summary['instruments_updated'] == 2
+    assert store['job']['done'] == 3
+    assert store['job']['updated'] == 2
+    assert store['job']['failures'] == 1
+    assert store['job']['status'] == 'done'
+    # set_total + final finish; no per-instrument writes.
+    assert len(writes) == 2
+
+
+def test_run_propagation_flushes_when_interrupted(task_store):
+    store, _writes = task_store
+
+    def update_fn(pkg):
+        if pkg['id'] == 'stop':
+            raise KeyboardInterrupt
+        return False
+
+    with pytest.raises(KeyboardInterrupt):
+        propagation_helpers.run_propagation(
+            [{'id': 'a'}, {'id': 'stop'}], update_fn, 'party x', job_id='job',
+        )
+
+    assert store['job']['done'] == 2
+    assert store['job']['status'] == 'running'
+    assert propagation_helpers._last_flush == {}
+    assert propagation_helpers._pending_progress == {}
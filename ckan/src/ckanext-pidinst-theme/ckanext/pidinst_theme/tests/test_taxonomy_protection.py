@@ -0,0 +1,90 @@
+"""Tests for taxonomy_protection.py."""
+
+from ckanext.pidinst_theme import taxonomy_protection
+
+
+PACKAGES = [
+    {
+        'id': 'pkg-uri',
+        'name': 'pkg-uri',
+        'title': 'Matched by URI',
+        'instrument_type': [{
+            'instrument_type_name': 'Renamed label',
+            'instrument_type_identifier': 'https://example.test/term/mass',
+        }],
+    },
+    {
+        'id': 'pkg-label',
+        'name': 'pkg-label',
+        'title': 'Matched by label',
+        'measured_variable': '[{"measured_variable_name": "Helium", '
+                             '"measured_variable_identifier": ""}]',
+    },
+    {
+        'id': 'pkg-none',
+        'name': 'pkg-none',
+        'title': 'Unrelated',
+        'instrument_type': [{'instrument_type_name': 'Other'}],
+    },
+]
+
+TERMS = [
+    {'id': 'mass', 'label': 'Mass spectrometer', 'uri': 'https://example.test/term/mass'},
+    {'id': 'helium', 'label': 'Helium', 'uri': 'https://example.test/term/helium'},
+    {'id': 'unused', 'label': 'Unused', 'uri': 'https://example.test/term/unused'},
+]
+
+
+def _fake_search(monkeypatch):
+    calls = []
+
+    def fake_search_instruments(fq=None):
+        calls.append(fq)
+        return PACKAGES
+
+    monkeypatch.setattr(taxonomy_protection, 'search_instruments', fake_search_instruments)
+    return calls
+
+
+def test_find_packages_referencing_terms_scans_registry_once(monkeypatch):
+    calls = _fake_search(monkeypatch)
+
+    matches = taxonomy_protection.find_packages_referencing_terms(TERMS)
+
+    assert len(calls) == 1
+    assert [[p['id'] for p in pkgs] for pkgs in matches] == [
+        ['pkg-uri'], ['pkg-label'], [],
+    ]
+
+
+def test_check_terms_deletable_contract(monkeypatch):
+    calls = _fake_search(monkeypatch)
+
+    result = taxonomy_protection.check_terms_deletable(TERMS)
+
+    assert len(calls) == 1
+    assert result['deletable'] is False
+    assert result['reference_count'] == 2
+    assert '"Mass spectrometer", "Helium"' in result['message']
+    assert result['packages'] == [
+        {'id': 'pkg-uri', 'name': 'pkg-uri', 'title': 'Matched by URI'},
+        {'id': 'pkg-label', 'name': 'pkg-label', 'title': 'Matched by label'},
+    ]
+
+
+def test_check_terms_deletable_when_unreferenced(monkeypatch):
+    _fake_search(monkeypatch)
+
+    assert taxonomy_protection.check_terms_deletable([TERMS[2]]) == {
+        'deletable': True, 'reference_count': 0, 'message': '', 'packages': [],
+    }
+
+
+def test_find_packages_referencing_term_prefers_old_term(monkeypatch):
+    _fake_search(monkeypatch)
+
+    found = taxonomy_protection.find_packages_referencing_term(
+        {'label': 'New label', 'uri': ''}, old_term=TERMS[1],
+    )
+
+    assert [p['id'] for p in found] == ['pkg-label']
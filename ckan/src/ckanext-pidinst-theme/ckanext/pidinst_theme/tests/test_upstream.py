@@ -0,0 +1,112 @@
+"""Tests for upstream.py."""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from ckanext.pidinst_theme import upstream
+
+
+class _FakeResponse:
+    def __init__(self, url, status_code=200, content=b'{"ok": true}'):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = {'Content-Type': 'application/json'}
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    upstream.clear()
+    yield
+    upstream.clear()
+
+
+def _fake_get(monkeypatch, handler):
+    calls = []
+
+    def fake_get(self, url, params=None, timeout=None):
+        calls.append((url, params, timeout))
+        return handler(url)
+
+    monkeypatch.setattr(upstream.requests.Session, 'get', fake_get)
+    return calls
+
+
+def test_fetch_caches_successful_responses_by_url_and_params(monkeypatch):
+    calls = _fake_get(monkeypatch, lambda url: _FakeResponse(url))
+
+    first = upstream.fetch('https://example.test/a', params={'q': 'x', 'page': 1})
+    second = upstream.fetch('https://example.test/a', params={'page': 1, 'q': 'x'})
+    upstream.fetch('https://example.test/a', params={'q': 'y'})
+
+    assert first is second
+    assert first.json() == {'ok': True}
+    assert first.headers['content-type'] == 'application/json'
+    assert len(calls) == 2
+    assert calls[0][2] == (upstream.CONNECT_TIMEOUT, upstream.DEFAULT_TIMEOUT)
+    assert upstream.stats()['hits'] == 1
+
+
+def test_fetch_does_not_cache_errors(monkeypatch):
+    calls = _fake_get(monkeypatch, lambda url: _FakeResponse(url, status_code=502))
+
+    assert upstream.fetch('https://example.test/b').ok is False
+    upstream.fetch('https://example.test/b')
+
+    assert len(calls) == 2
+
+
+def test_fetch_coalesces_concurrent_identical_requests(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def handler(url):
+        started.set()
+        release.wait(5)
+        return _FakeResponse(url)
+
+    calls = _fake_get(monkeypatch, handler)
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(upstream.fetch('https://example.test/c')))
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(
+            target=lambda: results.append(upstream.fetch('https://example.test/c')))
+        for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    deadline = time.time() + 5
+    while upstream.stats()['coalesced'] < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(result is results[0] for result in results)
+
+
+def test_fetch_propagates_request_errors_and_evicts_over_memory_cap(monkeypatch):
+    def handler(url):
+        if url.endswith('down'):
+            raise requests.ConnectionError('down')
+        return _FakeResponse(url, content=b'x' * 10)
+
+    _fake_get(monkeypatch, handler)
+    with pytest.raises(requests.RequestException):
+        upstream.fetch('https://example.test/down')
+
+    monkeypatch.setattr(upstream, 'MAX_CACHE_BYTES', 40)
+    for name in 'abcde':
+        upstream.fetch('https://example.test/' + name)
+
+    assert upstream.stats()['entries'] == 4
+    assert upstream.stats()['bytes'] == 40
+    assert upstream.stats()['evictions'] == 1
@@ -57,6 +57,7 @@ def test_party_tree_nodes_keep_full_hierarchy_with_visibility_counts(monkeypatch
             "groups": ["public-owner", "public-funder", "applied-spectra"],
             "vocab_owner_party": ["Public Owner"],
             "vocab_funder_party": ["Public Owner", "Public Funder"],
+            "vocab_owner_or_funder_party": ["public-funder", "public-owner"],
             "vocab_manufacturer_party": ["Public Manufacturer", "Applied Spectra"],
         },
         {
@@ -66,6 +67,7 @@ def test_party_tree_nodes_keep_full_hierarchy_with_visibility_counts(monkeypatch
             "groups": ["private-owner", "private-manufacturer"],
             "vocab_owner_party": ["Private Owner"],
             "vocab_funder_party": [],
+            "vocab_owner_or_funder_party": ["private owner"],
             "vocab_manufacturer_party": ["private-manufacturer"],
         },
     ]
@@ -116,24 +118,14 @@ def test_party_tree_nodes_keep_full_hierarchy_with_visibility_counts(monkeypatch
     def fake_get_action(name):
         assert name == "package_search"
         def _search(ctx, data):
-            user_name = getattr(ctx.get("auth_user_obj"), "name", None) or ctx.get("user")
-            include_private = data.get("include_private") is True
-            visible = []
-            for record in records:
-                if not record.get("private"):
-                    visible.append(record)
-                elif include_private and user_name in record.get("allowed_users", []):
-                    visible.append(record)
-
-            if data.get("facet") == "true":
-                assert data["facet.field"] == ["vocab_manufacturer_party"]
-                return _facet_items_for_visible_records(ctx, data, records)
-
-            assert data.get("fl") == (
-                "id,name,vocab_owner_party,vocab_funder_party,"
-                "validated_data_dict"
-            )
-            return {"count": len(visible), "results": visible}
+            # Both trees are counted from one rows=0 facet query.
+            assert data.get("facet") == "true"
+            assert data["rows"] == 0
+            assert data["facet.field"] == [
+                "vocab_manufacturer_party",
+                "vocab_owner_or_funder_party",
+            ]
+            return _facet_items_for_visible_records(ctx, data, records)
         return _search
 
     monkeypatch.setattr(views.toolkit, "get_action", fake_get_action)
@@ -213,3 +205,165 @@ def test_owner_party_filter_targets_owner_and_funder_fields_only():
     assert 'vocab_funder_party:"Australian Research Council"' in fq
     assert 'groups:' not in fq
     assert 'vocab_manufacturer_party:' not in fq
+
+
+def _gcmd_response(url, items, next_page=False):
+    import json as _json
+
+    from ckanext.pidinst_theme import upstream
+
+    body = {"result": {"items": items, "next": "more" if next_page else None}}
+    return upstream.UpstreamResponse(
+        url, 200, _json.dumps(body).encode(), {"Content-Type": "application/json"},
+    )
+
+
+def test_fetch_gcmd_merges_schemes_concurrently_and_keeps_partial_results(monkeypatch):
+    import threading
+
+    import flask
+
+    release = threading.Event()
+    monkeypatch.setattr(views, "GCMD_SCHEME_TIMEOUT", 0.2)
+
+    def fake_fetch(url, params=None, timeout=None, ttl=None):
+        if "sciencekeywords" in url:
+            # The science scheme is slow; the merge must not wait for it.
+            release.wait(5)
+            return _gcmd_response(url, [{"_about": "sci", "prefLabel": {"_value": "Sci"}}])
+        return _gcmd_response(url, [
+            {"_about": "inst", "prefLabel": {"_value": "Inst"}},
+        ], next_page=True)
+
+    monkeypatch.setattr(views.upstream, "fetch", fake_fetch)
+    app = flask.Flask(__name__)
+    with app.test_request_context(
+        "/api/proxy/fetch_gcmd?scheme=instruments&include_science=true&keywords=x"
+    ):
+        response = views.fetch_gcmd()
+    release.set()
+
+    data = response.get_json()
+    assert [item["_about"] for item in data["result"]["items"]] == ["inst"]
+    assert data["result"]["items"][0]["_source_scheme"] == "instruments"
+    assert data["result"]["next"].startswith("/api/proxy/fetch_gcmd?scheme=instruments")
+
+
+def test_fetch_gcmd_merge_prefers_requested_scheme_for_duplicates(monkeypatch):
+    import flask
+
+    def fake_fetch(url, params=None, timeout=None, ttl=None):
+        if "sciencekeywords" in url:
+            return _gcmd_response(url, [
+                {"_about": "shared", "prefLabel": {"_value": "Shared"}},
+                {"_about": "sci", "prefLabel": {"_value": "Sci"}},
+            ])
+        return _gcmd_response(url, [{"_about": "shared", "prefLabel": {"_value": "Shared"}}])
+
+    monkeypatch.setattr(views.upstream, "fetch", fake_fetch)
+    app = flask.Flask(__name__)
+    with app.test_request_context(
+        "/api/proxy/fetch_gcmd?scheme=platforms&include_science=1"
+    ):
+        data = views.fetch_gcmd().get_json()
+
+    assert [(i["_about"], i["_source_scheme"]) for i in data["result"]["items"]] == [
+        ("shared", "platforms"),
+        ("sci", "science"),
+    ]
+
+
+def test_stable_facet_params_tag_filters_and_exclude_them_from_facets():
+    fq_entry = views._tagged_filter_query(
+        ['+vocab_instrument_classification:"Sensor"', ' +commissioned_end:[20200101 TO *]'])
+    assert fq_entry == (
+        '{!lucene tag=pidinst_filters}'
+        '+vocab_instrument_classification:"Sensor" +commissioned_end:[20200101 TO *]'
+    )
+    assert views._stable_facet_field_params(['vocab_manufacturer_party']) == [
+        '{!lucene ex=pidinst_filters key=vocab_manufacturer_party__stable}'
+        'vocab_manufacturer_party'
+    ]
+
+
+def test_pop_stable_facets_splits_filtered_and_baseline_counts():
+    search_facets = {
+        'vocab_manufacturer_party': {'items': [{'name': 'A', 'count': 1}]},
+        'vocab_manufacturer_party__stable': {
+            'items': [{'name': 'A', 'count': 3}, {'name': 'B', 'count': 2}]},
+    }
+
+    stable = views._pop_stable_facets(
+        search_facets, ['vocab_manufacturer_party', 'vocab_instrument_classification'])
+
+    assert stable == {
+        'vocab_manufacturer_party': {
+            'items': [{'name': 'A', 'count': 3}, {'name': 'B', 'count': 2}]},
+        'vocab_instrument_classification': {'items': []},
+    }
+    assert list(search_facets) == ['vocab_manufacturer_party']
+    assert views._pop_stable_facets(search_facets, ['vocab_manufacturer_party']) is None
+
+
+def test_group_page_main_query_moves_filters_into_tagged_fq():
+    from ckanext.pidinst_theme import plugin
+    from ckanext.pidinst_theme.logic import schema
+
+    params = {
+        'q': '',
+        'rows': 20,
+        'fq': 'owner_org:"org-1" vocab_instrument_classification:"Sensor" '
+              + schema._EXCLUDED_STATUS_FQ
+              + ' +(vocab_manufacturer_party:"A" OR vocab_manufacturer_party:"B")',
+        'facet.field': ['vocab_owner_party'],
+    }
+
+    params = plugin._tag_group_page_filters(params)
+
+    assert params['fq'] == 'owner_org:"org-1" ' + schema._EXCLUDED_STATUS_FQ
+    assert params['fq_list'] == [
+        '{!lucene tag=pidinst_filters}vocab_instrument_classification:"Sensor" '
+        '+(vocab_manufacturer_party:"A" OR vocab_manufacturer_party:"B")'
+    ]
+    assert params['facet.field'][0] == 'vocab_owner_party'
+    assert len(params['facet.field']) == 1 + len(views._CHECKBOX_FACET_FIELDS)
+    assert params['facet.limit'] == views._STABLE_FACET_LIMIT
+
+
+@pytest.mark.parametrize('overrides', [
+    {'q': 'seismometer'},   # text queries keep the separate baseline query
+    {'rows': 0},            # the baseline query itself
+])
+def test_group_page_filters_left_alone_outside_main_query(overrides):
+    from ckanext.pidinst_theme import plugin
+
+    params = dict({
+        'q': '',
+        'rows': 20,
+        'fq': 'groups:"lab" vocab_instrument_classification:"Sensor"',
+        'facet.field': ['vocab_owner_party'],
+    }, **overrides)
+    original = dict(params)
+
+    assert plugin._tag_group_page_filters(params) == original
+
+
+def test_group_page_stable_facets_sorted_like_ckan_facets(monkeypatch):
+    from types import SimpleNamespace
+    from ckanext.pidinst_theme import plugin
+
+    fake_tk = SimpleNamespace(g=SimpleNamespace())
+    monkeypatch.setattr(plugin, 'toolkit', fake_tk)
+    monkeypatch.setattr(plugin, '_group_page_request', lambda: ('/party/lab', True))
+    field = views._CHECKBOX_FACET_FIELDS[0]
+    results = {'search_facets': {field + views._STABLE_FACET_SUFFIX: {'items': [
+        {'name': 'b', 'display_name': 'B', 'count': 1},
+        {'name': 'c', 'display_name': 'C', 'count': 5},
+        {'name': 'a', 'display_name': 'A', 'count': 9},
+    ]}}}
+
+    plugin.PidinstThemePlugin.after_dataset_search(None, results, {})
+
+    items = fake_tk.g.pidinst_group_stable_facets[field]['items']
+    assert [i['name'] for i in items] == ['c', 'b', 'a']
+    assert results['search_facets'] == {}
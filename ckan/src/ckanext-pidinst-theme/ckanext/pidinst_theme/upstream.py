@@ -0,0 +1,202 @@
+"""Shared upstream-fetch layer for the vocabulary/registry proxy views.
+
+The ``/api/proxy/*`` views (GCMD, ANZSRC terms, EPSG, ROR) are hit on every
+Select2 keystroke.  Routing them through :func:`fetch` gives them:
+
+* one pooled keep-alive ``requests.Session`` instead of a new connection per
+  call;
+* a strict (connect, read) timeout on every request;
+* a response cache keyed by URL + query params, with a per-call TTL and a
+  total memory cap (least recently used entries are evicted first); only
+  2xx responses are cached;
+* request coalescing: concurrent identical requests share a single upstream
+  call instead of each hitting the remote service.
+
+Network errors are raised as ``requests.RequestException`` just like a
+plain ``requests.get`` so callers keep their existing error handling.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CONNECT_TIMEOUT = 3.05   # seconds
+DEFAULT_TIMEOUT = 10     # seconds, read timeout
+DEFAULT_TTL = 3600       # seconds
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class UpstreamResponse:
+    """The parts of an upstream response the proxy views use.
+
+    Unlike ``requests.Response`` this is a plain value object, so it can be
+    cached and shared between coalesced callers.
+    """
+
+    __slots__ = ('url', 'status_code', 'content', 'headers')
+
+    def __init__(self, url, status_code, content, headers):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _Call:
+    """An in-flight upstream request that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+_lock = threading.Lock()
+_cache = OrderedDict()   # key -> (expires_at, UpstreamResponse)
+_cache_bytes = 0
+_inflight = {}           # key -> _Call
+_stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0}
+_session = None
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def _cache_key(url, params):
+    return (url, tuple(sorted((params or {}).items())))
+
+
+def _cache_get(key):
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    if time.time() >= entry[0]:
+        _cache_drop(key)
+        return None
+    _cache.move_to_end(key)
+    return entry[1]
+
+
+def _cache_drop(key):
+    global _cache_bytes
+    _expires_at, response = _cache.pop(key)
+    _cache_bytes -= len(response.content)
+
+
+def _cache_set(key, response, ttl):
+    global _cache_bytes
+    size = len(response.content)
+    if ttl <= 0 or size > MAX_CACHE_BYTES // 4:
+        return
+    if key in _cache:
+        _cache_drop(key)
+    _cache[key] = (time.time() + ttl, response)
+    _cache_bytes += size
+    while _cache_bytes > MAX_CACHE_BYTES:
+        oldest = next(iter(_cache))
+        _cache_drop(oldest)
+        _stats['evictions'] += 1
+
+
+def fetch(url, params=None, timeout=DEFAULT_TIMEOUT, ttl=DEFAULT_TTL):
+    """GET *url* through the shared session, cache and coalescer.
+
+    Args:
+        url: Upstream URL.
+        params: Optional query parameters (part of the cache key).
+        timeout: Read timeout in seconds; the connect timeout is always
+            ``CONNECT_TIMEOUT``.
+        ttl: Seconds to cache a 2xx response; ``0`` disables caching.
+
+    Returns:
+        An :class:`UpstreamResponse`.
+
+    Raises:
+        requests.RequestException: if the upstream request fails.
+    """
+    key = _cache_key(url, params)
+    with _lock:
+        cached = _cache_get(key)
+        if cached is not None:
+            _stats['hits'] += 1
+            return cached
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _Call()
+            _inflight[key] = call
+            _stats['misses'] += 1
+        else:
+            _stats['coalesced'] += 1
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.response
+
+    try:
+        resp = _get_session().get(
+            url, params=params, timeout=(CONNECT_TIMEOUT, timeout),
+        )
+        response = UpstreamResponse(
+            resp.url, resp.status_code, resp.content,
+            CaseInsensitiveDict(resp.headers),
+        )
+        call.response = response
+        if 200 <= response.status_code < 300:
+            with _lock:
+                _cache_set(key, response, ttl)
+        return response
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        call.done.set()
+
+
+def clear():
+    """Drop all cached responses and reset the counters."""
+    global _cache_bytes
+    with _lock:
+        _cache.clear()
+        _cache_bytes = 0
+        for name in _stats:
+            _stats[name] = 0
+
+
+def stats():
+    """Return cache/coalescing counters plus current entry count and size."""
+    with _lock:
+        result = dict(_stats)
+        result['entries'] = len(_cache)
+        result['bytes'] = _cache_bytes
+    return result
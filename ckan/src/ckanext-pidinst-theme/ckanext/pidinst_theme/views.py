@@ -1,5 +1,6 @@
 from flask import Blueprint, request, Response, render_template, redirect, url_for, session , jsonify
 from flask.views import MethodView
+from concurrent.futures import ThreadPoolExecutor, wait
 from functools import partial
 import requests
 import os
@@ -24,6 +25,9 @@ from ckanext.pidinst_theme.logic import (
 from ckanext.pidinst_theme.logic.schema import _parse_date_bound, _DATE_FILTER_DEFS
 from ckanext.pidinst_theme import analytics_views
 from ckanext.pidinst_theme import analytics
+from ckanext.pidinst_theme import facet_cache
+from ckanext.pidinst_theme import field_terms_index
+from ckanext.pidinst_theme import upstream
 
 check_access = logic.check_access
 NotAuthorized = logic.NotAuthorized
@@ -33,7 +37,7 @@ ValidationError = logic.ValidationError
 log = logging.getLogger(__name__)
 
 
-_PARTY_TREE_CACHE_SCHEMA_VERSION = 5
+_PARTY_TREE_CACHE_SCHEMA_VERSION = 6
 
 try:
     from ckanext.contact.routes import _helpers
@@ -115,6 +119,8 @@ pidinst_theme.add_url_rule("/pidinst_theme/page", view_func=page)
 
 
 GCMD_BASE_URL = 'https://vocabs.ardc.edu.au/repository/api/lda'
+# Per-scheme time budget (seconds) when fetch_gcmd merges several schemes.
+GCMD_SCHEME_TIMEOUT = 10
 GCMD_VOCAB_ENDPOINTS = {
     'science': 'ardc-curated/gcmd-sciencekeywords/17-5-2023-12-21',
     'measured_variables': 'ardc-curated/gcmd-measurementname/21-5-2025-06-06',
@@ -308,16 +314,30 @@ def request_join_organisation():
         logger.error('An error occurred while processing your request: {}'.format(str(e)))
         return toolkit.abort(500, toolkit._('Internal server error'))
 
+# EPSG codes change rarely; cache their pages for longer than the vocab proxies.
+EPSG_CACHE_TTL = 24 * 3600
+
+
 # Add the proxy route
 @pidinst_theme.route('/api/proxy/fetch_epsg', methods=['GET'])
 def fetch_epsg():
     page = request.args.get('page', 0)
     keywords = request.args.get('keywords', '')
-    external_url = f'https://apps.epsg.org/api/v1/CoordRefSystem/?includeDeprecated=false&pageSize=50&page={page}&keywords={keywords}'
+    external_url = 'https://apps.epsg.org/api/v1/CoordRefSystem/'
+    params = {
+        'includeDeprecated': 'false',
+        'pageSize': 50,
+        'page': page,
+        'keywords': keywords,
+    }
 
-    response = requests.get(external_url)
+    try:
+        response = upstream.fetch(external_url, params=params, ttl=EPSG_CACHE_TTL)
+    except requests.exceptions.RequestException as e:
+        log.error(f"EPSG request error: {str(e)}")
+        return {"error": "EPSG service unavailable"}, 503
     if response.ok:
-        return Response(response.content, content_type=response.headers['Content-Type'], status=response.status_code)
+        return Response(response.content, content_type=response.headers.get('Content-Type'), status=response.status_code)
     else:
         return {"error": "Failed to fetch EPSG codes"}, 502
 
@@ -325,14 +345,49 @@ def fetch_epsg():
 def fetch_terms( ):
     page = request.args.get('page', 0)
     keywords = request.args.get('keywords', '')
-    external_url = f'https://vocabs.ardc.edu.au/repository/api/lda/anzsrc-2020-for/concept.json?_page={page}&labelcontains={keywords}'
+    external_url = 'https://vocabs.ardc.edu.au/repository/api/lda/anzsrc-2020-for/concept.json'
+    params = {'_page': page, 'labelcontains': keywords}
 
-    response = requests.get(external_url)
+    try:
+        response = upstream.fetch(external_url, params=params)
+    except requests.exceptions.RequestException as e:
+        log.error(f"ARDC terms request error: {str(e)}")
+        return {"error": "Vocabulary service unavailable"}, 503
     if response.ok:
-        return Response(response.content, content_type=response.headers['Content-Type'], status=response.status_code)
+        return Response(response.content, content_type=response.headers.get('Content-Type'), status=response.status_code)
     else:
         return {"error": "Failed to fetch terms"}, 502
 
+def _fetch_gcmd_scheme(source_scheme, page, keywords):
+    """Fetch one GCMD concept page.  Returns ``(data, None)`` or ``(None, error)``."""
+    source_url = _gcmd_concept_url(source_scheme, page, keywords)
+    log.debug(f"Fetching GCMD vocab: scheme={source_scheme}, url={source_url}")
+    try:
+        response = upstream.fetch(source_url, timeout=GCMD_SCHEME_TIMEOUT)
+        if not response.ok:
+            log.error(f"ARDC vocab fetch failed: {response.status_code} - {source_url}")
+            return None, {
+                'scheme': source_scheme,
+                'status': response.status_code,
+                'url': source_url,
+            }
+        return response.json(), None
+    except requests.exceptions.RequestException as e:
+        log.error(f"ARDC vocab request error: {str(e)} - {source_url}")
+        return None, {
+            'scheme': source_scheme,
+            'request_error': str(e),
+            'url': source_url,
+        }
+    except ValueError as e:
+        log.error(f"ARDC vocab JSON parse error: {str(e)} - {source_url}")
+        return None, {
+            'scheme': source_scheme,
+            'parse_error': str(e),
+            'url': source_url,
+        }
+
+
 @pidinst_theme.route('/api/proxy/fetch_gcmd', methods=['GET'])
 def fetch_gcmd():
     try:
@@ -360,9 +415,9 @@ def fetch_gcmd():
 
     try:
         if not include_science:
-            response = requests.get(external_url, timeout=10)
+            response = upstream.fetch(external_url, timeout=10)
             if response.ok:
-                return Response(response.content, content_type=response.headers['Content-Type'], status=response.status_code)
+                return Response(response.content, content_type=response.headers.get('Content-Type'), status=response.status_code)
 
             log.error(f"ARDC vocab fetch failed: {response.status_code} - {external_url}")
             return {"error": f"Failed to fetch {scheme} vocabulary", "status": response.status_code}, 502
@@ -370,42 +425,46 @@ def fetch_gcmd():
         log.error(f"ARDC vocab request error: {str(e)} - {external_url}")
         return {"error": "Vocabulary service unavailable"}, 503
 
+    # Fetch every scheme concurrently; each gets its own time budget and a
+    # slow or failing scheme only drops its own items.
+    fetched = {}
+    upstream_errors = []
+    executor = ThreadPoolExecutor(max_workers=len(schemes))
+    try:
+        futures = {
+            executor.submit(_fetch_gcmd_scheme, source_scheme, page, keywords): source_scheme
+            for source_scheme in schemes
+        }
+        done, pending = wait(futures, timeout=GCMD_SCHEME_TIMEOUT)
+        for future in done:
+            data, error = future.result()
+            if error:
+                upstream_errors.append(error)
+            else:
+                fetched[futures[future]] = data
+        for future in pending:
+            source_scheme = futures[future]
+            upstream_errors.append({
+                'scheme': source_scheme,
+                'request_error': 'timed out',
+                'url': _gcmd_concept_url(source_scheme, page, keywords),
+            })
+            log.error(f"ARDC vocab request timed out: scheme={source_scheme}")
+        upstream_errors.sort(key=lambda e: schemes.index(e['scheme']))
+    finally:
+        # Don't block the response on a slow scheme; upstream.fetch still
+        # caches its result for the next keystroke.
+        executor.shutdown(wait=False)
+
     first_data = None
     merged_items = []
     seen = set()
     has_next = False
-    upstream_errors = []
 
+    # Merge in scheme order so the requested scheme wins duplicate concepts.
     for source_scheme in schemes:
-        source_url = _gcmd_concept_url(source_scheme, page, keywords)
-        log.debug(f"Fetching GCMD vocab: scheme={source_scheme}, url={source_url}")
-        try:
-            response = requests.get(source_url, timeout=10)
-            if not response.ok:
-                upstream_errors.append({
-                    'scheme': source_scheme,
-                    'status': response.status_code,
-                    'url': source_url,
-                })
-                log.error(f"ARDC vocab fetch failed: {response.status_code} - {source_url}")
-                continue
-
-            data = response.json()
-        except requests.exceptions.RequestException as e:
-            upstream_errors.append({
-                'scheme': source_scheme,
-                'request_error': str(e),
-                'url': source_url,
-            })
-            log.error(f"ARDC vocab request error: {str(e)} - {source_url}")
-            continue
-        except ValueError as e:
-            upstream_errors.append({
-                'scheme': source_scheme,
-                'parse_error': str(e),
-                'url': source_url,
-            })
-            log.error(f"ARDC vocab JSON parse error: {str(e)} - {source_url}")
+        data = fetched.get(source_scheme)
+        if data is None:
             continue
 
         if first_data is None:
@@ -469,7 +528,7 @@ def fetch_gcmd_narrower():
     try:
         # Use the ARDC resource endpoint to look up the concept by canonical URI
         resource_url = f'{GCMD_BASE_URL}/{vocab_path}/resource.json?uri={requests.utils.quote(concept_uri, safe="")}'
-        resp = requests.get(resource_url, timeout=15)
+        resp = upstream.fetch(resource_url, timeout=15)
         if not resp.ok:
             log.error(f"ARDC resource fetch failed: {resp.status_code} - {resource_url}")
             return jsonify({'items': [], 'error': 'Upstream error'}), 502
@@ -488,7 +547,7 @@ def fetch_gcmd_narrower():
             if not label and about:
                 try:
                     child_url = f'{GCMD_BASE_URL}/{vocab_path}/resource.json?uri={requests.utils.quote(about, safe="")}'
-                    child_resp = requests.get(child_url, timeout=8)
+                    child_resp = upstream.fetch(child_url, timeout=8)
                     if child_resp.ok:
                         child_data = child_resp.json()
                         child_primary = child_data.get('result', {}).get('primaryTopic', {})
@@ -615,7 +674,7 @@ def ror_search():
         # --- Direct ROR ID lookup ---
         if query_term.startswith('https://ror.org/'):
             ror_url = f'{ROR_API_BASE}/{query_term}'
-            resp = requests.get(ror_url, timeout=10)
+            resp = upstream.fetch(ror_url, timeout=10)
             if resp.ok:
                 items = [resp.json()]
             else:
@@ -634,7 +693,7 @@ def ror_search():
                 params['filter'] = f'country.country_code:AU,{type_filter}'
             # else: no filter → global search
 
-            resp = requests.get(ROR_API_BASE, params=params, timeout=10)
+            resp = upstream.fetch(ROR_API_BASE, params=params, timeout=10)
             if not resp.ok:
                 log.error('ROR search failed: %s %s',
                           resp.status_code, resp.text[:200])
@@ -693,63 +752,9 @@ def invalidate_party_cache():
 def _load_all_party_metadata():
     """Load all party groups with merged extras.  Returns {slug: merged_dict}.
 
-    Uses two raw SQL queries total, bypassing the CKAN group_list action
-    layer which computes package counts, member counts and image URLs for
-    every group — a significant source of latency we don't need here.
+    See party_cache.load_party_metadata (two SQL queries, cached).
     """
-    cached = _party_cache_get('_party_metadata')
-    if cached is not None:
-        log.info('[PERF] _load_all_party_metadata: cache HIT')
-        return cached
-
-    import ckan.model as _model  # local import to keep module-level imports clean
-
-    _t0 = time.time()
-
-    # Query 1: only the three columns we actually use — no computed fields.
-    group_rows = (
-        _model.Session.query(
-            _model.Group.id,
-            _model.Group.name,
-            _model.Group.title,
-        )
-        .filter(_model.Group.type == 'party')
-        .filter(_model.Group.state == 'active')
-        .all()
-    )
-    _t1 = time.time()
-    log.info('[PERF] _load_all_party_metadata: SQL group query returned %d parties in %.3fs',
-             len(group_rows), _t1 - _t0)
-
-    # Query 2: all extras for those groups in a single IN(...) query.
-    group_ids = [row.id for row in group_rows]
-    extras_by_group = {}
-    if group_ids:
-        extra_rows = (
-            _model.Session.query(_model.GroupExtra)
-            .filter(_model.GroupExtra.group_id.in_(group_ids))
-            .filter(_model.GroupExtra.state == 'active')
-            .all()
-        )
-        for row in extra_rows:
-            extras_by_group.setdefault(row.group_id, {})[row.key] = row.value
-    _t2 = time.time()
-    log.info('[PERF] _load_all_party_metadata: batched extras query returned %d rows in %.3fs',
-             sum(len(v) for v in extras_by_group.values()), _t2 - _t1)
-
-    parties = {}
-    for row in group_rows:
-        merged = {
-            'id':    row.id,
-            'name':  row.name,
-            'title': row.title or row.name,
-        }
-        merged.update(extras_by_group.get(row.id, {}))
-        parties[row.name] = merged
-
-    _party_cache_set('_party_metadata', parties)
-    log.info('[PERF] _load_all_party_metadata: total MISS path %.3fs', time.time() - _t0)
-    return parties
+    return _party_cache_mod.load_party_metadata()
 
 
 def _parse_party_roles(merged):
@@ -864,67 +869,13 @@ def _build_owner_funder_party_fq(owner_parties, all_parties=None):
     return '+(' + ' OR '.join(clauses) + ')'
 
 
-def _listify_search_value(value):
-    """Return a package_search field value as a list of non-empty strings."""
-    if value is None:
-        return []
-    if isinstance(value, str):
-        value = value.strip()
-        if not value:
-            return []
-        if value.startswith('['):
-            try:
-                parsed = json.loads(value)
-                if isinstance(parsed, list):
-                    value = parsed
-            except Exception:
-                pass
-        if isinstance(value, str):
-            return [value]
-    if isinstance(value, list):
-        return [str(v).strip() for v in value if str(v).strip()]
-    return [str(value).strip()] if str(value).strip() else []
-
-
-def _party_values_from_package(pkg, facet_field, object_field, name_key, id_key):
-    """Extract party slug/title values from Solr fields with validated-data fallback."""
-    values = _listify_search_value(pkg.get(facet_field))
-    if values:
-        return values
-
-    vdd = pkg.get('validated_data_dict')
-    if not vdd:
-        return []
-    try:
-        data = json.loads(vdd) if isinstance(vdd, str) else vdd
-    except Exception:
-        return []
-
-    object_values = data.get(object_field, []) if isinstance(data, dict) else []
-    if isinstance(object_values, str):
-        try:
-            object_values = json.loads(object_values)
-        except Exception:
-            object_values = []
-
-    values = []
-    if isinstance(object_values, list):
-        for item in object_values:
-            if not isinstance(item, dict):
-                continue
-            for key in (id_key, name_key):
-                value = item.get(key)
-                if value:
-                    values.append(str(value).strip())
-    return [v for v in values if v]
-
-
 def _build_party_trees(is_platform, search_context=None):
     """Build owner and manufacturer party node lists.
 
-    Returns (owner_nodes, manufacturer_nodes).  Manufacturer counts are read
-    from Solr facets.  Owner/funder counts are distinct visible package counts
-    across owner and funder fields so a package that lists the same party in
+    Returns (owner_nodes, manufacturer_nodes).  Both are counted from one
+    rows=0 Solr facet query: manufacturers from ``vocab_manufacturer_party``,
+    owners/funders from ``vocab_owner_or_funder_party``, which is
+    deduplicated at index time so a package that lists the same party in
     both roles is counted once.  Cached for _PARTY_CACHE_TTL seconds.
     """
     search_context = search_context or _current_package_search_context()
@@ -997,7 +948,10 @@ def _build_party_trees(is_platform, search_context=None):
             'fq': fq,
             'rows': 0,
             'facet': 'true',
-            'facet.field': ['vocab_manufacturer_party'],
+            'facet.field': [
+                'vocab_manufacturer_party',
+                'vocab_owner_or_funder_party',
+            ],
             'facet.limit': -1,    # return all values, not just top-N
             'facet.mincount': 1,
             'include_private': include_private,
@@ -1010,60 +964,13 @@ def _build_party_trees(is_platform, search_context=None):
 
     search_facets = facet_result.get('search_facets', {})
 
-    # Count distinct visible packages per owner/funder party.  The owner and
-    # funder facets cannot simply be added because the same package may list
-    # the same party in both roles.
+    # Owner/funder facet values are party slugs (or lower-cased names for
+    # entries without a party id), already distinct per package.
     owner_value_to_slug = _party_slug_lookup(owner_map.keys(), title_map)
-    owner_package_ids_by_slug = {slug: set() for slug in owner_map}
-    rows = 1000
-    start = 0
-    try:
-        while True:
-            package_result = toolkit.get_action('package_search')(search_context, {
-                'q': '*:*',
-                'fq': fq,
-                'rows': rows,
-                'start': start,
-                'fl': (
-                    'id,name,vocab_owner_party,vocab_funder_party,'
-                    'validated_data_dict'
-                ),
-                'include_private': include_private,
-            })
-            packages = package_result.get('results', [])
-            for pkg in packages:
-                package_id = pkg.get('id') or pkg.get('name')
-                if not package_id:
-                    continue
-                party_values = []
-                party_values.extend(_party_values_from_package(
-                    pkg,
-                    'vocab_owner_party',
-                    'owner',
-                    'owner_name',
-                    'owner_party_id',
-                ))
-                party_values.extend(_party_values_from_package(
-                    pkg,
-                    'vocab_funder_party',
-                    'funder',
-                    'funder_name',
-                    'funder_party_id',
-                ))
-                for value in party_values:
-                    slug = _lookup_party_slug(value, owner_value_to_slug)
-                    if slug and slug in owner_package_ids_by_slug:
-                        owner_package_ids_by_slug[slug].add(package_id)
-
-            start += len(packages)
-            total = package_result.get('count', start)
-            if not packages or start >= total:
-                break
-
-        for slug, package_ids in owner_package_ids_by_slug.items():
-            owner_map[slug]['count'] = len(package_ids)
-    except Exception as e:
-        log.warning('Party owner/funder distinct count query failed: %s', e)
+    for item in search_facets.get('vocab_owner_or_funder_party', {}).get('items', []):
+        slug = _lookup_party_slug(item.get('name', ''), owner_value_to_slug)
+        if slug and slug in owner_map:
+            owner_map[slug]['count'] += item['count']
 
     # Manufacturer nodes use display titles as ids, but count mapping still
     # accepts either slug or title from Solr.
@@ -1587,7 +1494,7 @@ def _resolve_ror_hierarchy(item):
 
         # Fetch the full parent record from ROR so we can store all fields
         try:
-            resp = requests.get(f'{ROR_API_BASE}/{parent_id}', timeout=10)
+            resp = upstream.fetch(f'{ROR_API_BASE}/{parent_id}', timeout=10)
             if not resp.ok:
                 log.warning('Could not fetch ROR parent %s: %s', parent_id, resp.status_code)
                 parent_name = parent_rel.get('label', parent_id)
@@ -1628,59 +1535,7 @@ def field_terms_autocomplete(field_name):
     query_term = request.args.get('q', '').strip().lower()
 
     try:
-        context = {'ignore_auth': True}
-        search_result = get_action('package_search')(context, {
-            'q': '*:*',
-            'rows': 1000,
-            'fl': 'id,validated_data_dict',
-        })
-
-        all_terms = set()
-        for pkg in search_result.get('results', []):
-            vdd_str = pkg.get('validated_data_dict', '')
-            if not vdd_str:
-                continue
-            try:
-                vdd = json.loads(vdd_str) if isinstance(vdd_str, str) else vdd_str
-            except json.JSONDecodeError:
-                continue
-
-            # Handle nested fields (composite_repeating)
-            if is_nested:
-                parent_field = NESTED_FIELD_TERMS[field_name]
-                parent_value = vdd.get(parent_field, [])
-                # parent_value is a list of dicts
-                if isinstance(parent_value, list):
-                    for item in parent_value:
-                        if isinstance(item, dict):
-                            term = item.get(field_name, '')
-                            if isinstance(term, str) and term.strip():
-                                all_terms.add(term.strip())
-            else:
-                # Handle simple fields
-                field_value = vdd.get(field_name, '')
-                if not field_value:
-                    continue
-                terms = []
-                if isinstance(field_value, str):
-                    if field_value.startswith('['):
-                        try:
-                            terms = json.loads(field_value)
-                        except json.JSONDecodeError:
-                            terms = [t.strip() for t in field_value.split(',') if t.strip()]
-                    else:
-                        terms = [t.strip() for t in field_value.split(',') if t.strip()]
-                elif isinstance(field_value, list):
-                    terms = field_value
-                for term in terms:
-                    if isinstance(term, str) and term.strip():
-                        all_terms.add(term.strip())
-
-        if query_term:
-            matching = sorted([t for t in all_terms if query_term in t.lower()])[:20]
-        else:
-            matching = sorted(all_terms)[:20]
-        return jsonify({"terms": matching})
+        return jsonify({"terms": field_terms_index.lookup(field_name, query_term)})
 
     except Exception as e:
         log.error(f"Error fetching field terms for {field_name}: {e}")
@@ -1759,6 +1614,44 @@ _CHECKBOX_FACET_FIELDS = [
 ]
 
 
+# Single-query stable facets.  The user's filter clauses are sent as one
+# tagged filter query and every checkbox facet is requested a second time,
+# under a "<field>__stable" key, with that tag excluded, so Solr returns the
+# filtered results and the baseline (scope-only) facet counts in one
+# round-trip.  The "lucene" parser is named explicitly because CKAN only
+# passes local params for parsers in ckan.search.solr_allowed_query_parsers
+# (added by PidinstThemePlugin.update_config).
+_FILTER_TAG = 'pidinst_filters'
+_STABLE_FACET_SUFFIX = '__stable'
+_STABLE_FACET_LIMIT = 200
+
+
+def _tagged_filter_query(clauses):
+    """Return an fq_list entry holding *clauses*, tagged for facet exclusion."""
+    return '{!lucene tag=%s}%s' % (_FILTER_TAG, ' '.join(c.strip() for c in clauses))
+
+
+def _stable_facet_field_params(fields):
+    """Return facet.field entries counting *fields* without the tagged filters."""
+    return [
+        '{!lucene ex=%s key=%s%s}%s' % (_FILTER_TAG, field, _STABLE_FACET_SUFFIX, field)
+        for field in fields
+    ]
+
+
+def _pop_stable_facets(search_facets, fields):
+    """Move the ``__stable`` facets out of *search_facets*.
+
+    Returns  field -> facet dict, or None if the search did not request them.
+    """
+    if not any(field + _STABLE_FACET_SUFFIX in search_facets for field in fields):
+        return None
+    return {
+        field: search_facets.pop(field + _STABLE_FACET_SUFFIX, {'items': []})
+        for field in fields
+    }
+
+
 def _build_filter_facet_items(filter_facets, fields_grouped):
     """
     Build the stable facet-item dicts used by checkbox templates.
@@ -1804,10 +1697,11 @@ def _build_group_stable_facets(forced_fq, fields_grouped, is_logged_in):
     """Perform a rows=0 baseline Solr query and return stable filter_facet_items.
 
     Used by org/party group pages so checkboxes remain stable after filtering,
-    matching the behaviour of the instruments/platforms pages.
+    matching the behaviour of the instruments/platforms pages.  The query
+    goes through facet_cache.
     """
     try:
-        baseline = toolkit.get_action('package_search')({'ignore_auth': True}, {
+        baseline = facet_cache.package_search({'ignore_auth': True}, {
             'q': '*:*',
             'fq': forced_fq,
             'rows': 0,
@@ -1915,13 +1809,40 @@ def _instrument_platform_search(is_platform_value, template, named_route, displa
     }
 
     query_error = False
+    context = {
+        'user': toolkit.c.user,
+        'auth_user_obj': toolkit.c.userobj,
+    }
+    query = None
+    _raw_filter_facets = None
+
+    # Filtered results and stable checkbox facets in one Solr round-trip.
+    # The baseline ignores the text query, which a tag cannot exclude, so a
+    # q search keeps the separate baseline query below.
     _solr_t0 = time.time()
+    if not q:
+        single_dict = dict(data_dict)
+        single_dict.update({
+            'fq': forced_fq,
+            'facet.field': facet_fields + _stable_facet_field_params(facet_fields),
+            'facet.limit': _STABLE_FACET_LIMIT,
+        })
+        if extra_fq_parts:
+            single_dict['fq_list'] = [_tagged_filter_query(extra_fq_parts)]
+        try:
+            query = toolkit.get_action('package_search')(context, single_dict)
+            _raw_filter_facets = _pop_stable_facets(
+                query.get('search_facets', {}), facet_fields)
+        except Exception as e:
+            log.warning('[PERF] %s single-query search failed (%.3fs): %s; '
+                        'retrying as filtered + baseline queries',
+                        template, time.time() - _solr_t0, e)
+            query = None
+            _solr_t0 = time.time()
+
     try:
-        context = {
-            'user': toolkit.c.user,
-            'auth_user_obj': toolkit.c.userobj,
-        }
-        query = toolkit.get_action('package_search')(context, data_dict)
+        if query is None:
+            query = toolkit.get_action('package_search')(context, data_dict)
         log.info('[PERF] %s package_search returned %d results in %.3fs',
                  template, query.get('count', 0), time.time() - _solr_t0)
         # --- Analytics: track search event after successful package_search ---
@@ -1944,28 +1865,31 @@ def _instrument_platform_search(is_platform_value, template, named_route, displa
         query_error = True
 
     # --- Stable baseline facets for checkbox rendering ---
-    # A separate rows=0 query with only the scope filter (no checkbox / date
-    # filters) keeps the checkbox option list stable: items never disappear
-    # when filters are applied.  Active-but-missing values are injected below.
-    _baseline_t0 = time.time()
-    try:
-        baseline_query = toolkit.get_action('package_search')(context, {
-            'q': '*:*',
-            'fq': forced_fq,
-            'rows': 0,
-            'facet': 'true',
-            'facet.field': facet_fields,
-            'facet.limit': 200,
-            'facet.mincount': 1,
-            'include_private': is_logged_in,
-        })
-        _raw_filter_facets = baseline_query.get('search_facets', {})
-        log.info('[PERF] %s baseline facet query done in %.3fs',
-                 template, time.time() - _baseline_t0)
-    except Exception as _be:
-        log.warning('[PERF] %s baseline facet query failed (%.3fs): %s; using filtered facets',
-                    template, time.time() - _baseline_t0, _be)
-        _raw_filter_facets = query.get('search_facets', {})
+    # Facet counts with only the scope filter (no checkbox / date filters)
+    # keep the checkbox option list stable: items never disappear when
+    # filters are applied.  Active-but-missing values are injected below.
+    # Normally they come from the query above; otherwise run a (cached)
+    # rows=0 query.
+    if _raw_filter_facets is None:
+        _baseline_t0 = time.time()
+        try:
+            baseline_query = facet_cache.package_search(context, {
+                'q': '*:*',
+                'fq': forced_fq,
+                'rows': 0,
+                'facet': 'true',
+                'facet.field': facet_fields,
+                'facet.limit': _STABLE_FACET_LIMIT,
+                'facet.mincount': 1,
+                'include_private': is_logged_in,
+            })
+            _raw_filter_facets = baseline_query.get('search_facets', {})
+            log.info('[PERF] %s baseline facet query done in %.3fs',
+                     template, time.time() - _baseline_t0)
+        except Exception as _be:
+            log.warning('[PERF] %s baseline facet query failed (%.3fs): %s; using filtered facets',
+                        template, time.time() - _baseline_t0, _be)
+            _raw_filter_facets = query.get('search_facets', {})
 
     filter_facet_items = _build_filter_facet_items(_raw_filter_facets, fields_grouped)
 
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of a create/update run, one JSON object per line.
+
+    Each processed record appends an entry keyed by a hash of its payload,
+    prefixed with its workbook Record* label (payload "__record__", set by
+    the template reader) when there is one. The latest entry per operation
+    and key wins, so a rerun with the same journal can skip records that
+    already completed and retry only what failed; an edited record, or the
+    same label in another workbook, gets a new key and is processed again.
+    Lines are flushed as they are written, so progress survives a crash or
+    a killed kernel.
+
+    Example:
+        res = client.create_records(records, checkpoint="ingest.journal")
+        # ... run dies at record 1,400; fix the problem, then rerun:
+        res = client.create_records(records, checkpoint="ingest.journal")
+        # completed records are reported under res.skipped
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}  # (op, key) -> entry
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from an interrupted write
+                    if isinstance(entry, dict) and entry.get("key"):
+                        self._entries[(entry.get("op"), entry["key"])] = entry
+
+    @staticmethod
+    def key_for(payload: Dict[str, Any]) -> str:
+        """Journal key of a record payload: its Record* label (if any) plus a content hash."""
+        content = {k: v for k, v in payload.items() if not k.startswith("__")}
+        digest = hashlib.sha1(
+            json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+        label = payload.get("__record__")
+        if label not in (None, ""):
+            return f"record:{label}:{digest}"
+        return f"sha1:{digest}"
+
+    def get(self, key: str, op: str) -> Optional[Dict[str, Any]]:
+        """Latest entry for key written by operation op ('create'/'update'), or None."""
+        with self._lock:
+            return self._entries.get((op, key))
+
+    def record(self, key: str, op: str, status: str, **fields: Any) -> None:
+        """Append an entry (e.g. status='created', id=..., resources_failed=[...])."""
+        entry = {"key": key, "op": op, "status": status, "ts": time.time(), **fields}
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+                fh.flush()
+            self._entries[(op, key)] = entry
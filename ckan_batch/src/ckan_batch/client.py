@@ -4,21 +4,27 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Mapping, Union
 import json
 import os
+import random
 import tempfile
+import time
 import urllib.parse
-import urllib.request
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ckanapi import RemoteCKAN
 from ckanapi.errors import CKANAPIError, NotFound
 
 from ckan_batch.helpers import _to_ckan_payload
+from ckan_batch.checkpoint import CheckpointJournal
 from ckan_batch.constants import GCMD_VOCAB_ENDPOINTS, GCMD_BASE_URL
+from ckan_batch.vocab_cache import MISSING, VocabCache
 
 
 @dataclass
@@ -27,6 +33,50 @@ class CreateResult:
     failed: List[Dict[str, Any]]           # errors with payload + message
     resource_results: List[Dict[str, Any]] = field(default_factory=list)  # per-record resource upload results
     skipped: List[Dict[str, Any]] = field(default_factory=list)  # records skipped (e.g. already exist)
+    stats: Dict[str, Any] = field(default_factory=dict)  # throughput / latency summary of the run
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of *values* (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _run_stats(
+    n_records: int,
+    elapsed: float,
+    latencies: Dict[str, List[float]],
+    max_workers: int,
+) -> Dict[str, Any]:
+    """Summarise a batch run: overall records/s plus p50/p95 per API call."""
+    return {
+        "records": n_records,
+        "max_workers": max_workers,
+        "elapsed_s": round(elapsed, 3),
+        "records_per_s": round(n_records / elapsed, 3) if elapsed > 0 else None,
+        "latency_s": {
+            call: {
+                "count": len(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+            }
+            for call, values in latencies.items()
+            if values
+        },
+    }
+
+
+def _print_run_stats(stats: Dict[str, Any]) -> None:
+    rps = stats.get("records_per_s")
+    print(
+        f"Processed {stats['records']} record(s) in {stats['elapsed_s']:.1f}s "
+        f"({rps if rps is not None else '-'} records/s, max_workers={stats['max_workers']})"
+    )
+    for call, lat in stats.get("latency_s", {}).items():
+        print(f" - {call}: n={lat['count']} p50={lat['p50']:.3f}s p95={lat['p95']:.3f}s")
 
 
 def _extract_name_from_ckan_error(err: Any) -> Optional[str]:
@@ -45,6 +95,83 @@ def _extract_name_from_ckan_error(err: Any) -> Optional[str]:
         return None
 
 
+# Statuses worth retrying: rate limiting and transient server/proxy errors.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Statuses where the server states it did not process the request, so even
+# non-idempotent calls (CKAN actions are POSTs) are safe to resend.
+_REFUSED_STATUSES = (429, 503)
+
+
+# PIDINST.xlsx layout used by the Excel export: rows 1-6 are the title, note,
+# section/group/column headers and help text; data starts at row 7.
+_EXPORT_HEADER_ROWS = 6
+_EXPORT_COLUMNS = 49
+
+
+class _JitteredRetry(Retry):
+    """
+    urllib3 Retry with full jitter on the exponential backoff.
+
+    Idempotent methods are retried on any of RETRY_STATUSES; other methods
+    (e.g. action POSTs such as package_create) only on 429/503, so a write
+    that may have been applied is never sent twice. A Retry-After header
+    takes precedence over the computed backoff.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if self.total is not None and self.total <= 0:
+            return False
+        if status_code not in RETRY_STATUSES:
+            return False
+        if method.upper() in Retry.DEFAULT_ALLOWED_METHODS:
+            return True
+        return status_code in _REFUSED_STATUSES
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+def build_session(
+    *,
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
+) -> requests.Session:
+    """
+    Build a keep-alive requests.Session with per-host connection pools and
+    the retry policy above.
+
+    Args:
+        pool_connections: Number of per-host pools to keep.
+        pool_maxsize: Maximum connections kept alive per host; should be at
+            least the number of worker threads sharing the session.
+        max_retries: Retries per request for retryable responses and
+            connection errors.
+        backoff_factor: Base of the exponential backoff, in seconds.
+    """
+    retry = _JitteredRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,  # a timed-out request may have been applied; don't resend it
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,  # method filtering happens in is_retry
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class CKANClient(RemoteCKAN):
     """
     CKAN API client for both:
@@ -59,8 +186,51 @@ class CKANClient(RemoteCKAN):
 
         # Custom endpoint
         parties = client.get_api("/api/instrument_parties")
+
+    All requests (action calls, custom endpoints, GCMD/EPSG lookups and
+    resource downloads) share one pooled keep-alive session with retries
+    for 429/5xx; see build_session for the pool and retry options.
+
+    Pass vocab_cache=VocabCache() to persist vocabulary lookups on disk
+    across sessions (see warm_vocab_cache for offline GCMD lookups).
+    Party writes made through this client refresh the cached party list;
+    call refresh_vocab("taxonomy_terms") after editing taxonomies elsewhere.
     """
 
+    def __init__(
+        self,
+        address: str,
+        apikey: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        get_only: bool = False,
+        session: Optional[requests.Session] = None,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        vocab_cache: Optional[VocabCache] = None,
+    ):
+        # Optional persistent cache for GCMD/EPSG/taxonomy/party lookups,
+        # shared across sessions. Without it lookups are cached in memory
+        # for the lifetime of this client only.
+        self.vocab_cache = vocab_cache
+        self._session_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "max_retries": max_retries,
+            "backoff_factor": backoff_factor,
+        }
+        if session is None:
+            session = build_session(**self._session_options)
+        super().__init__(
+            address,
+            apikey=apikey,
+            user_agent=user_agent,
+            get_only=get_only,
+            session=session,
+        )
+
     def _build_url(self, path: str) -> str:
         """
         Build an absolute URL from a relative CKAN path.
@@ -107,10 +277,41 @@ class CKANClient(RemoteCKAN):
     @property
     def _http(self) -> requests.Session:
         """
-        Reuse the provided session if RemoteCKAN was initialized with one.
-        Otherwise create a lightweight session on demand.
+        The client's pooled session, shared with RemoteCKAN action calls.
+        Rebuilt if it was released by close().
+        """
+        if self.session is None:
+            self.session = build_session(**self._session_options)
+        return self.session
+
+    def _vocab_cache_get(self, namespace: str, key: str) -> Any:
+        """Persistent-cache read; MISSING when no cache is configured."""
+        if self.vocab_cache is None:
+            return MISSING
+        return self.vocab_cache.get(namespace, key)
+
+    def _vocab_cache_set(self, namespace: str, key: str, value: Any) -> None:
+        if self.vocab_cache is not None:
+            self.vocab_cache.set(namespace, key, value)
+
+    def refresh_vocab(self, namespace: str) -> None:
+        """
+        Drop cached "parties" or "taxonomy_terms" lookups, both in memory and
+        in the persistent vocab_cache, so the next lookup hits the server.
+
+        Party creates and deletes made through this client call this
+        themselves. Taxonomy terms are cached for a day; call
+        refresh_vocab("taxonomy_terms") after editing a taxonomy elsewhere.
         """
-        return self.session if self.session is not None else requests.Session()
+        if namespace == "parties":
+            self._party_cache = None
+        elif namespace == "taxonomy_terms":
+            self._taxonomy_terms_cache = {}
+            self._taxonomy_index_cache = {}
+        else:
+            raise ValueError(f"Unknown vocab namespace: {namespace!r}")
+        if self.vocab_cache is not None:
+            self.vocab_cache.clear(namespace)
 
     def request_api(
         self,
@@ -282,13 +483,23 @@ class CKANClient(RemoteCKAN):
         return {"created": created, "failed": failed}
 
     @staticmethod
-    def _download_to_temp(url: str) -> Tuple[Path, str]:
+    def _resource_name(res: Dict[str, Any]) -> str:
+        """Name create_resources_for_record gives a resource in CKAN."""
+        if res.get("name"):
+            return res["name"]
+        path_str = res.get("path") or ""
+        if path_str.startswith(("http://", "https://")):
+            url_path = urllib.parse.urlparse(path_str).path
+            return Path(urllib.parse.unquote(url_path)).name or "download"
+        return Path(path_str).name
+
+    def _download_to_temp(self, url: str) -> Tuple[Path, str]:
         """
         Download a remote file (e.g. an online image) to a temporary file.
         Returns (temp_path, suggested_name). Caller is responsible for deleting
         the temp file once it is no longer needed.
         """
-        resp = requests.get(url, stream=True, timeout=60)
+        resp = self._http.get(url, stream=True, timeout=60)
         resp.raise_for_status()
 
         # Derive a sensible filename from the URL path.
@@ -318,6 +529,8 @@ class CKANClient(RemoteCKAN):
         *,
         record_type: str = "instrument",
         dry_run: bool = False,
+        max_workers: int = 1,
+        checkpoint: Union[str, Path, CheckpointJournal, None] = None,
     ) -> CreateResult:
         """
         Create CKAN records using package_create (or package_update if enabled and exists).
@@ -325,80 +538,291 @@ class CKANClient(RemoteCKAN):
         Assumptions:
           - Your payload dicts match the CKAN scheming fields (e.g. title, owner, manufacturer, model, etc.)
           - CKAN will generate `name` and DOI (if applicable) server-side
+
+        Concurrency:
+          - max_workers=1 (default) creates records one after another.
+          - max_workers>1 runs up to that many records at once in a bounded
+            thread pool. Each record still does package_create followed by its
+            own resource uploads; results are returned in input order.
+
+        A throughput summary (records/s, p50/p95 latency per API call) is
+        printed at the end and stored on ``CreateResult.stats``.
+
+        Checkpointing:
+          - checkpoint (a journal path or CheckpointJournal) records every
+            created id and its resource upload status as the run goes. The
+            id is journaled as soon as package_create returns, before the
+            uploads, so a killed run never creates the same package twice.
+          - Rerunning with the same journal skips records already created
+            (listed under ``CreateResult.skipped``), re-uploads only the
+            resources that failed, and retries records that failed.
         """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1; got {max_workers!r}")
+        journal = self._checkpoint_journal(checkpoint, dry_run)
+
         created: List[Dict[str, Any]] = []
         failed: List[Dict[str, Any]] = []
+        skipped: List[Dict[str, Any]] = []
         resource_results: List[Dict[str, Any]] = []
+        latencies: Dict[str, List[float]] = {"package_create": [], "create_resources": []}
 
+        todo: List[Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]] = []
         for i, payload in enumerate(records, start=1):
-            # Extract __resources__ before building CKAN payload
-            resources = list(payload.get("__resources__") or [])
-
-            # Ensure record_type is set (scheming uses this)
-            payload_to_send = dict(payload)
-            payload_to_send.pop("__resources__", None)
-            payload_to_send["private"] = not make_public
-            payload_to_send.setdefault("type", record_type)
-
-            if dry_run:
-                rr = self.create_resources_for_record(f"dry_run_{i}", resources, dry_run=True)
-                resource_results.append({"index": i, "package_id": None, **rr})
-                created.append(
-                    {
-                        "status": "dry_run",
+            done = journal.get(journal.key_for(payload), "create") if journal else None
+            if done is not None and done.get("status") == "created":
+                if not done.get("resources_failed"):
+                    skipped.append({
                         "index": i,
-                        "title": payload_to_send.get("title"),
-                        "payload": payload_to_send,
-                        "resources_dry_run": rr,
-                    }
+                        "title": payload.get("title"),
+                        "id": done.get("id"),
+                        "reason": "already created (checkpoint)",
+                    })
+                    continue
+            else:
+                done = None
+            todo.append((i, payload, done))
+
+        def _run(i: int, payload: Dict[str, Any], done: Optional[Dict[str, Any]]):
+            if done is not None:
+                outcome = self._retry_record_resources(i, payload, done)
+            else:
+                outcome = self._create_one_record(
+                    i, payload,
+                    make_public=make_public,
+                    record_type=record_type,
+                    dry_run=dry_run,
+                    on_created=(
+                        (lambda pkg_id: self._journal_package_created(journal, payload, pkg_id))
+                        if journal is not None else None
+                    ),
                 )
-                continue
+            if journal is not None:
+                self._journal_create_outcome(journal, payload, outcome)
+            return outcome
+
+        started = time.perf_counter()
+
+        if max_workers == 1 or dry_run:
+            outcomes = [_run(*item) for item in todo]
+        else:
+            # Make sure the pooled session exists (close() releases it) so
+            # worker threads share one connection pool.
+            self._http
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(_run, *item) for item in todo]
+                outcomes = [f.result() for f in futures]
+
+        for created_entry, failed_entry, rr, timings in outcomes:
+            if created_entry is not None:
+                created.append(created_entry)
+            if failed_entry is not None:
+                failed.append(failed_entry)
+            if rr is not None:
+                resource_results.append(rr)
+            for call, seconds in timings.items():
+                latencies[call].append(seconds)
+
+        stats = _run_stats(len(todo), time.perf_counter() - started, latencies, max_workers)
+        if not dry_run:
+            _print_run_stats(stats)
+        if skipped:
+            print(f"Skipped {len(skipped)} record(s) already completed according to the checkpoint.")
+
+        return CreateResult(
+            created=created,
+            failed=failed,
+            resource_results=resource_results,
+            skipped=skipped,
+            stats=stats,
+        )
+
+    @staticmethod
+    def _checkpoint_journal(
+        checkpoint: Union[str, Path, CheckpointJournal, None],
+        dry_run: bool,
+    ) -> Optional[CheckpointJournal]:
+        """Open the checkpoint journal for a run; dry runs are never journaled."""
+        if checkpoint is None or dry_run:
+            return None
+        if isinstance(checkpoint, CheckpointJournal):
+            return checkpoint
+        return CheckpointJournal(checkpoint)
+
+    @staticmethod
+    def _journal_package_created(journal: CheckpointJournal, payload: Dict[str, Any], pkg_id: str) -> None:
+        """
+        Journal a new package before its resources are uploaded, so a run
+        killed during the uploads resumes with _retry_record_resources
+        instead of creating the package again. All resources are listed as
+        pending until the outcome entry replaces this one.
+        """
+        journal.record(
+            journal.key_for(payload), "create", "created",
+            id=pkg_id,
+            resources_created=[],
+            resources_failed=[r.get("path") for r in payload.get("__resources__") or []],
+        )
 
+    @staticmethod
+    def _journal_create_outcome(journal: CheckpointJournal, payload: Dict[str, Any], outcome: Tuple) -> None:
+        created_entry, failed_entry, rr, _timings = outcome
+        key = journal.key_for(payload)
+        if created_entry is not None:
+            journal.record(
+                key, "create", "created",
+                id=created_entry.get("id"),
+                resources_created=[r.get("id") for r in (rr or {}).get("created", [])],
+                resources_failed=[r.get("path") for r in (rr or {}).get("failed", [])],
+            )
+        elif failed_entry is not None:
+            journal.record(
+                key, "create", "failed",
+                error=failed_entry.get("ckan_error") or failed_entry.get("error"),
+            )
+
+    def _retry_record_resources(
+        self,
+        i: int,
+        payload: Dict[str, Any],
+        done: Dict[str, Any],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]], Dict[str, float]]:
+        """
+        Resume a record whose package was created in an earlier run: upload
+        only the resources that failed then. Same return shape as
+        _create_one_record.
+        """
+        pkg_id = done.get("id")
+        retry_paths = set(done.get("resources_failed") or [])
+        resources = [r for r in payload.get("__resources__") or [] if r.get("path") in retry_paths]
+
+        # A run killed mid-upload may have stored some of these already.
+        if resources:
             try:
-                # Create
-                payload_to_send = _to_ckan_payload(payload_to_send)  # optional pre-processing if needed
-                resp = self.action.package_create(**payload_to_send)
-                pkg_id = resp.get("id")
-                rr = self.create_resources_for_record(pkg_id, resources, dry_run=dry_run)
-                resource_results.append({"index": i, "package_id": pkg_id, **rr})
-                created.append(
-                    {
-                        "status": "created",
-                        "index": i,
-                        "id": pkg_id,
-                        "name": resp.get("name"),
-                        "title": resp.get("title"),
-                        "doi": resp.get("doi"),  # may be None depending on your site/plugin behavior
-                        "response": resp,
-                    }
-                )
+                existing = {
+                    r.get("name") for r in self.action.package_show(id=pkg_id).get("resources") or []
+                }
+            except Exception:
+                existing = set()
+            resources = [r for r in resources if self._resource_name(r) not in existing]
 
-            except CKANAPIError as e:
-                # If already exists and update allowed, try update.
-                # Note: CKAN typically errors on name collision; but your loader excludes name, so collision is unlikely.
-                msg = getattr(e, "error_dict", None) or str(e)
+        t0 = time.perf_counter()
+        rr = self.create_resources_for_record(pkg_id, resources)
+        timings = {"create_resources": time.perf_counter() - t0} if resources else {}
+        return (
+            {
+                "status": "resources_retried",
+                "index": i,
+                "id": pkg_id,
+                "title": payload.get("title"),
+            },
+            None,
+            {"index": i, "package_id": pkg_id, **rr},
+            timings,
+        )
 
-                failed.append(
-                    {
-                        "index": i,
-                        "title": payload_to_send.get("title"),
-                        "error": "CKANAPIError",
-                        "ckan_error": msg,
-                        "payload": payload_to_send,
-                    }
-                )
+    def _create_one_record(
+        self,
+        i: int,
+        payload: Dict[str, Any],
+        *,
+        make_public: bool,
+        record_type: str,
+        dry_run: bool,
+        on_created: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]], Dict[str, float]]:
+        """
+        Create a single record and upload its resources.
+        on_created(package_id) is called between package_create and the uploads.
+        Returns (created_entry, failed_entry, resource_result, timings).
+        """
+        timings: Dict[str, float] = {}
 
-            except Exception as e:
-                failed.append(
-                    {
-                        "index": i,
-                        "title": payload_to_send.get("title"),
-                        "error": f"Unexpected error: {e}",
-                        "payload": payload_to_send,
-                    }
-                )
+        # Extract __resources__ before building CKAN payload
+        resources = list(payload.get("__resources__") or [])
 
-        return CreateResult(created=created, failed=failed, resource_results=resource_results)
+        # Ensure record_type is set (scheming uses this)
+        payload_to_send = dict(payload)
+        payload_to_send.pop("__resources__", None)
+        payload_to_send.pop("__record__", None)
+        payload_to_send["private"] = not make_public
+        payload_to_send.setdefault("type", record_type)
+
+        if dry_run:
+            rr = self.create_resources_for_record(f"dry_run_{i}", resources, dry_run=True)
+            return (
+                {
+                    "status": "dry_run",
+                    "index": i,
+                    "title": payload_to_send.get("title"),
+                    "payload": payload_to_send,
+                    "resources_dry_run": rr,
+                },
+                None,
+                {"index": i, "package_id": None, **rr},
+                timings,
+            )
+
+        try:
+            # Create
+            payload_to_send = _to_ckan_payload(payload_to_send)  # optional pre-processing if needed
+            t0 = time.perf_counter()
+            resp = self.action.package_create(**payload_to_send)
+            timings["package_create"] = time.perf_counter() - t0
+            pkg_id = resp.get("id")
+            if on_created is not None:
+                on_created(pkg_id)
+
+            t0 = time.perf_counter()
+            rr = self.create_resources_for_record(pkg_id, resources, dry_run=dry_run)
+            if resources:
+                timings["create_resources"] = time.perf_counter() - t0
+
+            return (
+                {
+                    "status": "created",
+                    "index": i,
+                    "id": pkg_id,
+                    "name": resp.get("name"),
+                    "title": resp.get("title"),
+                    "doi": resp.get("doi"),  # may be None depending on your site/plugin behavior
+                    "response": resp,
+                },
+                None,
+                {"index": i, "package_id": pkg_id, **rr},
+                timings,
+            )
+
+        except CKANAPIError as e:
+            # If already exists and update allowed, try update.
+            # Note: CKAN typically errors on name collision; but your loader excludes name, so collision is unlikely.
+            msg = getattr(e, "error_dict", None) or str(e)
+
+            return (
+                None,
+                {
+                    "index": i,
+                    "title": payload_to_send.get("title"),
+                    "error": "CKANAPIError",
+                    "ckan_error": msg,
+                    "payload": payload_to_send,
+                },
+                None,
+                timings,
+            )
+
+        except Exception as e:
+            return (
+                None,
+                {
+                    "index": i,
+                    "title": payload_to_send.get("title"),
+                    "error": f"Unexpected error: {e}",
+                    "payload": payload_to_send,
+                },
+                None,
+                timings,
+            )
 
 
     def delete_record_by_id(self, record_id: str, hard_delete: bool = False) -> bool:
@@ -607,9 +1031,46 @@ class CKANClient(RemoteCKAN):
         - You only get what the user can see (private records require permission).
         - `include_private/include_drafts` control CKAN search flags.
         """
-        start = 0
         out: List[Dict[str, Any]] = []
 
+        for pkg in self.iter_packages(
+            q=q,
+            fq=fq,
+            rows=rows,
+            include_private=include_private,
+            include_drafts=include_drafts,
+        ):
+            if verbose:
+                out.append(pkg)  # full package dict
+            else:
+                out.append(
+                    {
+                        "id": pkg.get("id"),
+                        "name": pkg.get("name"),
+                        "title": pkg.get("title"),
+                        "type": pkg.get("type"),
+                        "state": pkg.get("state"),
+                        "owner_org": pkg.get("owner_org"),
+                    }
+                )
+
+        return out
+
+    def iter_packages(
+        self,
+        q: str = "*:*",
+        fq: Optional[str] = None,
+        rows: int = 500,
+        include_private: bool = True,
+        include_drafts: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield full package dicts page by page from package_search.
+
+        Only one page is held in memory, so the result can be piped straight
+        into export_to_excel for whole-registry exports.
+        """
+        start = 0
         while True:
             res = self.action.package_search(
                 q=q,
@@ -622,26 +1083,9 @@ class CKANClient(RemoteCKAN):
             results = res.get("results", [])
             if not results:
                 break
-
-            for pkg in results:
-                if verbose:
-                    out.append(pkg)  # full package dict
-                else:
-                    out.append(
-                        {
-                            "id": pkg.get("id"),
-                            "name": pkg.get("name"),
-                            "title": pkg.get("title"),
-                            "type": pkg.get("type"),
-                            "state": pkg.get("state"),
-                            "owner_org": pkg.get("owner_org"),
-                        }
-                    )
-
+            yield from results
             start += rows
 
-        return out
-
 
     def get_records_by_title(
         self,
@@ -726,6 +1170,13 @@ class CKANClient(RemoteCKAN):
         if cache is not None:
             return cache
 
+        stored = self._vocab_cache_get("parties", self.address)
+        if stored is not MISSING:
+            for p_short in stored.values():
+                p_short["roles"] = set(p_short["roles"])
+            self._party_cache = stored
+            return stored
+
         raw = self.action.group_list(
             all_fields=True,
             include_extras=True,
@@ -766,6 +1217,9 @@ class CKANClient(RemoteCKAN):
             if alias:
                 result[alias.lower()] = p_short
         self._party_cache = result
+        self._vocab_cache_set("parties", self.address, {
+            k: {**v, "roles": sorted(v["roles"])} for k, v in result.items()
+        })
         return result
 
     def create_parties(
@@ -866,6 +1320,9 @@ class CKANClient(RemoteCKAN):
                     }
                 )
 
+        if any(c["status"] == "created" for c in created):
+            self.refresh_vocab("parties")
+
         return CreateResult(
             created=created,
             failed=failed,
@@ -952,6 +1409,9 @@ class CKANClient(RemoteCKAN):
                     }
                 )
 
+        if deleted:
+            self.refresh_vocab("parties")
+
         print(f"\nDeleted: {deleted}")
         if failed:
             print(f"Failed: {len(failed)}")
@@ -1005,16 +1465,18 @@ class CKANClient(RemoteCKAN):
 
     def get_taxonomy_id_by_name(self, taxonomy_name: str) -> Optional[str]:
         """Return the ID of a CKAN taxonomy by its name. Cached."""
-        cache: Optional[List[Dict[str, Any]]] = getattr(self, "_taxonomy_list_cache", None)
-        if cache is None:
-            cache = self.action.taxonomy_list()
-            self._taxonomy_list_cache = cache
-
-        needle = taxonomy_name.strip().lower()
-        for t in cache:
-            if (t.get("name") or "").strip().lower() == needle:
-                return t.get("id")
-        return None
+        ids: Optional[Dict[str, str]] = getattr(self, "_taxonomy_ids_by_name", None)
+        if ids is None:
+            cache: Optional[List[Dict[str, Any]]] = getattr(self, "_taxonomy_list_cache", None)
+            if cache is None:
+                cache = self.action.taxonomy_list()
+                self._taxonomy_list_cache = cache
+            ids = {}
+            for t in cache:
+                ids.setdefault((t.get("name") or "").strip().lower(), t.get("id"))
+            self._taxonomy_ids_by_name = ids
+
+        return ids.get(taxonomy_name.strip().lower())
 
     def get_taxonomy_terms(self, taxonomy_id: str) -> List[Dict[str, Any]]:
         """Return terms for a taxonomy by ID. Cached per taxonomy_id."""
@@ -1022,28 +1484,66 @@ class CKANClient(RemoteCKAN):
         if taxonomy_id in terms_cache:
             return terms_cache[taxonomy_id]
 
-        terms = self.action.taxonomy_term_list(id=taxonomy_id)
+        stored_key = f"{self.address}|{taxonomy_id}"
+        terms = self._vocab_cache_get("taxonomy_terms", stored_key)
+        if terms is MISSING:
+            terms = self.action.taxonomy_term_list(id=taxonomy_id)
+            self._vocab_cache_set("taxonomy_terms", stored_key, terms)
         terms_cache[taxonomy_id] = terms
         self._taxonomy_terms_cache = terms_cache
         return terms
 
+    def get_taxonomy_term_index(self, taxonomy_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Return a {normalised label/name/title: term} index for a taxonomy.
+
+        Nested children are flattened (parents before their children). When
+        several terms share a value the first one in that order wins, which
+        matches a linear scan. Built once per taxonomy and cached.
+        """
+        index_cache: Dict[str, Dict[str, Dict[str, Any]]] = getattr(self, "_taxonomy_index_cache", {})
+        if taxonomy_id in index_cache:
+            return index_cache[taxonomy_id]
+
+        index: Dict[str, Dict[str, Any]] = {}
+        stack = list(reversed(self.get_taxonomy_terms(taxonomy_id)))
+        while stack:
+            t = stack.pop()
+            for attr in ("label", "name", "title"):
+                val = (t.get(attr) or "").strip().lower()
+                if val:
+                    index.setdefault(val, t)
+            stack.extend(reversed(t.get("children") or []))
+
+        index_cache[taxonomy_id] = index
+        self._taxonomy_index_cache = index_cache
+        return index
+
     def find_taxonomy_term(self, taxonomy_name: str, label: str) -> Optional[Dict[str, Any]]:
         """
-        Look up a term by label in a named taxonomy.
+        Look up a term by label in a named taxonomy, including nested terms.
         Matches against label, name, and title fields (case-insensitive).
         Returns the term dict or None.
         """
         tid = self.get_taxonomy_id_by_name(taxonomy_name)
         if tid is None:
             return None
-        terms = self.get_taxonomy_terms(tid)
-        needle = label.strip().lower()
-        for t in terms:
-            for attr in ("label", "name", "title"):
-                val = (t.get(attr) or "").strip()
-                if val.lower() == needle:
-                    return t
-        return None
+        return self.get_taxonomy_term_index(tid).get(label.strip().lower())
+
+    def prefetch_taxonomy_terms(self, taxonomy_names: Iterable[str], max_workers: int = 4) -> None:
+        """
+        Load and index the terms of several taxonomies concurrently so that
+        later find_taxonomy_term calls are answered from the cache.
+        """
+        terms_cache = getattr(self, "_taxonomy_terms_cache", {})
+        self._taxonomy_terms_cache = terms_cache
+        ids = {self.get_taxonomy_id_by_name(name) for name in taxonomy_names}
+        pending = [tid for tid in ids if tid is not None and tid not in terms_cache]
+        if not pending:
+            return
+        self._http  # share one connection pool across the workers
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+            list(pool.map(self.get_taxonomy_term_index, pending))
 
     # ------------------------------------------------------------------ #
     #  ARDC GCMD vocabulary lookup (cached, via LDA API)                  #
@@ -1060,6 +1560,17 @@ class CKANClient(RemoteCKAN):
         if cache_key in cache:
             return cache[cache_key]
 
+        stored_key = f"{endpoint_key}|{norm}"
+        stored = self._vocab_cache_get("gcmd", stored_key)
+        if stored is MISSING and self._vocab_cache_get("gcmd_scheme", endpoint_key) is not MISSING:
+            # The whole scheme was downloaded by warm_vocab_cache and the
+            # label is not in it.
+            stored = None
+        if stored is not MISSING:
+            cache[cache_key] = stored
+            self._gcmd_cache = cache
+            return stored
+
         endpoint = GCMD_VOCAB_ENDPOINTS.get(endpoint_key)
         if not endpoint:
             cache[cache_key] = None
@@ -1070,6 +1581,7 @@ class CKANClient(RemoteCKAN):
         # accepted if it matches in any of them (searched in order).
         endpoints = endpoint if isinstance(endpoint, (list, tuple)) else [endpoint]
 
+        lookup_failed = False
         for ep in endpoints:
             url = (
                 f"{GCMD_BASE_URL}/{ep}/concept.json"
@@ -1078,14 +1590,15 @@ class CKANClient(RemoteCKAN):
             )
 
             try:
-                req = urllib.request.Request(url, headers={
+                resp = self._http.get(url, timeout=30, headers={
                     "Accept": "application/json",
                     "User-Agent": "ckan-batch/1.0",
                 })
-                with urllib.request.urlopen(req, timeout=30) as resp:  # noqa: S310
-                    data = json.loads(resp.read().decode("utf-8"))
+                resp.raise_for_status()
+                data = resp.json()
             except Exception as exc:
                 print(f"[GCMD] HTTP error for {url}: {exc}")
+                lookup_failed = True
                 continue
 
             items = data.get("result", {}).get("items", [])
@@ -1102,12 +1615,114 @@ class CKANClient(RemoteCKAN):
                     result = {"code": item.get("_about", ""), "label": pref_val}
                     cache[cache_key] = result
                     self._gcmd_cache = cache
+                    self._vocab_cache_set("gcmd", stored_key, result)
                     return result
 
         cache[cache_key] = None
         self._gcmd_cache = cache
+        if not lookup_failed:
+            self._vocab_cache_set("gcmd", stored_key, None)
         return None
 
+    def prefetch_gcmd_terms(self, terms: Iterable[Tuple[str, str]], max_workers: int = 8) -> None:
+        """
+        Resolve many (endpoint_key, label) pairs against ARDC concurrently so
+        that later gcmd_find_term calls are answered from the cache.
+
+        Labels are de-duplicated case-insensitively and already cached ones
+        are skipped; max_workers bounds the number of parallel requests.
+        """
+        cache = getattr(self, "_gcmd_cache", {})
+        self._gcmd_cache = cache
+        pending: Dict[Tuple[str, str], str] = {}
+        for endpoint_key, label in terms:
+            norm = label.strip().lower()
+            if norm and (endpoint_key, norm) not in cache:
+                pending.setdefault((endpoint_key, norm), label)
+        if not pending:
+            return
+        self._http  # share one connection pool across the workers
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+            list(pool.map(lambda key: self.gcmd_find_term(key[0], pending[key]), pending))
+
+    def warm_vocab_cache(
+        self,
+        endpoint_keys: Optional[Iterable[str]] = None,
+        page_size: int = 1000,
+    ) -> Dict[str, int]:
+        """
+        Download whole GCMD concept schemes so label lookups need no network.
+
+        Every concept of each endpoint key (default: all GCMD_VOCAB_ENDPOINTS)
+        is loaded into the in-memory cache and, if configured, vocab_cache.
+        A scheme is only marked as complete (so that unknown labels resolve
+        to None offline) when every page downloaded successfully. For keys
+        with several endpoints the first endpoint wins, as in gcmd_find_term.
+
+        Returns the number of distinct labels loaded per endpoint key.
+        """
+        cache = getattr(self, "_gcmd_cache", {})
+        self._gcmd_cache = cache
+        keys = list(endpoint_keys) if endpoint_keys is not None else list(GCMD_VOCAB_ENDPOINTS)
+        counts: Dict[str, int] = {}
+
+        for endpoint_key in keys:
+            endpoint = GCMD_VOCAB_ENDPOINTS.get(endpoint_key)
+            if not endpoint:
+                print(f"[GCMD] Unknown endpoint key: {endpoint_key}")
+                continue
+            endpoints = endpoint if isinstance(endpoint, (list, tuple)) else [endpoint]
+
+            labels: Dict[str, Dict[str, str]] = {}
+            complete = True
+            for ep in endpoints:
+                page = 0
+                while True:
+                    url = f"{GCMD_BASE_URL}/{ep}/concept.json?_pageSize={page_size}&_page={page}"
+                    try:
+                        resp = self._http.get(url, timeout=60, headers={
+                            "Accept": "application/json",
+                            "User-Agent": "ckan-batch/1.0",
+                        })
+                        resp.raise_for_status()
+                        data = resp.json()
+                    except Exception as exc:
+                        print(f"[GCMD] HTTP error for {url}: {exc}")
+                        complete = False
+                        break
+
+                    result = data.get("result", {})
+                    items = result.get("items", [])
+                    for item in items:
+                        pref = item.get("prefLabel")
+                        if isinstance(pref, dict):
+                            pref_val = (pref.get("_value") or "").strip()
+                        elif isinstance(pref, str):
+                            pref_val = pref.strip()
+                        else:
+                            continue
+                        if pref_val:
+                            labels.setdefault(
+                                pref_val.lower(),
+                                {"code": item.get("_about", ""), "label": pref_val},
+                            )
+                    if not items or not result.get("next"):
+                        break
+                    page += 1
+
+            for norm, term in labels.items():
+                cache[(endpoint_key, norm)] = term
+            if self.vocab_cache is not None:
+                self.vocab_cache.set_many(
+                    "gcmd", ((f"{endpoint_key}|{norm}", term) for norm, term in labels.items()),
+                )
+                if complete:
+                    self.vocab_cache.set("gcmd_scheme", endpoint_key, True)
+            counts[endpoint_key] = len(labels)
+            print(f"[GCMD] Loaded {len(labels)} terms for {endpoint_key}"
+                  f"{'' if complete else ' (incomplete)'}")
+
+        return counts
 
     # ------------------------------------------------------------------ #
     #  Related instrument lookup (by DOI, public only)                    #
@@ -1287,42 +1902,112 @@ class CKANClient(RemoteCKAN):
     #  Export records                                                      #
     # ------------------------------------------------------------------ #
 
+    def _show_package_for_export(self, pid: str) -> Optional[Dict[str, Any]]:
+        """package_show one id; logs and returns None on failure."""
+        try:
+            return self.action.package_show(id=pid)
+        except NotFound:
+            logger.warning("Export: package %s not found", pid)
+        except CKANAPIError as e:
+            logger.warning("Export: CKANAPIError for %s: %s", pid, getattr(e, "error_dict", None) or str(e))
+        except Exception:
+            logger.exception("Export: unexpected error for %s", pid)
+        return None
+
+    def fetch_packages(
+        self,
+        pkg_ids: List[str],
+        *,
+        batch_size: int = 100,
+        max_workers: int = 8,
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Fetch full package dicts for many ids with few round-trips.
+
+        Ids are looked up in batches through package_search with
+        fq=id:(...) (private and draft records included). Ids the search
+        does not return (e.g. package names rather than ids) fall back to
+        package_show, run concurrently with up to max_workers requests.
+
+        Returns (packages in pkg_ids order, ids that could not be fetched).
+        """
+        ids = list(dict.fromkeys(pid for pid in pkg_ids if pid))
+        found: Dict[str, Dict[str, Any]] = {}
+
+        for i in range(0, len(ids), batch_size):
+            batch = ids[i:i + batch_size]
+            id_clause = " OR ".join(f'"{pid}"' for pid in batch)
+            try:
+                res = self.action.package_search(
+                    fq=f"id:({id_clause})",
+                    rows=len(batch),
+                    include_private=True,
+                    include_drafts=True,
+                )
+            except CKANAPIError as e:
+                logger.warning("Export: batch search failed, falling back to package_show: %s", e)
+                continue
+            for pkg in res.get("results", []):
+                found[pkg.get("id")] = pkg
+
+        missing = [pid for pid in ids if pid not in found]
+        if missing:
+            logger.info("Export: fetching %d packages individually", len(missing))
+            self._http  # share one connection pool across the workers
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+                for pid, pkg in zip(missing, pool.map(self._show_package_for_export, missing)):
+                    if pkg is not None:
+                        found[pid] = pkg
+
+        packages = [found[pid] for pid in ids if pid in found]
+        not_found = [pid for pid in ids if pid not in found]
+        return packages, not_found
+
     def export_records(
         self,
         pkg_ids: List[str],
         export_format: str = "Excel",
         output_path: Optional[str] = None,
+        *,
+        packages: Optional[List[Dict[str, Any]]] = None,
+        batch_size: int = 100,
+        max_workers: int = 8,
     ) -> Dict[str, Any]:
         """
-        Export CKAN records by package IDs to Excel or JSON.
+        Export CKAN records by package IDs to Excel, JSON or NDJSON.
 
         Args:
             pkg_ids: List of CKAN package IDs to export.
-            export_format: 'Excel' or 'JSON'.
+            export_format: 'Excel', 'JSON' or 'NDJSON' (one package per line;
+                see export_to_ndjson / import_ndjson).
             output_path: Optional output file path. If None, auto-generated.
+            packages: Optional full package dicts already at hand (e.g. from
+                get_all(verbose=True)); ids covered by them are not fetched.
+            batch_size, max_workers: passed to fetch_packages for the rest.
 
         Returns:
             {"exported": [...], "not_found": [...], "output_path": str}
         """
-        if export_format not in ("Excel", "JSON"):
-            raise ValueError(f"export_format must be 'Excel' or 'JSON'; got {export_format!r}")
+        if export_format not in ("Excel", "JSON", "NDJSON"):
+            raise ValueError(f"export_format must be 'Excel', 'JSON' or 'NDJSON'; got {export_format!r}")
 
-        exported: List[Dict[str, Any]] = []
-        not_found: List[str] = []
+        known = {p.get("id"): p for p in packages or [] if p.get("id")}
+        to_fetch = [pid for pid in pkg_ids if pid not in known]
+        fetched, not_found = self.fetch_packages(
+            to_fetch, batch_size=batch_size, max_workers=max_workers,
+        )
+        by_key: Dict[str, Dict[str, Any]] = dict(known)
+        for pkg in fetched:
+            by_key[pkg.get("id")] = pkg
+            by_key[pkg.get("name")] = pkg
 
+        exported: List[Dict[str, Any]] = []
+        seen: set = set()
         for pid in pkg_ids:
-            try:
-                pkg = self.action.package_show(id=pid)
+            pkg = by_key.get(pid)
+            if pkg is not None and pkg.get("id") not in seen:
+                seen.add(pkg.get("id"))
                 exported.append(pkg)
-            except NotFound:
-                logger.warning("Export: package %s not found", pid)
-                not_found.append(pid)
-            except CKANAPIError as e:
-                logger.warning("Export: CKANAPIError for %s: %s", pid, getattr(e, "error_dict", None) or str(e))
-                not_found.append(pid)
-            except Exception:
-                logger.exception("Export: unexpected error for %s", pid)
-                not_found.append(pid)
 
         logger.info("Exported %d packages, %d not found", len(exported), len(not_found))
 
@@ -1332,11 +2017,16 @@ class CKANClient(RemoteCKAN):
             with open(output_path, "w", encoding="utf-8") as fh:
                 json.dump(exported, fh, ensure_ascii=False, indent=2)
 
+        elif export_format == "NDJSON":
+            if output_path is None:
+                output_path = "export.ndjson"
+            self.export_to_ndjson(exported, output_path)
+
         elif export_format == "Excel":
             if output_path is None:
                 output_path = "export.xlsx"
 
-            self._export_to_excel(exported, output_path)
+            self.export_to_excel(exported, output_path)
             logger.info("Exported data saved to %s", output_path)
 
         return {"exported": [p.get("id") for p in exported], "not_found": not_found, "output_path": output_path}
@@ -1354,49 +2044,97 @@ class CKANClient(RemoteCKAN):
                 return []
         return value if isinstance(value, list) else []
 
-    def _export_to_excel(self, packages: List[Dict[str, Any]], output_path: str) -> None:
-        import openpyxl
+    def _copy_template_sheet(
+        self,
+        wb: Any,
+        src_ws: Any,
+        title: str,
+        max_row: Optional[int] = None,
+    ) -> Any:
+        """
+        Create sheet `title` in the write-only workbook wb and copy rows
+        1..max_row (default: all) of src_ws into it with their styles,
+        comments, merged ranges, column widths, row heights and freeze panes.
+        Layout has to be set before the first row is appended.
+        """
         from copy import copy
+        from openpyxl.cell import WriteOnlyCell
+
+        ws = wb.create_sheet(title)
+        ws.freeze_panes = src_ws.freeze_panes
+        for key, dim in src_ws.column_dimensions.items():
+            ws.column_dimensions[key].width = dim.width
+            ws.column_dimensions[key].hidden = dim.hidden
+        last_row = max_row or src_ws.max_row
+        for idx, dim in src_ws.row_dimensions.items():
+            if idx <= last_row and dim.height is not None:
+                ws.row_dimensions[idx].height = dim.height
+
+        for row in src_ws.iter_rows(min_row=1, max_row=last_row, max_col=src_ws.max_column):
+            cells = []
+            for cell in row:
+                new_cell = WriteOnlyCell(ws, value=cell.value)
+                if cell.has_style:
+                    new_cell.font = copy(cell.font)
+                    new_cell.border = copy(cell.border)
+                    new_cell.fill = copy(cell.fill)
+                    new_cell.number_format = copy(cell.number_format)
+                    new_cell.protection = copy(cell.protection)
+                    new_cell.alignment = copy(cell.alignment)
+                if cell.comment is not None:
+                    new_cell.comment = copy(cell.comment)
+                cells.append(new_cell)
+            ws.append(cells)
+
+        for rng in src_ws.merged_cells.ranges:
+            if rng.max_row <= last_row:
+                ws.merged_cells.add(rng.coord)
+        return ws
+
+    def export_to_excel(self, packages: Iterable[Dict[str, Any]], output_path: str) -> Dict[str, int]:
+        """
+        Write packages to a PIDINST workbook at output_path.
+
+        Streams rows through openpyxl write-only mode: packages may be any
+        iterable (e.g. iter_packages(...)) and are consumed one at a time,
+        so memory does not grow with the size of the export. The template's
+        header rows, styles and extra sheets are reproduced; platforms go to
+        the Platforms sheet, everything else to Instruments.
+
+        Returns the number of records written per sheet.
+        """
+        import openpyxl
 
         template_path = str(Path(__file__).parent / "reader" / "templates" / "PIDINST.xlsx")
-        wb = openpyxl.load_workbook(template_path)
-
-        # Ensure both worksheets exist (create Platforms by copying Instruments structure)
-        if "Platforms" not in wb.sheetnames:
-            src_ws = wb["Instruments"]
-            plat_ws = wb.create_sheet("Platforms")
-            for row in src_ws.iter_rows(min_row=1, max_row=6, max_col=src_ws.max_column):
-                for cell in row:
-                    new_cell = plat_ws.cell(row=cell.row, column=cell.column, value=cell.value)
-                    if cell.has_style:
-                        new_cell.font = copy(cell.font)
-                        new_cell.border = copy(cell.border)
-                        new_cell.fill = copy(cell.fill)
-                        new_cell.number_format = copy(cell.number_format)
-                        new_cell.protection = copy(cell.protection)
-                        new_cell.alignment = copy(cell.alignment)
-            for i, dim in src_ws.column_dimensions.items():
-                plat_ws.column_dimensions[i].width = dim.width
-            # Update title cell
-            plat_ws.cell(1, 1, "PIDINST Batch Platform Upload Template (single-sheet, arrays via repeated rows)")
-
-        instruments: List[Dict[str, Any]] = []
-        platforms: List[Dict[str, Any]] = []
+        template = openpyxl.load_workbook(template_path)
+        src_ws = template["Instruments"]
+
+        wb = openpyxl.Workbook(write_only=True)
+        sheets: Dict[str, Any] = {}
+        for name in template.sheetnames:
+            max_row = _EXPORT_HEADER_ROWS if name in ("Instruments", "Platforms") else None
+            sheets[name] = self._copy_template_sheet(wb, template[name], name, max_row=max_row)
+
+        # Ensure both worksheets exist (create Platforms from the Instruments header)
+        if "Platforms" not in sheets:
+            src_ws.cell(1, 1, "PIDINST Batch Platform Upload Template (single-sheet, arrays via repeated rows)")
+            sheets["Platforms"] = self._copy_template_sheet(
+                wb, src_ws, "Platforms", max_row=_EXPORT_HEADER_ROWS,
+            )
 
+        counts = {"Instruments": 0, "Platforms": 0}
         for pkg in packages:
             is_platform = str(pkg.get("is_platform", "false")).strip().lower() in ("true", "1", "yes")
-            if is_platform:
-                platforms.append(pkg)
-            else:
-                instruments.append(pkg)
-
-        self._write_packages_to_sheet(wb["Instruments"], instruments)
-        self._write_packages_to_sheet(wb["Platforms"], platforms)
+            sheet = "Platforms" if is_platform else "Instruments"
+            counts[sheet] += 1
+            for row in self._package_export_rows(pkg, str(counts[sheet])):
+                sheets[sheet].append(row)
 
         wb.save(output_path)
+        return counts
 
-    def _write_packages_to_sheet(self, ws: Any, packages: List[Dict[str, Any]]) -> None:
-        """Write package data rows into the given worksheet starting at row 7."""
+    def _package_export_rows(self, pkg: Dict[str, Any], record_label: str) -> List[List[Any]]:
+        """Template data rows for one package (row values for columns 1.._EXPORT_COLUMNS)."""
 
         def _cell(value: Any) -> Any:
             """Coerce a value to something openpyxl can write."""
@@ -1406,199 +2144,303 @@ class CKANClient(RemoteCKAN):
                 return ", ".join(str(v) for v in value if v is not None)
             return value
 
-        first_data_row = 7
-        record_num = 0
-
-        for pkg in packages:
-            record_num += 1
-            record_label = str(record_num)
-
-            manufacturers  = self._load_list(pkg.get("manufacturer"))
-            owners         = self._load_list(pkg.get("owner"))
-            models         = self._load_list(pkg.get("model"))
-            dates          = self._load_list(pkg.get("date"))
-            alt_ids        = self._load_list(pkg.get("alternate_identifier_obj"))
-            funders        = self._load_list(pkg.get("funder"))
-            related_ids    = self._load_list(pkg.get("related_identifier_obj"))
-            instrument_types = self._load_list(pkg.get("instrument_type"))
-            measured_vars  = self._load_list(pkg.get("measured_variable"))
-            resources      = pkg.get("resources") or []
-            if not isinstance(resources, list):
-                resources = []
-
-            related_instruments_raw = pkg.get("related_instruments")
-            if isinstance(related_instruments_raw, str) and related_instruments_raw.strip():
-                try:
-                    related_instruments = json.loads(related_instruments_raw)
-                except (json.JSONDecodeError, TypeError):
-                    related_instruments = []
-            elif isinstance(related_instruments_raw, list):
-                related_instruments = related_instruments_raw
-            else:
+        manufacturers  = self._load_list(pkg.get("manufacturer"))
+        owners         = self._load_list(pkg.get("owner"))
+        models         = self._load_list(pkg.get("model"))
+        dates          = self._load_list(pkg.get("date"))
+        alt_ids        = self._load_list(pkg.get("alternate_identifier_obj"))
+        funders        = self._load_list(pkg.get("funder"))
+        related_ids    = self._load_list(pkg.get("related_identifier_obj"))
+        instrument_types = self._load_list(pkg.get("instrument_type"))
+        measured_vars  = self._load_list(pkg.get("measured_variable"))
+        resources      = pkg.get("resources") or []
+        if not isinstance(resources, list):
+            resources = []
+
+        related_instruments_raw = pkg.get("related_instruments")
+        if isinstance(related_instruments_raw, str) and related_instruments_raw.strip():
+            try:
+                related_instruments = json.loads(related_instruments_raw)
+            except (json.JSONDecodeError, TypeError):
                 related_instruments = []
+        elif isinstance(related_instruments_raw, list):
+            related_instruments = related_instruments_raw
+        else:
+            related_instruments = []
 
-            spatial = pkg.get("spatial")
-            if isinstance(spatial, str):
-                try:
-                    spatial = json.loads(spatial)
-                except (json.JSONDecodeError, TypeError):
-                    spatial = None
+        spatial = pkg.get("spatial")
+        if isinstance(spatial, str):
+            try:
+                spatial = json.loads(spatial)
+            except (json.JSONDecodeError, TypeError):
+                spatial = None
 
-            # --- Scalar fields written to the first row only ---
-            # user_keywords: list or CSV string → CSV string
-            kw_raw = pkg.get("user_keywords", "")
-            if isinstance(kw_raw, list):
-                user_keywords_str = ", ".join(str(v) for v in kw_raw if v is not None)
-            else:
-                user_keywords_str = str(kw_raw) if kw_raw else ""
-
-            # Instrument type: split stored list into GCMD (col 16) vs custom (col 17)
-            # Use pre-computed instrument_type_gcmd if present; derive custom from list.
-            GCMD_HOST = "gcmd.earthdata.nasa.gov"
-            it_gcmd_str = pkg.get("instrument_type_gcmd") or ", ".join(
-                it.get("instrument_type_name", "") for it in instrument_types
-                if GCMD_HOST in (it.get("instrument_type_identifier") or "")
-            )
-            it_custom_str = ", ".join(
-                it.get("instrument_type_name", "") for it in instrument_types
-                if GCMD_HOST not in (it.get("instrument_type_identifier") or "")
-                and (it.get("instrument_type_identifier") or "")
-            )
+        # --- Scalar fields written to the first row only ---
+        # user_keywords: list or CSV string → CSV string
+        kw_raw = pkg.get("user_keywords", "")
+        if isinstance(kw_raw, list):
+            user_keywords_str = ", ".join(str(v) for v in kw_raw if v is not None)
+        else:
+            user_keywords_str = str(kw_raw) if kw_raw else ""
+
+        # Instrument type: split stored list into GCMD (col 16) vs custom (col 17)
+        # Use pre-computed instrument_type_gcmd if present; derive custom from list.
+        GCMD_HOST = "gcmd.earthdata.nasa.gov"
+        it_gcmd_str = pkg.get("instrument_type_gcmd") or ", ".join(
+            it.get("instrument_type_name", "") for it in instrument_types
+            if GCMD_HOST in (it.get("instrument_type_identifier") or "")
+        )
+        it_custom_str = ", ".join(
+            it.get("instrument_type_name", "") for it in instrument_types
+            if GCMD_HOST not in (it.get("instrument_type_identifier") or "")
+            and (it.get("instrument_type_identifier") or "")
+        )
 
-            # Measured variable: same split
-            mv_gcmd_str = pkg.get("measured_variable_gcmd") or ", ".join(
-                mv.get("measured_variable_name", "") for mv in measured_vars
-                if GCMD_HOST in (mv.get("measured_variable_identifier") or "")
-            )
-            mv_custom_str = ", ".join(
-                mv.get("measured_variable_name", "") for mv in measured_vars
-                if GCMD_HOST not in (mv.get("measured_variable_identifier") or "")
-                and (mv.get("measured_variable_identifier") or "")
-            )
+        # Measured variable: same split
+        mv_gcmd_str = pkg.get("measured_variable_gcmd") or ", ".join(
+            mv.get("measured_variable_name", "") for mv in measured_vars
+            if GCMD_HOST in (mv.get("measured_variable_identifier") or "")
+        )
+        mv_custom_str = ", ".join(
+            mv.get("measured_variable_name", "") for mv in measured_vars
+            if GCMD_HOST not in (mv.get("measured_variable_identifier") or "")
+            and (mv.get("measured_variable_identifier") or "")
+        )
 
-            # Geolocation
-            loc_choice = pkg.get("location_choice", "noLocation") or "noLocation"
-            lon = lat = min_lng = min_lat = max_lng = max_lat = ""
-            if loc_choice == "point" and spatial:
-                coords = spatial.get("coordinates") or []
-                if len(coords) >= 2:
-                    lon, lat = coords[0], coords[1]
-            elif loc_choice == "area" and spatial:
-                ring = (spatial.get("coordinates") or [[]])[0] or []
-                if len(ring) >= 4:
-                    min_lng, min_lat = ring[0][0], ring[0][1]
-                    max_lng, max_lat = ring[2][0], ring[2][1]
-
-            # Determine total rows needed for this record
-            max_rows = max(
-                1,
-                len(manufacturers),
-                len(owners),
-                len(models),
-                len(dates),
-                len(alt_ids),
-                len(funders),
-                len(related_ids),
-                len(related_instruments),
-                len(resources),
-            )
+        # Geolocation
+        loc_choice = pkg.get("location_choice", "noLocation") or "noLocation"
+        lon = lat = min_lng = min_lat = max_lng = max_lat = ""
+        if loc_choice == "point" and spatial:
+            coords = spatial.get("coordinates") or []
+            if len(coords) >= 2:
+                lon, lat = coords[0], coords[1]
+        elif loc_choice == "area" and spatial:
+            ring = (spatial.get("coordinates") or [[]])[0] or []
+            if len(ring) >= 4:
+                min_lng, min_lat = ring[0][0], ring[0][1]
+                max_lng, max_lat = ring[2][0], ring[2][1]
+
+        # Determine total rows needed for this record
+        max_rows = max(
+            1,
+            len(manufacturers),
+            len(owners),
+            len(models),
+            len(dates),
+            len(alt_ids),
+            len(funders),
+            len(related_ids),
+            len(related_instruments),
+            len(resources),
+        )
+
+        rows: List[List[Any]] = []
+        for row_idx in range(max_rows):
+            row: Dict[int, Any] = {}  # template column number -> value
+
+            # col 1: Record (every row)
+            row[1] = record_label
+
+            # --- First-row-only scalar fields ---
+            if row_idx == 0:
+                row[2] = pkg.get("id", "")  # PKG_ID
+                row[3] = _cell(pkg.get("title", ""))  # Title
+                row[4] = _cell(pkg.get("instrument_classification", ""))  # Class
+                row[16] = _cell(it_gcmd_str)  # instrumentTypeGCMD
+                row[17] = _cell(it_custom_str)  # instrumentTypeCustom
+                row[27] = _cell(mv_gcmd_str)  # MeasuredVariableGCMD
+                row[28] = _cell(mv_custom_str)  # MeasuredVariableCustom
+                row[29] = _cell(pkg.get("description", ""))  # Description
+                row[34] = user_keywords_str  # UserKeywords
+                row[35] = _cell(pkg.get("credit", ""))  # Credit
+                row[36] = _cell(pkg.get("locality", ""))  # Locality
+                row[37] = loc_choice  # Location Type
+                row[38] = _cell(lat)  # Latitude
+                row[39] = _cell(lon)  # Longitude
+                row[40] = _cell(min_lat)  # min_lat
+                row[41] = _cell(min_lng)  # min_lng
+                row[42] = _cell(max_lat)  # max_lat
+                row[43] = _cell(max_lng)  # max_lng
+                row[44] = _cell(pkg.get("epsg_code", ""))  # EPSG
+
+            # col 5: Manufacturer Name
+            if row_idx < len(manufacturers):
+                m = manufacturers[row_idx]
+                row[5] = _cell(m.get("manufacturer_name"))
+
+            # col 6-8: Model
+            if row_idx < len(models):
+                mdl = models[row_idx]
+                row[6] = _cell(mdl.get("model_name"))
+                row[7] = _cell(mdl.get("model_identifier"))
+                row[8] = _cell(mdl.get("model_identifier_type"))
+
+            # col 9-11: Alternate Identifier
+            if row_idx < len(alt_ids):
+                alt = alt_ids[row_idx]
+                row[9] = _cell(alt.get("alternate_identifier"))
+                row[10] = _cell(alt.get("alternate_identifier_type"))
+                row[11] = _cell(alt.get("alternate_identifier_name"))
+
+            # col 12-13: Owner
+            if row_idx < len(owners):
+                ow = owners[row_idx]
+                row[12] = _cell(ow.get("owner_name"))
+                row[13] = _cell(ow.get("owner_contact"))
+
+            # col 14-15: Dates
+            if row_idx < len(dates):
+                dt = dates[row_idx]
+                row[14] = _cell(dt.get("date_value"))
+                row[15] = _cell(dt.get("date_type"))
+
+            # col 18-22: Related Resources (external)
+            if row_idx < len(related_ids):
+                ri = related_ids[row_idx]
+                row[18] = _cell(ri.get("related_identifier"))
+                row[19] = _cell(ri.get("related_identifier_type"))
+                row[20] = _cell(ri.get("related_resource_type"))
+                row[21] = _cell(ri.get("relation_type"))
+                row[22] = _cell(ri.get("related_identifier_name"))
+
+            # col 23: Related Instrument Components (DOI only in export)
+            if row_idx < len(related_instruments):
+                rc = related_instruments[row_idx]
+                row[23] = _cell(rc.get("identifier"))
+                # cols 24-26 (Manufacturer/Model/AlternateIdentifier) not stored in relation
+
+            # col 30-33: Funder
+            if row_idx < len(funders):
+                fu = funders[row_idx]
+                row[30] = _cell(fu.get("funder_name"))
+                row[31] = _cell(fu.get("award_number"))
+                row[32] = _cell(fu.get("award_uri"))
+                row[33] = _cell(fu.get("award_title"))
+
+            # col 45-49: Resources (use URL as path since we're exporting from CKAN)
+            if row_idx < len(resources):
+                res = resources[row_idx]
+                row[45] = _cell(res.get("url"))
+                row[46] = _cell(res.get("name"))
+                is_cover = res.get("pidinst_is_cover_image")
+                if is_cover is True or str(is_cover).lower() in ("true", "1", "yes"):
+                    row[47] = "Yes"
+                else:
+                    row[47] = "No"
+                row[48] = _cell(res.get("format"))
+                row[49] = _cell(res.get("description"))
+
+            rows.append([row.get(col) for col in range(1, _EXPORT_COLUMNS + 1)])
 
-            for row_idx in range(max_rows):
-                r = first_data_row
-
-                # col 1: Record (every row)
-                ws.cell(r, 1, record_label)
-
-                # --- First-row-only scalar fields ---
-                if row_idx == 0:
-                    ws.cell(r,  2, pkg.get("id", ""))                      # PKG_ID
-                    ws.cell(r,  3, _cell(pkg.get("title", "")))             # Title
-                    ws.cell(r,  4, _cell(pkg.get("instrument_classification", "")))  # Class
-                    ws.cell(r, 16, _cell(it_gcmd_str))                     # instrumentTypeGCMD
-                    ws.cell(r, 17, _cell(it_custom_str))                   # instrumentTypeCustom
-                    ws.cell(r, 27, _cell(mv_gcmd_str))                     # MeasuredVariableGCMD
-                    ws.cell(r, 28, _cell(mv_custom_str))                   # MeasuredVariableCustom
-                    ws.cell(r, 29, _cell(pkg.get("description", "")))      # Description
-                    ws.cell(r, 34, user_keywords_str)                      # UserKeywords
-                    ws.cell(r, 35, _cell(pkg.get("credit", "")))           # Credit
-                    ws.cell(r, 36, _cell(pkg.get("locality", "")))         # Locality
-                    ws.cell(r, 37, loc_choice)                             # Location Type
-                    ws.cell(r, 38, _cell(lat))                             # Latitude
-                    ws.cell(r, 39, _cell(lon))                             # Longitude
-                    ws.cell(r, 40, _cell(min_lat))                         # min_lat
-                    ws.cell(r, 41, _cell(min_lng))                         # min_lng
-                    ws.cell(r, 42, _cell(max_lat))                         # max_lat
-                    ws.cell(r, 43, _cell(max_lng))                         # max_lng
-                    ws.cell(r, 44, _cell(pkg.get("epsg_code", "")))        # EPSG
-
-                # col 5: Manufacturer Name
-                if row_idx < len(manufacturers):
-                    m = manufacturers[row_idx]
-                    ws.cell(r, 5, _cell(m.get("manufacturer_name")))
-
-                # col 6-8: Model
-                if row_idx < len(models):
-                    mdl = models[row_idx]
-                    ws.cell(r, 6, _cell(mdl.get("model_name")))
-                    ws.cell(r, 7, _cell(mdl.get("model_identifier")))
-                    ws.cell(r, 8, _cell(mdl.get("model_identifier_type")))
-
-                # col 9-11: Alternate Identifier
-                if row_idx < len(alt_ids):
-                    alt = alt_ids[row_idx]
-                    ws.cell(r,  9, _cell(alt.get("alternate_identifier")))
-                    ws.cell(r, 10, _cell(alt.get("alternate_identifier_type")))
-                    ws.cell(r, 11, _cell(alt.get("alternate_identifier_name")))
-
-                # col 12-13: Owner
-                if row_idx < len(owners):
-                    ow = owners[row_idx]
-                    ws.cell(r, 12, _cell(ow.get("owner_name")))
-                    ws.cell(r, 13, _cell(ow.get("owner_contact")))
-
-                # col 14-15: Dates
-                if row_idx < len(dates):
-                    dt = dates[row_idx]
-                    ws.cell(r, 14, _cell(dt.get("date_value")))
-                    ws.cell(r, 15, _cell(dt.get("date_type")))
-
-                # col 18-22: Related Resources (external)
-                if row_idx < len(related_ids):
-                    ri = related_ids[row_idx]
-                    ws.cell(r, 18, _cell(ri.get("related_identifier")))
-                    ws.cell(r, 19, _cell(ri.get("related_identifier_type")))
-                    ws.cell(r, 20, _cell(ri.get("related_resource_type")))
-                    ws.cell(r, 21, _cell(ri.get("relation_type")))
-                    ws.cell(r, 22, _cell(ri.get("related_identifier_name")))
-
-                # col 23: Related Instrument Components (DOI only in export)
-                if row_idx < len(related_instruments):
-                    rc = related_instruments[row_idx]
-                    ws.cell(r, 23, _cell(rc.get("identifier")))
-                    # cols 24-26 (Manufacturer/Model/AlternateIdentifier) not stored in relation
-
-                # col 30-33: Funder
-                if row_idx < len(funders):
-                    fu = funders[row_idx]
-                    ws.cell(r, 30, _cell(fu.get("funder_name")))
-                    ws.cell(r, 31, _cell(fu.get("award_number")))
-                    ws.cell(r, 32, _cell(fu.get("award_uri")))
-                    ws.cell(r, 33, _cell(fu.get("award_title")))
-
-                # col 45-49: Resources (use URL as path since we're exporting from CKAN)
-                if row_idx < len(resources):
-                    res = resources[row_idx]
-                    ws.cell(r, 45, _cell(res.get("url")))
-                    ws.cell(r, 46, _cell(res.get("name")))
-                    is_cover = res.get("pidinst_is_cover_image")
-                    if is_cover is True or str(is_cover).lower() in ("true", "1", "yes"):
-                        ws.cell(r, 47, "Yes")
-                    else:
-                        ws.cell(r, 47, "No")
-                    ws.cell(r, 48, _cell(res.get("format")))
-                    ws.cell(r, 49, _cell(res.get("description")))
-
-                first_data_row += 1
+        return rows
+
+    # ------------------------------------------------------------------ #
+    #  NDJSON (JSON Lines) export / import                               #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def export_to_ndjson(items: Iterable[Dict[str, Any]], output_path: str) -> int:
+        """
+        Write items (packages, parties, ...) to output_path as NDJSON, one
+        compact JSON object per line, as they arrive from the iterable.
+
+        Example (whole registry, constant memory):
+            client.export_to_ndjson(client.iter_packages(), "registry.ndjson")
+
+        Returns the number of lines written.
+        """
+        count = 0
+        with open(output_path, "w", encoding="utf-8") as fh:
+            for item in items:
+                fh.write(json.dumps(item, ensure_ascii=False))
+                fh.write("\n")
+                count += 1
+        logger.info("Wrote %d lines to %s", count, output_path)
+        return count
+
+    @staticmethod
+    def iter_ndjson(path: str, start_line: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (line_number, object) from an NDJSON file, one line at a time.
+        Line numbers are 1-based; the first start_line lines are skipped and
+        blank lines are ignored.
+        """
+        with open(path, "r", encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, start=1):
+                if line_no <= start_line or not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON: {e}") from e
+
+    def import_ndjson(
+        self,
+        path: str,
+        target: str = "create",
+        *,
+        batch_size: int = 100,
+        start_line: int = 0,
+        **kwargs: Any,
+    ) -> Iterator[Tuple[int, CreateResult]]:
+        """
+        Stream an NDJSON file into create_records ('create'),
+        update_records ('update') or create_parties ('parties').
+
+        Lines are read and sent batch_size at a time, so memory stays
+        constant regardless of file size. Extra keyword arguments are passed
+        to the target method (e.g. make_public, dry_run, max_workers).
+
+        Yields (last_line, result) after each batch, where last_line is the
+        number of the last line that batch consumed. Every created / failed /
+        skipped / resource entry gets a "line" key with its line number in
+        the file.
+
+        To resume an interrupted import, pass the last last_line seen as
+        start_line. That skips the finished batches only: records the
+        interrupted batch had already written are sent again, so pass
+        checkpoint= as well for 'create' and 'update' to skip them instead
+        of creating duplicates. 'parties' needs no journal, as existing
+        party names are skipped.
+
+        Example:
+            for last_line, res in client.import_ndjson(
+                "registry.ndjson", max_workers=4, checkpoint="registry.journal"
+            ):
+                print(f"up to line {last_line}: {len(res.created)} created, {len(res.failed)} failed")
+        """
+        targets = {
+            "create": self.create_records,
+            "update": self.update_records,
+            "parties": self.create_parties,
+        }
+        if target not in targets:
+            raise ValueError(f"target must be one of {sorted(targets)}; got {target!r}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1; got {batch_size!r}")
+        run = targets[target]
+
+        def _run_batch(lines: List[int], items: List[Dict[str, Any]]) -> CreateResult:
+            result = run(items, **kwargs)
+            for entries in (result.created, result.failed, result.skipped, result.resource_results):
+                for entry in entries:
+                    index = entry.get("index")
+                    if isinstance(index, int) and 1 <= index <= len(lines):
+                        entry["line"] = lines[index - 1]
+            return result
+
+        lines: List[int] = []
+        items: List[Dict[str, Any]] = []
+        for line_no, item in self.iter_ndjson(path, start_line=start_line):
+            lines.append(line_no)
+            items.append(item)
+            if len(items) >= batch_size:
+                result = _run_batch(lines, items)
+                yield lines[-1], result
+                lines, items = [], []
+        if items:
+            result = _run_batch(lines, items)
+            yield lines[-1], result
 
     # ------------------------------------------------------------------ #
     #  Update records                                                    #
@@ -1609,6 +2451,7 @@ class CKANClient(RemoteCKAN):
         convert_to_public: bool = False,
         *,
         dry_run: bool = False,
+        checkpoint: Union[str, Path, CheckpointJournal, None] = None,
     ) -> CreateResult:
         """
         Update existing CKAN records.
@@ -1617,91 +2460,130 @@ class CKANClient(RemoteCKAN):
         - If convert_to_public=True, force private=False.
         - If convert_to_public=False, preserve the existing package privacy
         unless the incoming payload explicitly includes "private".
+
+        With a checkpoint journal (see create_records), records updated in an
+        earlier run are skipped and only failures are retried.
         """
+        journal = self._checkpoint_journal(checkpoint, dry_run)
         updated: List[Dict[str, Any]] = []
         failed: List[Dict[str, Any]] = []
+        skipped: List[Dict[str, Any]] = []
 
         for i, payload in enumerate(records, start=1):
-            payload_to_send = dict(payload)
-            payload_to_send.pop("__resources__", None)
-
-            pkg_id = payload_to_send.pop("pkg_id", None)
-
-            if not pkg_id:
-                pkg_id = self._resolve_package_id(payload_to_send, i, failed)
-                if pkg_id is None:
-                    continue
-
-            try:
-                existing = self.action.package_show(id=pkg_id)
-            except NotFound:
-                failed.append({
+            key = journal.key_for(payload) if journal else None
+            done = journal.get(key, "update") if journal else None
+            if done is not None and done.get("status") == "updated":
+                skipped.append({
                     "index": i,
-                    "title": payload_to_send.get("title"),
-                    "error": "NotFound",
-                    "ckan_error": f"Package {pkg_id!r} not found in database",
-                    "payload": payload_to_send,
-                })
-                continue
-            except CKANAPIError as e:
-                failed.append({
-                    "index": i,
-                    "title": payload_to_send.get("title"),
-                    "error": "CKANAPIError",
-                    "ckan_error": getattr(e, "error_dict", None) or str(e),
-                    "payload": payload_to_send,
+                    "title": payload.get("title"),
+                    "id": done.get("id"),
+                    "reason": "already updated (checkpoint)",
                 })
                 continue
+            n_failed = len(failed)
 
-            # Privacy handling
-            if convert_to_public:
-                payload_to_send["private"] = False
-            elif "private" not in payload_to_send:
-                payload_to_send["private"] = existing.get("private", True)
+            self._update_one_record(i, payload, convert_to_public, dry_run, updated, failed)
 
-            payload_to_send["id"] = pkg_id
-            payload_to_send.setdefault("type", existing.get("type", "instrument"))
+            if journal is not None:
+                if len(failed) > n_failed:
+                    err = failed[-1]
+                    journal.record(key, "update", "failed", error=err.get("ckan_error") or err.get("error"))
+                else:
+                    journal.record(key, "update", "updated", id=updated[-1].get("id"))
 
-            if dry_run:
-                updated.append({
-                    "status": "dry_run",
-                    "index": i,
-                    "id": pkg_id,
-                    "title": payload_to_send.get("title"),
-                    "payload": payload_to_send,
-                })
-                continue
+        if skipped:
+            print(f"Skipped {len(skipped)} record(s) already completed according to the checkpoint.")
+        return CreateResult(created=updated, failed=failed, resource_results=[], skipped=skipped)
 
-            try:
-                payload_to_send = _to_ckan_payload(payload_to_send)
-                resp = self.action.package_update(**payload_to_send)
-                updated.append({
-                    "status": "updated",
-                    "index": i,
-                    "id": resp.get("id"),
-                    "name": resp.get("name"),
-                    "title": resp.get("title"),
-                    "doi": resp.get("doi"),
-                    "response": resp,
-                })
-            except CKANAPIError as e:
-                msg = getattr(e, "error_dict", None) or str(e)
-                failed.append({
-                    "index": i,
-                    "title": payload_to_send.get("title"),
-                    "error": "CKANAPIError",
-                    "ckan_error": msg,
-                    "payload": payload_to_send,
-                })
-            except Exception as e:
-                failed.append({
-                    "index": i,
-                    "title": payload_to_send.get("title"),
-                    "error": f"Unexpected error: {e}",
-                    "payload": payload_to_send,
-                })
+    def _update_one_record(
+        self,
+        i: int,
+        payload: Dict[str, Any],
+        convert_to_public: bool,
+        dry_run: bool,
+        updated: List[Dict[str, Any]],
+        failed: List[Dict[str, Any]],
+    ) -> None:
+        """Update a single record, appending its outcome to updated or failed."""
+        payload_to_send = dict(payload)
+        payload_to_send.pop("__resources__", None)
+        payload_to_send.pop("__record__", None)
+
+        pkg_id = payload_to_send.pop("pkg_id", None)
+
+        if not pkg_id:
+            pkg_id = self._resolve_package_id(payload_to_send, i, failed)
+            if pkg_id is None:
+                return
 
-        return CreateResult(created=updated, failed=failed, resource_results=[])
+        try:
+            existing = self.action.package_show(id=pkg_id)
+        except NotFound:
+            failed.append({
+                "index": i,
+                "title": payload_to_send.get("title"),
+                "error": "NotFound",
+                "ckan_error": f"Package {pkg_id!r} not found in database",
+                "payload": payload_to_send,
+            })
+            return
+        except CKANAPIError as e:
+            failed.append({
+                "index": i,
+                "title": payload_to_send.get("title"),
+                "error": "CKANAPIError",
+                "ckan_error": getattr(e, "error_dict", None) or str(e),
+                "payload": payload_to_send,
+            })
+            return
+
+        # Privacy handling
+        if convert_to_public:
+            payload_to_send["private"] = False
+        elif "private" not in payload_to_send:
+            payload_to_send["private"] = existing.get("private", True)
+
+        payload_to_send["id"] = pkg_id
+        payload_to_send.setdefault("type", existing.get("type", "instrument"))
+
+        if dry_run:
+            updated.append({
+                "status": "dry_run",
+                "index": i,
+                "id": pkg_id,
+                "title": payload_to_send.get("title"),
+                "payload": payload_to_send,
+            })
+            return
+
+        try:
+            payload_to_send = _to_ckan_payload(payload_to_send)
+            resp = self.action.package_update(**payload_to_send)
+            updated.append({
+                "status": "updated",
+                "index": i,
+                "id": resp.get("id"),
+                "name": resp.get("name"),
+                "title": resp.get("title"),
+                "doi": resp.get("doi"),
+                "response": resp,
+            })
+        except CKANAPIError as e:
+            msg = getattr(e, "error_dict", None) or str(e)
+            failed.append({
+                "index": i,
+                "title": payload_to_send.get("title"),
+                "error": "CKANAPIError",
+                "ckan_error": msg,
+                "payload": payload_to_send,
+            })
+        except Exception as e:
+            failed.append({
+                "index": i,
+                "title": payload_to_send.get("title"),
+                "error": f"Unexpected error: {e}",
+                "payload": payload_to_send,
+            })
 
     def _resolve_package_id(
         self,
@@ -1796,7 +2678,8 @@ class CKANClient(RemoteCKAN):
         """
         Resolve an EPSG code to its display label (e.g. '4326 - WGS 84').
         Falls back to returning the raw code if the lookup fails.
-        Cached per code for the lifetime of this client instance.
+        Cached per code for the lifetime of this client instance, and in
+        vocab_cache (if configured) when a label was found.
         """
         code = str(code).strip()
         if not code:
@@ -1806,6 +2689,12 @@ class CKANClient(RemoteCKAN):
         if code in cache:
             return cache[code]
 
+        stored = self._vocab_cache_get("epsg", code)
+        if stored is not MISSING:
+            cache[code] = stored
+            self._epsg_cache = cache
+            return stored
+
         url = (
             f"https://apps.epsg.org/api/v1/CoordRefSystem/"
             f"?includeDeprecated=false&pageSize=10&page=0"
@@ -1813,12 +2702,12 @@ class CKANClient(RemoteCKAN):
         )
 
         try:
-            req = urllib.request.Request(url, headers={
+            resp = self._http.get(url, timeout=15, headers={
                 "Accept": "application/json",
                 "User-Agent": "ckan-batch/1.0",
             })
-            with urllib.request.urlopen(req, timeout=15) as resp:  # noqa: S310
-                data = json.loads(resp.read().decode("utf-8"))
+            resp.raise_for_status()
+            data = resp.json()
         except Exception as exc:
             print(f"[EPSG] Lookup failed for {code}: {exc}")
             cache[code] = code
@@ -1830,6 +2719,7 @@ class CKANClient(RemoteCKAN):
                 label = f"{code} - {item.get('Name', '')}".strip()
                 cache[code] = label
                 self._epsg_cache = cache
+                self._vocab_cache_set("epsg", code, label)
                 return label
 
         cache[code] = code
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import math
 
 import openpyxl
@@ -191,8 +191,6 @@ def _resolve_vocab_items(
         for token in _split_csv_cell(custom_raw):
             term = client.find_taxonomy_term(taxonomy_name, token)
             if term is None:
-                tax_id = client.get_taxonomy_id_by_name(taxonomy_name)
-                lst_term = list(map(lambda x: x["label"], client.get_taxonomy_terms(tax_id)))
                 errors.append(
                     f"[Record {record}] Custom taxonomy term not found ({field_label}): {token}"
                 )
@@ -204,6 +202,51 @@ def _resolve_vocab_items(
     return items, codes_str, labels_str
 
 
+def _vocab_columns(sheet_is_platform: str) -> List[Tuple[str, str, str]]:
+    """
+    (column key, kind, source) for the controlled-vocab columns of a sheet.
+    kind is "gcmd" (source = GCMD endpoint key) or "taxonomy" (source =
+    CKAN taxonomy name); these match the lookups done in _map_record_group.
+    """
+    it_source = "platforms" if sheet_is_platform == "true" else "instruments"
+    return [
+        ("INSTRUMENT (RESOURCE) TYPE.instrumentTypeGCMD", "gcmd", it_source),
+        ("INSTRUMENT (RESOURCE) TYPE.instrumentTypeCustom", "taxonomy", it_source),
+        ("OTHER.MeasuredVariableGCMD", "gcmd", "measured_variables"),
+        ("OTHER.MeasuredVariableCustom", "taxonomy", "measured-variables"),
+    ]
+
+
+def _prefetch_vocab(
+    rows: Iterable[Dict[str, Any]],
+    client: CKANClient,
+    sheet_is_platform: str,
+    max_workers: int,
+) -> None:
+    """
+    Pre-pass over rows: collect the distinct GCMD (endpoint, label)
+    tokens and the custom taxonomies referenced, and resolve them
+    concurrently so record mapping only hits the client's caches.
+    """
+    columns = _vocab_columns(sheet_is_platform)
+    gcmd_terms: set = set()
+    taxonomies: set = set()
+    for row in rows:
+        for col, kind, source in columns:
+            tokens = _split_csv_cell(_clean(row.get(col)))
+            if not tokens:
+                continue
+            if kind == "gcmd":
+                gcmd_terms.update((source, t) for t in tokens)
+            else:
+                taxonomies.add(source)
+
+    if taxonomies:
+        client.prefetch_taxonomy_terms(taxonomies)
+    if gcmd_terms:
+        client.prefetch_gcmd_terms(gcmd_terms, max_workers=max_workers)
+
+
 def _resolve_geolocation(
     rows: List[Dict[str, Any]],
     errors: List[str],
@@ -390,12 +433,29 @@ def _build_column_keys(ws, header_row: int = 5, section_row: int = 3, group_row:
       - "OWNER.Contact"
       - "RELATED_RESOURCES_REGISTERED.Serial Number"
       - "GEOLOCATION.Latitude"
+
+    The header rows are read with iter_rows so this also works on read-only
+    worksheets, where random cell access re-parses the sheet.
     """
-    max_col = ws.max_column
+    first_row = min(section_row, group_row, header_row)
+    last_row = max(section_row, group_row, header_row)
+    header_rows = {
+        r: list(values)
+        for r, values in enumerate(
+            ws.iter_rows(min_row=first_row, max_row=last_row, values_only=True),
+            start=first_row,
+        )
+    }
+    max_col = max((len(v) for v in header_rows.values()), default=0)
+
+    def _header_values(r: int) -> List[Optional[str]]:
+        values = header_rows.get(r, [])
+        values = values + [None] * (max_col - len(values))
+        return [_norm_header(v) for v in values]
 
-    sec = [_norm_header(ws.cell(section_row, c).value) for c in range(1, max_col + 1)]
-    grp = [_norm_header(ws.cell(group_row, c).value) for c in range(1, max_col + 1)]
-    hdr_raw = [_norm_header(ws.cell(header_row, c).value) for c in range(1, max_col + 1)]
+    sec = _header_values(section_row)
+    grp = _header_values(group_row)
+    hdr_raw = _header_values(header_row)
 
     sec_ff = _forward_fill(sec)
     grp_ff = _forward_fill(grp)
@@ -432,15 +492,441 @@ def _build_column_keys(ws, header_row: int = 5, section_row: int = 3, group_row:
 
     return keys, required_map
 
+# -----------------------------
+# -----------------------------
+# Row reading
+# -----------------------------
+# Data starts at row 7 in this template:
+# row 1 title, row 2 note, row 3/4 groups, row 5 headers, row 6 help, row 7+ data
+_FIRST_DATA_ROW = 7
+_IS_PLATFORM_SHEETS = {"Platforms": "true"}
+
+
+def _open_sheet(excel_path: str, sheet_name: str):
+    """
+    Open the workbook in read-only mode and return (workbook, worksheet).
+    Read-only worksheets are parsed lazily as rows are iterated; the caller
+    must close the workbook to release the file handle.
+    """
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    return wb, wb[sheet_name]
+
+
+def _iter_data_rows(ws, col_keys: List[str]) -> Iterator[Dict[str, Any]]:
+    """Yield non-empty data rows as dicts keyed by col_keys (plus __rownum__)."""
+    rows = ws.iter_rows(
+        min_row=_FIRST_DATA_ROW, max_col=len(col_keys), values_only=True,
+    )
+    for r, values in enumerate(rows, start=_FIRST_DATA_ROW):
+        if all(_is_blank(v) for v in values):
+            continue
+        row: Dict[str, Any] = {"__rownum__": r}
+        for key, val in zip(col_keys, values):
+            row[key] = val
+        for key in col_keys[len(values):]:
+            row[key] = None
+        yield row
+
+
 # -----------------------------
 # Main mapper
 # -----------------------------
+def _map_record_group(
+    record: str,
+    grp: List[Dict[str, Any]],
+    client: CKANClient,
+    party_cache: Dict[str, Dict[str, Any]],
+    required_cols: Dict[str, bool],
+    errors: List[str],
+    *,
+    record_col_key: str,
+    org_own: str,
+    sheet_is_platform: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Map the rows of one Record* group to a CKAN record payload dict.
+    Problems are appended to errors; returns None if the record is unusable.
+    """
+    ds: Dict[str, Any] = {}
+
+    # Repeating composites (lists)
+    for k in COMPOSITE_FIELDS:
+        ds[k] = []
+
+    # Related instrument components (JSON list for the picker field)
+    ds["related_instruments"] = []
+
+    # Tag-like accumulators
+    tag_acc: Dict[str, List[str]] = {}
+
+    # Vocab field token accumulators (instrument type + measured variable)
+    it_gcmd_tokens: List[str] = []
+    it_custom_tokens: List[str] = []
+    mv_gcmd_tokens: List[str] = []
+    mv_custom_tokens: List[str] = []
+
+
+    # Validate required columns on the first row (your “first row has required info” rule)
+    first = grp[0]
+    missing_required_headers: List[str] = []
+    for k, is_req in required_cols.items():
+        if not is_req:
+            continue
+        if k == record_col_key:
+            continue
+        if _is_blank(first.get(k)):
+            missing_required_headers.append(k)
+
+    if missing_required_headers:
+        errors.append(
+            f"[Record {record}] Missing required values on first row: {', '.join(missing_required_headers)}"
+        )
+        return None
+
+    for row in grp:
+        # Base scalar fields
+        ds["owner_org"] = org_own  # CKAN owner organization (not required in your template, but if present on any row in the group, use it)
+        pkg_id = _clean(row.get("PKG_ID.Id"))
+        if pkg_id and _is_blank(ds.get("pkg_id")):
+            ds["pkg_id"] = pkg_id
+
+        title = _clean(row.get("TITLE.Name"))
+        if title and _is_blank(ds.get("title")):
+            ds["title"] = title  # CKAN title
+
+        instrument_class = _clean(row.get("INSTRUMENT_CLASS.Class"))
+        if instrument_class and _is_blank(ds.get("instrument_classification")):
+            ds["instrument_classification"] = instrument_class  # CKAN instrument class
+
+        desc = _clean(row.get("OTHER.Description"))
+        if desc and _is_blank(ds.get("description")):
+            ds["description"] = desc
+
+        locality = _clean(row.get("GEOLOCATION.Locality"))
+        if locality and _is_blank(ds.get("locality")):
+            ds["locality"] = locality
+
+        epsg = _clean(row.get("GEOLOCATION.EPSG"))
+        if epsg and _is_blank(ds.get("epsg_code")):
+            ds["epsg_code"] = epsg
+            ds["epsg"] = client.get_epsg_label(epsg)
+
+        # (Geolocation is resolved per-record after all rows – see below)
+
+        # Comma-separated tag fields (read from first row with value)
+        if _is_blank(ds.get("user_keywords")):
+            user_kw = _split_comma_separated(_clean(row.get("OTHER.UserKeywords")))
+            if user_kw:
+                ds["user_keywords"] = user_kw
+
+        # Tags / multi-token fields (accumulate across rows)
+        _accumulate_csv_field(tag_acc, "user_keywords", _clean(row.get("OTHER.UserKeywords")))
+
+        # Instrument type tokens (accumulate across rows)
+        for t in _split_csv_cell(_clean(row.get("INSTRUMENT (RESOURCE) TYPE.instrumentTypeGCMD"))):
+            if t not in it_gcmd_tokens:
+                it_gcmd_tokens.append(t)
+        for t in _split_csv_cell(_clean(row.get("INSTRUMENT (RESOURCE) TYPE.instrumentTypeCustom"))):
+            if t not in it_custom_tokens:
+                it_custom_tokens.append(t)
+
+        # Measured variable tokens (accumulate across rows)
+        for t in _split_csv_cell(_clean(row.get("OTHER.MeasuredVariableGCMD"))):
+            if t not in mv_gcmd_tokens:
+                mv_gcmd_tokens.append(t)
+        for t in _split_csv_cell(_clean(row.get("OTHER.MeasuredVariableCustom"))):
+            if t not in mv_custom_tokens:
+                mv_custom_tokens.append(t)
+
+        credit = _clean(row.get("OTHER.Credit"))
+        if credit and _is_blank(ds.get("credit")):
+            ds["credit"] = credit
+
+        # Manufacturer composite (repeating) – resolved via party registry
+        manuf_name_raw = _clean(row.get("MANUFACTURER.Name"))
+        if manuf_name_raw:
+            m = _resolve_party_composite(
+                manuf_name_raw, "Manufacturer", party_cache, errors,
+                record, row["__rownum__"],
+                party_id_field="manufacturer_party_id",
+                name_field="manufacturer_name",
+                id_field="manufacturer_identifier",
+                id_type_field="manufacturer_identifier_type",
+            )
+            if m:
+                _append_unique(ds["manufacturer"], m, identity_keys=("manufacturer_name",))
+
+        # Owner composite (repeating) – resolved via party registry
+        owner_name_raw = _clean(row.get("OWNER.Name"))
+        owner_contact_raw = _clean(row.get("OWNER.Contact"))
+        if owner_name_raw:
+            o = _resolve_party_composite(
+                owner_name_raw, "Owner", party_cache, errors,
+                record, row["__rownum__"],
+                party_id_field="owner_party_id",
+                name_field="owner_name",
+                id_field="owner_identifier",
+                id_type_field="owner_identifier_type",
+            )
+            if o:
+                contact = owner_contact_raw
+                if not contact:
+                    party_entry = party_cache.get(owner_name_raw.strip().lower())
+                    if party_entry:
+                        contact = party_entry.get("party_contact")
+                o["owner_contact"] = contact or ""
+                _append_unique(ds["owner"], o, identity_keys=("owner_name",))
+
+        # Model composite (repeating)
+        model = {
+            "model_name": _clean(row.get("MODEL.Name")),
+            "model_identifier": _clean(row.get("MODEL.Identifier")),
+            "model_identifier_type": _clean(row.get("MODEL.IdentifierType")),
+        }
+        if model.get("model_name"):
+            _append_unique(ds["model"], model, identity_keys=("model_name", "model_identifier"))
+
+        # Date composite (repeating)
+        dtype = _clean(row.get("DATES.dateType"))
+        if dtype and dtype.lower() == "period of activity":
+            dtype = "Coverage"
+        raw_dval = row.get("DATES.Date")
+        try:
+            dval = validate_pidinst_date_text(raw_dval, date_type=dtype)
+        except ValueError as exc:
+            errors.append(f"[Record {record} | Row {row['__rownum__']}] {exc}")
+            dval = None
+
+        if dval or dtype:
+            date_obj = {"date_value": dval, "date_type": dtype}
+            _append_unique(ds["date"], date_obj, identity_keys=("date_value", "date_type"))
+        # Alternate Identifier composite (repeating)
+        alt = {
+            "alternate_identifier": _clean(row.get("ALTERNATE IDENTIFIER.Id")),
+            "alternate_identifier_type": _clean(row.get("ALTERNATE IDENTIFIER.IdType")),
+            "alternate_identifier_name": _clean(row.get("ALTERNATE IDENTIFIER.Name")),
+        }
+        if alt.get("alternate_identifier") or alt.get("alternate_identifier_type"):
+            _append_unique(
+                ds["alternate_identifier_obj"],
+                alt,
+                identity_keys=("alternate_identifier_type", "alternate_identifier"),
+            )
+
+        # Resources / attachments
+        res_path = _clean(row.get("ATTACHMENTS.Path"))
+        if res_path:
+            # Online images are referenced by URL; local files by filesystem path.
+            if not res_path.startswith(("http://", "https://")):
+                # Expand ~ to the user's home directory
+                res_path = str(Path(res_path).expanduser())
+            res_name = _clean(row.get("ATTACHMENTS.Name"))
+            res_is_cover = _coerce_bool(_clean(row.get("ATTACHMENTS.IsCover")))
+            res_fmt = _clean(row.get("ATTACHMENTS.Format"))
+            res_desc = _clean(row.get("ATTACHMENTS.Description"))
+            ds.setdefault("__resources__", []).append({
+                "path": res_path,
+                "name": res_name,
+                "is_cover": res_is_cover,
+                "format": res_fmt,
+                "description": res_desc,
+            })
+
+        # Funder composite (repeating) – resolved via party registry
+        funder_name_raw = _clean(row.get("FUNDER.Name"))
+        if funder_name_raw:
+            f = _resolve_party_composite(
+                funder_name_raw, "Funder", party_cache, errors,
+                record, row["__rownum__"],
+                party_id_field="funder_party_id",
+                name_field="funder_name",
+                id_field="funder_identifier",
+                id_type_field="funder_identifier_type",
+            )
+            if f:
+                f["award_number"] = _clean(row.get("FUNDER.AwardNumber"))
+                f["award_uri"] = _clean(row.get("FUNDER.AwardURI"))
+                f["award_title"] = _clean(row.get("FUNDER.AwardTitle"))
+                _append_unique(ds["funder"], f, identity_keys=("funder_name", "award_number"))
+
+        # -----------------------------
+        # Related resources (external)
+        # -----------------------------
+        ext_id = _clean(row.get("RELATED_RESOURCES.Id"))
+        ext_id_type = _clean(row.get("RELATED_RESOURCES.IdType"))
+        ext_res_type = _clean(row.get("RELATED_RESOURCES.ResourceType"))
+        ext_rel = _clean(row.get("RELATED_RESOURCES.Relationship"))
+        ext_name = _clean(row.get("RELATED_RESOURCES.IdentifierName"))
+
+        if ext_id or ext_res_type or ext_rel:
+            rel_obj = {
+                "related_identifier": ext_id,
+                "related_identifier_type": ext_id_type,
+                "related_resource_type": ext_res_type,
+                "relation_type": ext_rel,
+                "related_identifier_name": ext_name,
+            }
+            if rel_obj.get("related_identifier"):
+                _append_unique(
+                    ds["related_identifier_obj"],
+                    rel_obj,
+                    identity_keys=("related_identifier_type", "related_identifier", "relation_type"),
+                )
+
+        # -----------------------------
+        # Related instrument components
+        # -----------------------------
+        comp_id = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.Id"))
+        comp_manf = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.Manufacturer"))
+        comp_model = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.Model"))
+        comp_alt = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.AlternateIdentifier"))
+
+        if comp_id:
+            # Look up instrument by DOI - must be public with minted DOI
+            found = client.find_public_instrument_by_doi(comp_id)
+            if found:
+                _append_unique(
+                    ds["related_instruments"],
+                    {
+                        "package_id": found["id"],
+                        "identifier": found["doi"],
+                        "identifier_type": "DOI",
+                        "label": found["title"],
+                        "relation_type": "HasPart",
+                    },
+                    identity_keys=("package_id",),
+                )
+            else:
+                errors.append(
+                    f"[Record {record} | Row {row['__rownum__']}] "
+                    f"Related instrument component not found as a public instrument with minted DOI: {comp_id}"
+                )
+        elif comp_manf and comp_model and comp_alt:
+            # Search by Manufacturer + Model + AlternateIdentifier combo
+            found, duplicates = client.find_instrument_by_attributes(
+                comp_manf, comp_model, comp_alt,
+            )
+            if found:
+                _append_unique(
+                    ds["related_instruments"],
+                    {
+                        "package_id": found["id"],
+                        "identifier": found["doi"],
+                        "identifier_type": "DOI",
+                        "label": found["title"],
+                        "relation_type": "HasPart",
+                    },
+                    identity_keys=("package_id",),
+                )
+            elif duplicates:
+                errors.append(
+                    f"[Record {record} | Row {row['__rownum__']}] "
+                    f"Multiple public instruments match Manufacturer={comp_manf}, "
+                    f"Model={comp_model}, AlternateIdentifier={comp_alt}: {duplicates}"
+                )
+            else:
+                errors.append(
+                    f"[Record {record} | Row {row['__rownum__']}] "
+                    f"No public instrument found for Manufacturer={comp_manf}, "
+                    f"Model={comp_model}, AlternateIdentifier={comp_alt}"
+                )
+        elif comp_manf or comp_model or comp_alt:
+            errors.append(
+                f"[Record {record} | Row {row['__rownum__']}] "
+                f"Related instrument component requires either a DOI in the Id column "
+                f"or all three: Manufacturer, Model, and AlternateIdentifier."
+            )
+
+    # Apply accumulated tag fields (join)
+    for k, vals in tag_acc.items():
+        if vals:
+            ds[k] = ", ".join(vals)
+
+    # ----- Instrument type resolution (GCMD + custom taxonomy) -----
+    is_platform = sheet_is_platform == "true"
+    gcmd_ep = "platforms" if is_platform else "instruments"
+    tax_name = "platforms" if is_platform else "instruments"
+    if it_gcmd_tokens or it_custom_tokens:
+        gcmd_joined = ", ".join(it_gcmd_tokens) if it_gcmd_tokens else None
+        custom_joined = ", ".join(it_custom_tokens) if it_custom_tokens else None
+        it_items, it_gcmd_codes, it_gcmd_labels = _resolve_vocab_items(
+            gcmd_joined, custom_joined,
+            gcmd_ep, tax_name, client, errors, record,
+            field_name="instrument_type",
+            field_label="instrument type",
+        )
+        if it_items:
+            ds["instrument_type"] = it_items
+        if it_gcmd_codes:
+            ds["instrument_type_gcmd_code"] = it_gcmd_codes
+        if it_gcmd_labels:
+            ds["instrument_type_gcmd"] = it_gcmd_labels
+
+    # ----- Measured variable resolution (GCMD + custom taxonomy) -----
+    if mv_gcmd_tokens or mv_custom_tokens:
+        gcmd_joined = ", ".join(mv_gcmd_tokens) if mv_gcmd_tokens else None
+        custom_joined = ", ".join(mv_custom_tokens) if mv_custom_tokens else None
+        mv_items, mv_gcmd_codes, mv_gcmd_labels = _resolve_vocab_items(
+            gcmd_joined, custom_joined,
+            "measured_variables", "measured-variables", client, errors, record,
+            field_name="measured_variable",
+            field_label="measured variable",
+        )
+        if mv_items:
+            ds["measured_variable"] = mv_items
+        if mv_gcmd_codes:
+            ds["measured_variable_gcmd_code"] = mv_gcmd_codes
+        if mv_gcmd_labels:
+            ds["measured_variable_gcmd"] = mv_gcmd_labels
+
+    # ----- Geolocation resolution (locationType-based) -----
+    geo = _resolve_geolocation(grp, errors, record)
+    ds.update(geo)
+
+    # Clean empty repeating composites
+    for k in COMPOSITE_FIELDS:
+        if not ds.get(k):
+            ds.pop(k, None)
+
+    # Serialize related_instruments to JSON (the validator expects a JSON string)
+    if ds.get("related_instruments"):
+        ds["related_instruments"] = json.dumps(ds["related_instruments"], ensure_ascii=False)
+    else:
+        ds.pop("related_instruments", None)
+
+    # Clean empty __resources__
+    if not ds.get("__resources__"):
+        ds.pop("__resources__", None)
+
+    # Minimal required checks (based on your template)
+    if _is_blank(ds.get("title")):
+        errors.append(f"[Record {record}] Missing TITLE.Name (maps to CKAN title).")
+        return None
+    if not ds.get("manufacturer"):
+        errors.append(f"[Record {record}] Missing at least one manufacturer (MANUFACTURER.Name).")
+        return None
+    if not ds.get("owner"):
+        errors.append(f"[Record {record}] Missing at least one owner (OWNER.Name/Contact/Relationship).")
+        return None
+    if not ds.get("model"):
+        errors.append(f"[Record {record}] Missing at least one model (MODEL.Name).")
+        return None
+
+    ds["is_platform"] = sheet_is_platform
+    # Workbook Record* label; used as the checkpoint key by create/update
+    # runs and stripped before the payload is sent to CKAN.
+    ds["__record__"] = record
+    return ds
+
+
+
 def read_pidinst_template(
     excel_path: str,
     client: CKANClient,
     sheet_name: str = "Instruments",
     record_col_key: str = "FIELD.Record",  # derived key for Record* column
     org_own: str = "auscope-org",  # default owner organization (CKAN org name, not required in your template)
+    vocab_workers: int = 8,
 ) -> MappingResult:
     """
     Reads your adjusted PIDINST template and maps it to CKAN record payload dicts.
@@ -455,30 +941,20 @@ def read_pidinst_template(
     is_platform is derived from sheet_name:
       - "Instruments" -> False
       - "Platforms"   -> True
-    """
-    _IS_PLATFORM_SHEETS = {"Platforms": "true"}
-    sheet_is_platform = _IS_PLATFORM_SHEETS.get(sheet_name, "false")
-    wb = openpyxl.load_workbook(excel_path, data_only=True)
-    ws = wb[sheet_name]
 
-    col_keys, required_cols = _build_column_keys(ws, header_row=5, section_row=3, group_row=4)
+    The distinct GCMD / custom taxonomy terms of the whole sheet are
+    resolved up front, up to vocab_workers at a time.
 
-    # Data starts at row 7 in this template:
-    # row 1 title, row 2 note, row 3/4 groups, row 5 headers, row 6 help, row 7+ data
-    first_data_row = 7
-
-    # Build row dicts with our stable keys
-    rows: List[Dict[str, Any]] = []
-    for r in range(first_data_row, ws.max_row + 1):
-        row: Dict[str, Any] = {"__rownum__": r}
-        empty = True
-        for c, key in enumerate(col_keys, start=1):
-            val = ws.cell(r, c).value
-            if not _is_blank(val):
-                empty = False
-            row[key] = val
-        if not empty:
-            rows.append(row)
+    The whole sheet is mapped before returning. For large workbooks use
+    iter_pidinst_template, which streams records as they are read.
+    """
+    sheet_is_platform = _IS_PLATFORM_SHEETS.get(sheet_name, "false")
+    wb, ws = _open_sheet(excel_path, sheet_name)
+    try:
+        col_keys, required_cols = _build_column_keys(ws, header_row=5, section_row=3, group_row=4)
+        rows = list(_iter_data_rows(ws, col_keys))
+    finally:
+        wb.close()
 
     errors: List[str] = []
     records: List[Dict[str, Any]] = []
@@ -500,374 +976,119 @@ def read_pidinst_template(
         errors.append(f"Failed to fetch party list: {exc}")
         return MappingResult(records=[], errors=errors)
 
-    for record, grp in groups.items():
-        ds: Dict[str, Any] = {}
-
-        # Repeating composites (lists)
-        for k in COMPOSITE_FIELDS:
-            ds[k] = []
+    _prefetch_vocab(rows, client, sheet_is_platform, vocab_workers)
 
-        # Related instrument components (JSON list for the picker field)
-        ds["related_instruments"] = []
+    for record, grp in groups.items():
+        ds = _map_record_group(
+            record, grp, client, party_cache, required_cols, errors,
+            record_col_key=record_col_key,
+            org_own=org_own,
+            sheet_is_platform=sheet_is_platform,
+        )
+        if ds is not None:
+            records.append(ds)
 
-        # Tag-like accumulators
-        tag_acc: Dict[str, List[str]] = {}
+    return MappingResult(records=records, errors=errors)
 
-        # Vocab field token accumulators (instrument type + measured variable)
-        it_gcmd_tokens: List[str] = []
-        it_custom_tokens: List[str] = []
-        mv_gcmd_tokens: List[str] = []
-        mv_custom_tokens: List[str] = []
 
+def iter_pidinst_template(
+    excel_path: str,
+    client: CKANClient,
+    sheet_name: str = "Instruments",
+    record_col_key: str = "FIELD.Record",
+    org_own: str = "auscope-org",
+    chunk_size: int = 50,
+    vocab_workers: int = 8,
+) -> Iterator[MappingResult]:
+    """
+    Streaming variant of read_pidinst_template for large workbooks.
+
+    Rows are read one at a time from a read-only worksheet and each Record*
+    group is mapped as soon as the next record starts, so memory stays flat
+    and callers can start creating/updating records before the whole file is
+    parsed. Yields MappingResult chunks of up to chunk_size records; each
+    chunk carries the errors found since the previous one.
+
+    Vocabulary terms are resolved one chunk at a time: the Record* groups
+    of a chunk are read, their distinct GCMD / taxonomy tokens resolved up
+    to vocab_workers at a time, and only then mapped. Terms already cached
+    by an earlier chunk are not fetched again.
+
+    Unlike read_pidinst_template, the rows of a record must be contiguous.
+    Rows that reopen an already mapped record are reported and skipped.
+
+    Example:
+        for chunk in iter_pidinst_template("instruments.xlsx", client):
+            client.create_records(chunk.records)
+            for err in chunk.errors:
+                print(err)
+    """
+    sheet_is_platform = _IS_PLATFORM_SHEETS.get(sheet_name, "false")
 
-        # Validate required columns on the first row (your “first row has required info” rule)
-        first = grp[0]
-        missing_required_headers: List[str] = []
-        for k, is_req in required_cols.items():
-            if not is_req:
-                continue
-            if k == record_col_key:
-                continue
-            if _is_blank(first.get(k)):
-                missing_required_headers.append(k)
+    try:
+        party_cache = client.get_parties_by_name()
+    except Exception as exc:
+        yield MappingResult(records=[], errors=[f"Failed to fetch party list: {exc}"])
+        return
 
-        if missing_required_headers:
-            errors.append(
-                f"[Record {record}] Missing required values on first row: {', '.join(missing_required_headers)}"
+    wb, ws = _open_sheet(excel_path, sheet_name)
+    try:
+        col_keys, required_cols = _build_column_keys(ws, header_row=5, section_row=3, group_row=4)
+
+        errors: List[str] = []
+        seen: set = set()
+        current: Optional[str] = None
+        grp: List[Dict[str, Any]] = []
+        # Record* groups read but not yet mapped (at most one chunk).
+        pending: List[Tuple[str, List[Dict[str, Any]]]] = []
+
+        def _map_pending() -> List[Dict[str, Any]]:
+            _prefetch_vocab(
+                (row for _, rows in pending for row in rows),
+                client, sheet_is_platform, vocab_workers,
             )
-            continue
-
-        for row in grp:
-            # Base scalar fields
-            ds["owner_org"] = org_own  # CKAN owner organization (not required in your template, but if present on any row in the group, use it)
-            pkg_id = _clean(row.get("PKG_ID.Id"))
-            if pkg_id and _is_blank(ds.get("pkg_id")):
-                ds["pkg_id"] = pkg_id
-
-            title = _clean(row.get("TITLE.Name"))
-            if title and _is_blank(ds.get("title")):
-                ds["title"] = title  # CKAN title
-
-            instrument_class = _clean(row.get("INSTRUMENT_CLASS.Class"))
-            if instrument_class and _is_blank(ds.get("instrument_classification")):
-                ds["instrument_classification"] = instrument_class  # CKAN instrument class
-
-            desc = _clean(row.get("OTHER.Description"))
-            if desc and _is_blank(ds.get("description")):
-                ds["description"] = desc
-
-            locality = _clean(row.get("GEOLOCATION.Locality"))
-            if locality and _is_blank(ds.get("locality")):
-                ds["locality"] = locality
-
-            epsg = _clean(row.get("GEOLOCATION.EPSG"))
-            if epsg and _is_blank(ds.get("epsg_code")):
-                ds["epsg_code"] = epsg
-                ds["epsg"] = client.get_epsg_label(epsg)
-
-            # (Geolocation is resolved per-record after all rows – see below)
-
-            # Comma-separated tag fields (read from first row with value)
-            if _is_blank(ds.get("user_keywords")):
-                user_kw = _split_comma_separated(_clean(row.get("OTHER.UserKeywords")))
-                if user_kw:
-                    ds["user_keywords"] = user_kw
-
-            # Tags / multi-token fields (accumulate across rows)
-            _accumulate_csv_field(tag_acc, "user_keywords", _clean(row.get("OTHER.UserKeywords")))
-
-            # Instrument type tokens (accumulate across rows)
-            for t in _split_csv_cell(_clean(row.get("INSTRUMENT (RESOURCE) TYPE.instrumentTypeGCMD"))):
-                if t not in it_gcmd_tokens:
-                    it_gcmd_tokens.append(t)
-            for t in _split_csv_cell(_clean(row.get("INSTRUMENT (RESOURCE) TYPE.instrumentTypeCustom"))):
-                if t not in it_custom_tokens:
-                    it_custom_tokens.append(t)
-
-            # Measured variable tokens (accumulate across rows)
-            for t in _split_csv_cell(_clean(row.get("OTHER.MeasuredVariableGCMD"))):
-                if t not in mv_gcmd_tokens:
-                    mv_gcmd_tokens.append(t)
-            for t in _split_csv_cell(_clean(row.get("OTHER.MeasuredVariableCustom"))):
-                if t not in mv_custom_tokens:
-                    mv_custom_tokens.append(t)
-
-            credit = _clean(row.get("OTHER.Credit"))
-            if credit and _is_blank(ds.get("credit")):
-                ds["credit"] = credit
-
-            # Manufacturer composite (repeating) – resolved via party registry
-            manuf_name_raw = _clean(row.get("MANUFACTURER.Name"))
-            if manuf_name_raw:
-                m = _resolve_party_composite(
-                    manuf_name_raw, "Manufacturer", party_cache, errors,
-                    record, row["__rownum__"],
-                    party_id_field="manufacturer_party_id",
-                    name_field="manufacturer_name",
-                    id_field="manufacturer_identifier",
-                    id_type_field="manufacturer_identifier_type",
+            records: List[Dict[str, Any]] = []
+            for record, rows in pending:
+                ds = _map_record_group(
+                    record, rows, client, party_cache, required_cols, errors,
+                    record_col_key=record_col_key,
+                    org_own=org_own,
+                    sheet_is_platform=sheet_is_platform,
                 )
-                if m:
-                    _append_unique(ds["manufacturer"], m, identity_keys=("manufacturer_name",))
-
-            # Owner composite (repeating) – resolved via party registry
-            owner_name_raw = _clean(row.get("OWNER.Name"))
-            owner_contact_raw = _clean(row.get("OWNER.Contact"))
-            if owner_name_raw:
-                o = _resolve_party_composite(
-                    owner_name_raw, "Owner", party_cache, errors,
-                    record, row["__rownum__"],
-                    party_id_field="owner_party_id",
-                    name_field="owner_name",
-                    id_field="owner_identifier",
-                    id_type_field="owner_identifier_type",
-                )
-                if o:
-                    contact = owner_contact_raw
-                    if not contact:
-                        party_entry = party_cache.get(owner_name_raw.strip().lower())
-                        if party_entry:
-                            contact = party_entry.get("party_contact")
-                    o["owner_contact"] = contact or ""
-                    _append_unique(ds["owner"], o, identity_keys=("owner_name",))
-
-            # Model composite (repeating)
-            model = {
-                "model_name": _clean(row.get("MODEL.Name")),
-                "model_identifier": _clean(row.get("MODEL.Identifier")),
-                "model_identifier_type": _clean(row.get("MODEL.IdentifierType")),
-            }
-            if model.get("model_name"):
-                _append_unique(ds["model"], model, identity_keys=("model_name", "model_identifier"))
-
-            # Date composite (repeating)
-            dtype = _clean(row.get("DATES.dateType"))
-            if dtype and dtype.lower() == "period of activity":
-                dtype = "Coverage"
-            raw_dval = row.get("DATES.Date")
-            try:
-                dval = validate_pidinst_date_text(raw_dval, date_type=dtype)
-            except ValueError as exc:
-                errors.append(f"[Record {record} | Row {row['__rownum__']}] {exc}")
-                dval = None
-
-            if dval or dtype:
-                date_obj = {"date_value": dval, "date_type": dtype}
-                _append_unique(ds["date"], date_obj, identity_keys=("date_value", "date_type"))
-            # Alternate Identifier composite (repeating)
-            alt = {
-                "alternate_identifier": _clean(row.get("ALTERNATE IDENTIFIER.Id")),
-                "alternate_identifier_type": _clean(row.get("ALTERNATE IDENTIFIER.IdType")),
-                "alternate_identifier_name": _clean(row.get("ALTERNATE IDENTIFIER.Name")),
-            }
-            if alt.get("alternate_identifier") or alt.get("alternate_identifier_type"):
-                _append_unique(
-                    ds["alternate_identifier_obj"],
-                    alt,
-                    identity_keys=("alternate_identifier_type", "alternate_identifier"),
-                )
-
-            # Resources / attachments
-            res_path = _clean(row.get("ATTACHMENTS.Path"))
-            if res_path:
-                # Online images are referenced by URL; local files by filesystem path.
-                if not res_path.startswith(("http://", "https://")):
-                    # Expand ~ to the user's home directory
-                    res_path = str(Path(res_path).expanduser())
-                res_name = _clean(row.get("ATTACHMENTS.Name"))
-                res_is_cover = _coerce_bool(_clean(row.get("ATTACHMENTS.IsCover")))
-                res_fmt = _clean(row.get("ATTACHMENTS.Format"))
-                res_desc = _clean(row.get("ATTACHMENTS.Description"))
-                ds.setdefault("__resources__", []).append({
-                    "path": res_path,
-                    "name": res_name,
-                    "is_cover": res_is_cover,
-                    "format": res_fmt,
-                    "description": res_desc,
-                })
-
-            # Funder composite (repeating) – resolved via party registry
-            funder_name_raw = _clean(row.get("FUNDER.Name"))
-            if funder_name_raw:
-                f = _resolve_party_composite(
-                    funder_name_raw, "Funder", party_cache, errors,
-                    record, row["__rownum__"],
-                    party_id_field="funder_party_id",
-                    name_field="funder_name",
-                    id_field="funder_identifier",
-                    id_type_field="funder_identifier_type",
-                )
-                if f:
-                    f["award_number"] = _clean(row.get("FUNDER.AwardNumber"))
-                    f["award_uri"] = _clean(row.get("FUNDER.AwardURI"))
-                    f["award_title"] = _clean(row.get("FUNDER.AwardTitle"))
-                    _append_unique(ds["funder"], f, identity_keys=("funder_name", "award_number"))
-
-            # -----------------------------
-            # Related resources (external)
-            # -----------------------------
-            ext_id = _clean(row.get("RELATED_RESOURCES.Id"))
-            ext_id_type = _clean(row.get("RELATED_RESOURCES.IdType"))
-            ext_res_type = _clean(row.get("RELATED_RESOURCES.ResourceType"))
-            ext_rel = _clean(row.get("RELATED_RESOURCES.Relationship"))
-            ext_name = _clean(row.get("RELATED_RESOURCES.IdentifierName"))
-
-            if ext_id or ext_res_type or ext_rel:
-                rel_obj = {
-                    "related_identifier": ext_id,
-                    "related_identifier_type": ext_id_type,
-                    "related_resource_type": ext_res_type,
-                    "relation_type": ext_rel,
-                    "related_identifier_name": ext_name,
-                }
-                if rel_obj.get("related_identifier"):
-                    _append_unique(
-                        ds["related_identifier_obj"],
-                        rel_obj,
-                        identity_keys=("related_identifier_type", "related_identifier", "relation_type"),
-                    )
-
-            # -----------------------------
-            # Related instrument components
-            # -----------------------------
-            comp_id = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.Id"))
-            comp_manf = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.Manufacturer"))
-            comp_model = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.Model"))
-            comp_alt = _clean(row.get("RELATED_INSTRUMENT_COMPONENTS.AlternateIdentifier"))
-
-            if comp_id:
-                # Look up instrument by DOI - must be public with minted DOI
-                found = client.find_public_instrument_by_doi(comp_id)
-                if found:
-                    _append_unique(
-                        ds["related_instruments"],
-                        {
-                            "package_id": found["id"],
-                            "identifier": found["doi"],
-                            "identifier_type": "DOI",
-                            "label": found["title"],
-                            "relation_type": "HasPart",
-                        },
-                        identity_keys=("package_id",),
-                    )
-                else:
-                    errors.append(
-                        f"[Record {record} | Row {row['__rownum__']}] "
-                        f"Related instrument component not found as a public instrument with minted DOI: {comp_id}"
-                    )
-            elif comp_manf and comp_model and comp_alt:
-                # Search by Manufacturer + Model + AlternateIdentifier combo
-                found, duplicates = client.find_instrument_by_attributes(
-                    comp_manf, comp_model, comp_alt,
-                )
-                if found:
-                    _append_unique(
-                        ds["related_instruments"],
-                        {
-                            "package_id": found["id"],
-                            "identifier": found["doi"],
-                            "identifier_type": "DOI",
-                            "label": found["title"],
-                            "relation_type": "HasPart",
-                        },
-                        identity_keys=("package_id",),
-                    )
-                elif duplicates:
-                    errors.append(
-                        f"[Record {record} | Row {row['__rownum__']}] "
-                        f"Multiple public instruments match Manufacturer={comp_manf}, "
-                        f"Model={comp_model}, AlternateIdentifier={comp_alt}: {duplicates}"
-                    )
-                else:
-                    errors.append(
-                        f"[Record {record} | Row {row['__rownum__']}] "
-                        f"No public instrument found for Manufacturer={comp_manf}, "
-                        f"Model={comp_model}, AlternateIdentifier={comp_alt}"
-                    )
-            elif comp_manf or comp_model or comp_alt:
+                if ds is not None:
+                    records.append(ds)
+            pending.clear()
+            return records
+
+        for row in _iter_data_rows(ws, col_keys):
+            rec = _clean(row.get(record_col_key))
+            if not rec:
+                errors.append(f"[Row {row['__rownum__']}] Missing Record* (used for grouping).")
+                continue
+            if rec == current:
+                grp.append(row)
+                continue
+            if rec in seen:
                 errors.append(
-                    f"[Record {record} | Row {row['__rownum__']}] "
-                    f"Related instrument component requires either a DOI in the Id column "
-                    f"or all three: Manufacturer, Model, and AlternateIdentifier."
+                    f"[Record {rec} | Row {row['__rownum__']}] Rows of a record must be "
+                    f"contiguous when streaming; row ignored."
                 )
+                continue
 
-        # Apply accumulated tag fields (join)
-        for k, vals in tag_acc.items():
-            if vals:
-                ds[k] = ", ".join(vals)
-
-        # ----- Instrument type resolution (GCMD + custom taxonomy) -----
-        is_platform = sheet_is_platform == "true"
-        gcmd_ep = "platforms" if is_platform else "instruments"
-        tax_name = "platforms" if is_platform else "instruments"
-        if it_gcmd_tokens or it_custom_tokens:
-            gcmd_joined = ", ".join(it_gcmd_tokens) if it_gcmd_tokens else None
-            custom_joined = ", ".join(it_custom_tokens) if it_custom_tokens else None
-            it_items, it_gcmd_codes, it_gcmd_labels = _resolve_vocab_items(
-                gcmd_joined, custom_joined,
-                gcmd_ep, tax_name, client, errors, record,
-                field_name="instrument_type",
-                field_label="instrument type",
-            )
-            if it_items:
-                ds["instrument_type"] = it_items
-            if it_gcmd_codes:
-                ds["instrument_type_gcmd_code"] = it_gcmd_codes
-            if it_gcmd_labels:
-                ds["instrument_type_gcmd"] = it_gcmd_labels
-
-        # ----- Measured variable resolution (GCMD + custom taxonomy) -----
-        if mv_gcmd_tokens or mv_custom_tokens:
-            gcmd_joined = ", ".join(mv_gcmd_tokens) if mv_gcmd_tokens else None
-            custom_joined = ", ".join(mv_custom_tokens) if mv_custom_tokens else None
-            mv_items, mv_gcmd_codes, mv_gcmd_labels = _resolve_vocab_items(
-                gcmd_joined, custom_joined,
-                "measured_variables", "measured-variables", client, errors, record,
-                field_name="measured_variable",
-                field_label="measured variable",
-            )
-            if mv_items:
-                ds["measured_variable"] = mv_items
-            if mv_gcmd_codes:
-                ds["measured_variable_gcmd_code"] = mv_gcmd_codes
-            if mv_gcmd_labels:
-                ds["measured_variable_gcmd"] = mv_gcmd_labels
-
-        # ----- Geolocation resolution (locationType-based) -----
-        geo = _resolve_geolocation(grp, errors, record)
-        ds.update(geo)
-
-        # Clean empty repeating composites
-        for k in COMPOSITE_FIELDS:
-            if not ds.get(k):
-                ds.pop(k, None)
-
-        # Serialize related_instruments to JSON (the validator expects a JSON string)
-        if ds.get("related_instruments"):
-            ds["related_instruments"] = json.dumps(ds["related_instruments"], ensure_ascii=False)
-        else:
-            ds.pop("related_instruments", None)
-
-        # Clean empty __resources__
-        if not ds.get("__resources__"):
-            ds.pop("__resources__", None)
-
-        # Minimal required checks (based on your template)
-        if _is_blank(ds.get("title")):
-            errors.append(f"[Record {record}] Missing TITLE.Name (maps to CKAN title).")
-            continue
-        if not ds.get("manufacturer"):
-            errors.append(f"[Record {record}] Missing at least one manufacturer (MANUFACTURER.Name).")
-            continue
-        if not ds.get("owner"):
-            errors.append(f"[Record {record}] Missing at least one owner (OWNER.Name/Contact/Relationship).")
-            continue
-        if not ds.get("model"):
-            errors.append(f"[Record {record}] Missing at least one model (MODEL.Name).")
-            continue
-
-        ds["is_platform"] = sheet_is_platform
-        records.append(ds)
-
-    return MappingResult(records=records, errors=errors)
-
+            if current is not None:
+                pending.append((current, grp))
+            current, grp = rec, [row]
+            seen.add(rec)
+
+            if len(pending) >= chunk_size:
+                records = _map_pending()
+                yield MappingResult(records=records, errors=errors)
+                errors = []
+
+        if current is not None:
+            pending.append((current, grp))
+        records = _map_pending() if pending else []
+        if records or errors:
+            yield MappingResult(records=records, errors=errors)
+    finally:
+        wb.close()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from ckan_batch.constants import GCMD_VOCAB_ENDPOINTS
+
+# Bump when the shape of stored values changes; older entries are then ignored.
+CACHE_FORMAT_VERSION = 1
+
+DAY = 24 * 3600
+
+# Default time-to-live per namespace, in seconds.
+DEFAULT_TTLS: Dict[str, float] = {
+    "gcmd": 30 * DAY,             # GCMD label -> concept lookups
+    "gcmd_scheme": 30 * DAY,      # markers for fully downloaded GCMD schemes
+    "epsg": 90 * DAY,             # EPSG code -> display label
+    "taxonomy_terms": 1 * DAY,    # CKAN custom taxonomy term lists
+    "parties": 3600,              # CKAN party registry
+}
+
+# GCMD entries are only valid for the scheme releases they were resolved
+# against; the endpoint paths carry the release, so stamp with their hash.
+_GCMD_STAMP = hashlib.sha1(
+    json.dumps(GCMD_VOCAB_ENDPOINTS, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+DEFAULT_VERSIONS: Dict[str, str] = {
+    "gcmd": _GCMD_STAMP,
+    "gcmd_scheme": _GCMD_STAMP,
+}
+
+MISSING = object()
+
+
+def default_cache_path() -> Path:
+    """
+    Location of the shared cache file: $CKAN_BATCH_CACHE_DIR if set, else
+    $XDG_CACHE_HOME/ckan-batch, else ~/.cache/ckan-batch.
+    """
+    base = os.environ.get("CKAN_BATCH_CACHE_DIR")
+    if base:
+        return Path(base).expanduser() / "vocab.sqlite"
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    root = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return root / "ckan-batch" / "vocab.sqlite"
+
+
+class VocabCache:
+    """
+    Persistent (SQLite) key/value cache for vocabulary lookups, shared across
+    notebook sessions.
+
+    Entries live in namespaces ("gcmd", "epsg", ...) with their own TTL and
+    are stamped with a version string; an entry whose version no longer
+    matches the namespace's current version (e.g. because the GCMD endpoint
+    list changed) is treated as missing. Values must be JSON-serialisable.
+
+    Example:
+        cache = VocabCache()                       # ~/.cache/ckan-batch/vocab.sqlite
+        client = CKANClient(url, apikey=key, vocab_cache=cache)
+        client.warm_vocab_cache()                  # download GCMD schemes once
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        *,
+        ttls: Optional[Dict[str, float]] = None,
+        versions: Optional[Dict[str, str]] = None,
+    ):
+        self.path = Path(path).expanduser() if path else default_cache_path()
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.versions = {**DEFAULT_VERSIONS, **(versions or {})}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " version TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+
+    def _version(self, namespace: str) -> str:
+        return f"{CACHE_FORMAT_VERSION}:{self.versions.get(namespace, '')}"
+
+    def get(self, namespace: str, key: str, default: Any = MISSING) -> Any:
+        """Return the stored value, or default if missing, expired or stale."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, version, stored_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return default
+        value, version, stored_at = row
+        ttl = self.ttls.get(namespace)
+        if version != self._version(namespace):
+            return default
+        if ttl is not None and time.time() - stored_at > ttl:
+            return default
+        return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        self.set_many(namespace, [(key, value)])
+
+    def set_many(self, namespace: str, items: Iterable[Tuple[str, Any]]) -> None:
+        """Store several (key, value) pairs in one transaction."""
+        now = time.time()
+        version = self._version(namespace)
+        rows = [
+            (namespace, key, json.dumps(value, ensure_ascii=False), version, now)
+            for key, value in items
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, version, stored_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Delete all entries, or only those of one namespace."""
+        with self._lock, self._conn:
+            if namespace is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,110 @@
+"""Shared fixtures: a CKANClient whose action API is an in-memory fake."""
+
+import threading
+import time
+from typing import Any, Dict, List
+
+import openpyxl
+import pytest
+from ckanapi import NotFound
+
+from ckan_batch.client import CKANClient
+
+
+class FakeAction:
+    """
+    Stand-in for ckanapi's ActionShortcut. Known packages live in
+    ``packages``; every call is recorded in ``calls`` as (action, kwargs).
+    """
+
+    def __init__(self) -> None:
+        self.packages: Dict[str, Dict[str, Any]] = {}
+        self.groups: List[Dict[str, Any]] = []
+        self.calls: List[tuple] = []
+        self.create_delays: Dict[str, float] = {}  # title -> seconds
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _record(self, action: str, kwargs: Dict[str, Any]) -> None:
+        with self._lock:
+            self.calls.append((action, kwargs))
+
+    def called(self, action: str) -> List[Dict[str, Any]]:
+        return [kwargs for name, kwargs in self.calls if name == action]
+
+    def package_create(self, **kwargs: Any) -> Dict[str, Any]:
+        self._record("package_create", kwargs)
+        time.sleep(self.create_delays.get(kwargs.get("title"), 0))
+        with self._lock:
+            self._next_id += 1
+            pkg = {**kwargs, "id": f"pkg-{self._next_id}", "name": f"name-{self._next_id}"}
+            self.packages[pkg["id"]] = pkg
+        return pkg
+
+    def package_show(self, id: str) -> Dict[str, Any]:
+        self._record("package_show", {"id": id})
+        if id not in self.packages:
+            raise NotFound(id)
+        return self.packages[id]
+
+    def package_search(self, **kwargs: Any) -> Dict[str, Any]:
+        self._record("package_search", kwargs)
+        fq = kwargs.get("fq", "")
+        results = [p for pid, p in self.packages.items() if f'"{pid}"' in fq]
+        return {"count": len(results), "results": results}
+
+    def group_list(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        self._record("group_list", kwargs)
+        return [dict(g) for g in self.groups]
+
+    def group_create(self, **kwargs: Any) -> Dict[str, Any]:
+        self._record("group_create", kwargs)
+        group = {**kwargs, "id": f"group-{len(self.groups) + 1}"}
+        self.groups.append(group)
+        return group
+
+
+@pytest.fixture
+def fake_action() -> FakeAction:
+    return FakeAction()
+
+
+@pytest.fixture
+def client(fake_action: FakeAction) -> CKANClient:
+    c = CKANClient("https://ckan.example.test")
+    c.action = fake_action
+    return c
+
+
+# Row 4 group labels and row 5 headers of a minimal PIDINST sheet; keys come
+# out as e.g. "FIELD.Record", "TITLE.Name", "MANUFACTURER.Name".
+TEMPLATE_GROUPS = [
+    None, "TITLE", "MANUFACTURER", "OWNER", "OWNER", "MODEL",
+    "INSTRUMENT (RESOURCE) TYPE", "OTHER",
+]
+TEMPLATE_HEADERS = [
+    "Record*", "Name*", "Name", "Name", "Contact", "Name",
+    "instrumentTypeGCMD", "MeasuredVariableCustom",
+]
+
+
+@pytest.fixture
+def make_workbook(tmp_path):
+    """Write data rows (lists in TEMPLATE_HEADERS order) to a template workbook."""
+
+    def _make(rows: List[List[Any]], sheet_name: str = "Instruments") -> str:
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = sheet_name
+        for col, label in enumerate(TEMPLATE_GROUPS, start=1):
+            ws.cell(row=4, column=col, value=label)
+        for col, label in enumerate(TEMPLATE_HEADERS, start=1):
+            ws.cell(row=5, column=col, value=label)
+        for r, values in enumerate(rows, start=7):
+            for col, value in enumerate(values, start=1):
+                ws.cell(row=r, column=col, value=value)
+        path = tmp_path / "template.xlsx"
+        wb.save(path)
+        return str(path)
+
+    return _make
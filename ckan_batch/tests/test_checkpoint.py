@@ -0,0 +1,44 @@
+from ckan_batch.checkpoint import CheckpointJournal
+
+
+def test_journal_replays_latest_entry_per_operation(tmp_path):
+    path = tmp_path / "run.journal"
+    journal = CheckpointJournal(path)
+    journal.record("k1", "create", "failed", error="boom")
+    journal.record("k1", "create", "created", id="pkg-1", resources_failed=[])
+    journal.record("k1", "update", "failed", error="conflict")
+    journal.record("k2", "create", "created", id="pkg-2")
+
+    replayed = CheckpointJournal(path)
+
+    assert replayed.get("k1", "create")["status"] == "created"
+    assert replayed.get("k1", "create")["id"] == "pkg-1"
+    assert replayed.get("k1", "update")["status"] == "failed"
+    assert replayed.get("k2", "create")["id"] == "pkg-2"
+    assert replayed.get("k3", "create") is None
+
+
+def test_journal_ignores_torn_last_line(tmp_path):
+    path = tmp_path / "run.journal"
+    CheckpointJournal(path).record("k1", "create", "created", id="pkg-1")
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('{"key": "k2", "op": "create", "sta')
+
+    replayed = CheckpointJournal(path)
+
+    assert replayed.get("k1", "create")["id"] == "pkg-1"
+    assert replayed.get("k2", "create") is None
+
+
+def test_key_for_combines_record_label_and_content():
+    base = {"title": "Seismometer", "__record__": "7", "__resources__": [{"path": "a.png"}]}
+
+    key = CheckpointJournal.key_for(base)
+
+    assert key.startswith("record:7:")
+    # Private "__" fields do not affect the hash.
+    assert CheckpointJournal.key_for({**base, "__resources__": []}) == key
+    # Edited content, or the same label in another workbook, is a new record.
+    assert CheckpointJournal.key_for({**base, "title": "Edited"}) != key
+    assert CheckpointJournal.key_for({**base, "__record__": "8"}) != key
+    assert CheckpointJournal.key_for({"title": "Seismometer"}).startswith("sha1:")
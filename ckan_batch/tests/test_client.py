@@ -0,0 +1,378 @@
+import json
+
+import openpyxl
+import pytest
+from ckanapi import CKANAPIError
+from urllib3.util.retry import Retry
+
+from ckan_batch.checkpoint import CheckpointJournal
+from ckan_batch.client import CKANClient, _JitteredRetry
+from ckan_batch.vocab_cache import MISSING, VocabCache
+
+
+# ---------------------------------------------------------------------------
+# create_records
+# ---------------------------------------------------------------------------
+
+def test_create_records_concurrent_keeps_input_order_and_stats(client, fake_action):
+    records = [{"title": f"Record {i}"} for i in range(6)]
+    # Earlier records finish last, so completion order is reversed.
+    fake_action.create_delays = {f"Record {i}": 0.02 * (6 - i) for i in range(6)}
+
+    result = client.create_records(records, max_workers=4)
+
+    assert [c["title"] for c in result.created] == [r["title"] for r in records]
+    assert [c["index"] for c in result.created] == list(range(1, 7))
+    assert result.failed == []
+    assert result.stats["records"] == 6
+    assert result.stats["max_workers"] == 4
+    assert result.stats["latency_s"]["package_create"]["count"] == 6
+    assert len(fake_action.called("package_create")) == 6
+
+
+def test_create_records_reports_failures_in_place(client, fake_action):
+    def package_create(**kwargs):
+        if kwargs["title"] == "bad":
+            raise CKANAPIError("invalid")
+        return {"id": "pkg-" + kwargs["title"], "title": kwargs["title"]}
+
+    fake_action.package_create = package_create
+
+    result = client.create_records(
+        [{"title": "a"}, {"title": "bad"}, {"title": "b"}], max_workers=2,
+    )
+
+    assert [c["title"] for c in result.created] == ["a", "b"]
+    assert [f["index"] for f in result.failed] == [2]
+    assert result.failed[0]["error"] == "CKANAPIError"
+
+
+# ---------------------------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("method, status, expected", [
+    ("GET", 500, True),
+    ("GET", 503, True),
+    ("GET", 404, False),
+    ("POST", 429, True),
+    ("POST", 503, True),
+    ("POST", 500, False),   # may have been applied; never resend a write
+    ("POST", 502, False),
+    ("POST", 504, False),
+])
+def test_jittered_retry_only_resends_posts_the_server_refused(method, status, expected):
+    assert _JitteredRetry(total=3).is_retry(method, status) is expected
+
+
+def test_jittered_retry_stops_when_exhausted():
+    assert _JitteredRetry(total=0).is_retry("GET", 503) is False
+
+
+def test_jittered_retry_backoff_is_bounded_by_exponential(monkeypatch):
+    retry = _JitteredRetry(total=3, backoff_factor=1.0)
+    monkeypatch.setattr(Retry, "get_backoff_time", lambda self: 4.0)
+    monkeypatch.setattr("ckan_batch.client.random.uniform", lambda lo, hi: (lo, hi))
+
+    assert retry.get_backoff_time() == (0, 4.0)
+
+
+# ---------------------------------------------------------------------------
+# Vocabulary caches
+# ---------------------------------------------------------------------------
+
+def test_party_lookup_refreshed_after_create_parties(client, fake_action):
+    fake_action.groups = [{"name": "lab", "title": "Lab", "party_role": "owner"}]
+    assert set(client.get_parties_by_name()) == {"lab"}
+
+    client.create_parties([{"name": "agency", "title": "Agency", "party_role": "funder"}])
+
+    assert set(client.get_parties_by_name()) == {"lab", "agency"}
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class _GcmdSession:
+    """Serves two pages of the instruments scheme; platforms is unreachable."""
+
+    pages = [
+        {"result": {"items": [{"prefLabel": {"_value": "Seismometer"}, "_about": "https://gcmd/seis"}],
+                    "next": "page-1"}},
+        {"result": {"items": [{"prefLabel": "Magnetometer", "_about": "https://gcmd/mag"}]}},
+    ]
+
+    def get(self, url, **kwargs):
+        if "gcmd-platforms" in url:
+            raise ConnectionError("unreachable")
+        return _FakeResponse(self.pages[int(url.rsplit("_page=", 1)[1])])
+
+
+class _NoNetwork:
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        raise ConnectionError("offline")
+
+
+def test_warm_vocab_cache_marks_only_complete_schemes(tmp_path):
+    cache = VocabCache(tmp_path / "vocab.sqlite")
+    warm = CKANClient("https://ckan.example.test", session=_GcmdSession(), vocab_cache=cache)
+
+    counts = warm.warm_vocab_cache(["instruments", "platforms"])
+
+    assert counts == {"instruments": 2, "platforms": 0}
+    assert cache.get("gcmd_scheme", "instruments") is True
+    assert cache.get("gcmd_scheme", "platforms") is MISSING
+
+    # A later session answers instruments lookups offline, including misses.
+    session = _NoNetwork()
+    offline = CKANClient("https://ckan.example.test", session=session, vocab_cache=cache)
+    assert offline.gcmd_find_term("instruments", " SEISMOMETER")["code"] == "https://gcmd/seis"
+    assert offline.gcmd_find_term("instruments", "unknown") is None
+    assert session.requested == []
+    # The incomplete scheme still has to ask the server.
+    assert offline.gcmd_find_term("platforms", "Research vessel") is None
+    assert len(session.requested) == 1
+
+
+# ---------------------------------------------------------------------------
+# Taxonomy term index
+# ---------------------------------------------------------------------------
+
+def test_taxonomy_term_index_flattens_children_first_match_wins(client, fake_action):
+    terms = [
+        {"id": "sensor", "label": "Sensor", "children": [
+            {"id": "child-sensor", "label": "Other", "title": "SENSOR"},
+            {"id": "probe", "label": "Probe", "children": [
+                {"id": "deep", "label": "Deep probe"},
+            ]},
+        ]},
+        {"id": "later-probe", "label": "probe "},
+    ]
+    fake_action.taxonomy_term_list = lambda id: terms
+
+    index = client.get_taxonomy_term_index("tax-1")
+
+    assert index["sensor"]["id"] == "sensor"
+    assert index["other"]["id"] == "child-sensor"
+    assert index["probe"]["id"] == "probe"
+    assert index["deep probe"]["id"] == "deep"
+    assert client.get_taxonomy_term_index("tax-1") is index
+
+
+def test_find_taxonomy_term_matches_nested_terms_case_insensitively(client, fake_action):
+    fake_action.taxonomy_list = lambda: [{"name": "Instruments", "id": "tax-1"}]
+    fake_action.taxonomy_term_list = lambda id: [
+        {"id": "t1", "label": "Seismometer", "children": [{"id": "t2", "name": "broadband"}]},
+    ]
+
+    assert client.find_taxonomy_term("instruments", " BROADBAND ")["id"] == "t2"
+    assert client.find_taxonomy_term("instruments", "missing") is None
+    assert client.find_taxonomy_term("unknown", "Seismometer") is None
+
+
+# ---------------------------------------------------------------------------
+# fetch_packages
+# ---------------------------------------------------------------------------
+
+def test_fetch_packages_falls_back_to_package_show(client, fake_action):
+    fake_action.packages = {"a": {"id": "a"}, "b": {"id": "b"}}
+
+    def package_show(id):
+        fake_action.calls.append(("package_show", {"id": id}))
+        if id == "by-name":
+            return {"id": "c", "name": "by-name"}
+        raise CKANAPIError("gone")
+
+    fake_action.package_show = package_show
+
+    packages, not_found = client.fetch_packages(
+        ["b", "by-name", "a", "b", "missing"], batch_size=2,
+    )
+
+    assert [p["id"] for p in packages] == ["b", "c", "a"]
+    assert not_found == ["missing"]
+    assert len(fake_action.called("package_search")) == 2
+    assert sorted(c["id"] for c in fake_action.called("package_show")) == ["by-name", "missing"]
+
+
+def test_fetch_packages_shows_batch_when_search_fails(client, fake_action):
+    fake_action.packages = {"a": {"id": "a"}, "b": {"id": "b"}}
+
+    def package_search(**kwargs):
+        raise CKANAPIError("solr down")
+
+    fake_action.package_search = package_search
+
+    packages, not_found = client.fetch_packages(["a", "b"])
+
+    assert [p["id"] for p in packages] == ["a", "b"]
+    assert not_found == []
+
+
+# ---------------------------------------------------------------------------
+# export_to_excel
+# ---------------------------------------------------------------------------
+
+def test_export_to_excel_splits_instruments_and_platforms(client, tmp_path):
+    packages = iter([
+        {"id": "1", "title": "Seismometer", "is_platform": "false",
+         "owner": json.dumps([{"owner_name": "Lab"}])},
+        {"id": "2", "title": "Research vessel", "is_platform": "true"},
+        {"id": "3", "title": "Magnetometer"},
+    ])
+    out = tmp_path / "export.xlsx"
+
+    counts = client.export_to_excel(packages, str(out))
+
+    assert counts == {"Instruments": 2, "Platforms": 1}
+    wb = openpyxl.load_workbook(out, read_only=True)
+
+    def data_values(sheet):
+        return [v for row in wb[sheet].iter_rows(min_row=7, values_only=True) for v in row]
+
+    instruments = data_values("Instruments")
+    assert "Seismometer" in instruments and "Magnetometer" in instruments
+    assert "Lab" in instruments
+    assert "Research vessel" in data_values("Platforms")
+    # Header rows are copied from the template.
+    header = [v for row in wb["Instruments"].iter_rows(max_row=6, values_only=True) for v in row]
+    assert any(v for v in header)
+    wb.close()
+
+
+# ---------------------------------------------------------------------------
+# import_ndjson
+# ---------------------------------------------------------------------------
+
+def _write_ndjson(path, titles):
+    lines = []
+    for title in titles:
+        lines.append(json.dumps({"title": title}) if title else "")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_import_ndjson_tags_entries_with_file_lines(client, tmp_path):
+    path = tmp_path / "records.ndjson"
+    _write_ndjson(path, ["a", "", "b", "c", "d"])
+
+    batches = list(client.import_ndjson(str(path), batch_size=2))
+
+    assert [last_line for last_line, _ in batches] == [3, 5]
+    created = [c for _, res in batches for c in res.created]
+    assert [(c["title"], c["line"]) for c in created] == [
+        ("a", 1), ("b", 3), ("c", 4), ("d", 5),
+    ]
+
+
+def test_import_ndjson_resumes_after_last_line(client, fake_action, tmp_path):
+    path = tmp_path / "records.ndjson"
+    _write_ndjson(path, ["a", "b", "c"])
+
+    batches = client.import_ndjson(str(path), batch_size=2)
+    last_line, _ = next(batches)
+    batches.close()  # interrupted after the first batch
+
+    resumed = list(client.import_ndjson(str(path), batch_size=2, start_line=last_line))
+
+    assert [c["title"] for _, res in resumed for c in res.created] == ["c"]
+    assert [k["title"] for k in fake_action.called("package_create")] == ["a", "b", "c"]
+
+
+def test_import_ndjson_with_checkpoint_skips_records_already_created(client, fake_action, tmp_path):
+    path = tmp_path / "records.ndjson"
+    _write_ndjson(path, ["a", "b", "c"])
+    journal = tmp_path / "import.journal"
+
+    list(client.import_ndjson(str(path), batch_size=2, checkpoint=journal))
+    rerun = list(client.import_ndjson(str(path), batch_size=2, checkpoint=journal))
+
+    assert len(fake_action.called("package_create")) == 3
+    assert [(s["line"], s["id"]) for _, res in rerun for s in res.skipped] == [
+        (1, "pkg-1"), (2, "pkg-2"), (3, "pkg-3"),
+    ]
+
+
+def test_import_ndjson_rejects_unknown_target(client, tmp_path):
+    path = tmp_path / "records.ndjson"
+    _write_ndjson(path, ["a"])
+
+    with pytest.raises(ValueError):
+        list(client.import_ndjson(str(path), target="delete"))
+
+
+# ---------------------------------------------------------------------------
+# Checkpointed create/update runs
+# ---------------------------------------------------------------------------
+
+def test_create_records_checkpoint_skips_completed_records(client, fake_action, tmp_path):
+    journal_path = tmp_path / "run.journal"
+    records = [{"title": "a", "__record__": "1"}, {"title": "b", "__record__": "2"}]
+
+    client.create_records(records, checkpoint=journal_path)
+    rerun = client.create_records(records, checkpoint=journal_path)
+
+    assert len(fake_action.called("package_create")) == 2
+    assert rerun.created == []
+    assert [s["id"] for s in rerun.skipped] == ["pkg-1", "pkg-2"]
+
+
+def test_create_records_resumes_resource_uploads_without_recreating(client, fake_action, tmp_path):
+    journal = CheckpointJournal(tmp_path / "run.journal")
+    record = {"title": "a", "__resources__": [{"path": str(tmp_path / "missing.png")}]}
+
+    first = client.create_records([record], checkpoint=journal)
+    assert first.resource_results[0]["failed"]
+
+    (tmp_path / "missing.png").write_bytes(b"png")
+    uploaded = []
+    client.create_resources_for_record = (
+        lambda pkg_id, resources, dry_run=False: uploaded.append((pkg_id, resources))
+        or {"created": [{"id": "res-1"}], "failed": []}
+    )
+    second = client.create_records([record], checkpoint=CheckpointJournal(journal.path))
+
+    assert len(fake_action.called("package_create")) == 1
+    assert second.created[0]["status"] == "resources_retried"
+    assert uploaded == [("pkg-1", record["__resources__"])]
+
+
+def test_update_records_checkpoint_skips_updated_and_retries_failed(client, fake_action, tmp_path):
+    journal = tmp_path / "update.journal"
+    fake_action.packages = {
+        "p1": {"id": "p1", "type": "instrument", "private": True},
+        "p2": {"id": "p2", "type": "instrument", "private": True},
+    }
+    failing = {"b"}
+    sent = []
+
+    def package_update(**kwargs):
+        sent.append(kwargs["title"])
+        if kwargs["title"] in failing:
+            raise CKANAPIError("conflict")
+        return {"id": kwargs["id"], "title": kwargs["title"]}
+
+    fake_action.package_update = package_update
+    records = [{"pkg_id": "p1", "title": "a"}, {"pkg_id": "p2", "title": "b"}]
+
+    first = client.update_records(records, checkpoint=journal)
+    assert [u["id"] for u in first.created] == ["p1"]
+    assert [f["index"] for f in first.failed] == [2]
+
+    failing.clear()
+    second = client.update_records(records, checkpoint=journal)
+
+    assert [s["id"] for s in second.skipped] == ["p1"]
+    assert [u["id"] for u in second.created] == ["p2"]
+    assert sent == ["a", "b", "b"]
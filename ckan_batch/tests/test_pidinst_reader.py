@@ -0,0 +1,80 @@
+from ckan_batch.reader.pidinst import iter_pidinst_template, read_pidinst_template
+
+
+_PARTY = {
+    "name": "acme", "title": "Acme", "roles": {"manufacturer", "owner"},
+    "party_identifier": "", "party_identifier_type": "", "party_contact": "",
+}
+
+
+class _VocabClient:
+    """Just the client calls the template reader makes; no network."""
+
+    def __init__(self):
+        self.log = []
+
+    def get_parties_by_name(self):
+        return {"acme": _PARTY}
+
+    def prefetch_gcmd_terms(self, terms, max_workers=8):
+        self.log.append(("prefetch", sorted(label for _, label in terms)))
+
+    def prefetch_taxonomy_terms(self, names):
+        self.log.append(("prefetch_taxonomies", sorted(names)))
+
+    def gcmd_find_term(self, endpoint_key, label):
+        self.log.append(("find", label))
+        return {"code": f"https://gcmd.example/{label}", "label": label}
+
+    def find_taxonomy_term(self, taxonomy_name, label):
+        return None
+
+
+def _rows(n):
+    rows = []
+    for i in range(n):
+        rows.append([f"R{i}", f"Instrument {i}", "Acme", "Acme", "a@example.org", "M1", f"type{i}", None])
+        # Second row of the same record adds another model.
+        rows.append([f"R{i}", None, None, None, None, f"M{i}b", None, None])
+    return rows
+
+
+def test_iter_template_yields_same_records_as_read(make_workbook):
+    path = make_workbook(_rows(5) + [[None, "no record label"]])
+
+    full = read_pidinst_template(path, _VocabClient())
+    chunks = list(iter_pidinst_template(path, _VocabClient(), chunk_size=2))
+
+    assert [len(c.records) for c in chunks] == [2, 2, 1]
+    assert [r for c in chunks for r in c.records] == full.records
+    assert [e for c in chunks for e in c.errors] == full.errors
+    assert len(full.records) == 5
+    assert full.records[0]["__record__"] == "R0"
+    assert [m["model_name"] for m in full.records[0]["model"]] == ["M1", "M0b"]
+
+
+def test_iter_template_prefetches_each_chunk_before_mapping_it(make_workbook):
+    path = make_workbook(_rows(3))
+    client = _VocabClient()
+
+    chunks = iter_pidinst_template(path, client, chunk_size=2)
+    next(chunks)
+
+    # Only the first chunk's terms were resolved before the first yield.
+    assert client.log == [
+        ("prefetch", ["type0", "type1"]), ("find", "type0"), ("find", "type1"),
+    ]
+    list(chunks)
+    assert client.log[3:] == [("prefetch", ["type2"]), ("find", "type2")]
+
+
+def test_iter_template_skips_non_contiguous_record_rows(make_workbook):
+    rows = _rows(2)
+    rows.append(["R0", None, None, None, None, "late model", None, None])
+    path = make_workbook(rows)
+
+    records = [r for c in iter_pidinst_template(path, _VocabClient()) for r in c.records]
+    errors = [e for c in iter_pidinst_template(path, _VocabClient()) for e in c.errors]
+
+    assert [r["__record__"] for r in records] == ["R0", "R1"]
+    assert any("contiguous" in e for e in errors)
@@ -0,0 +1,35 @@
+from ckan_batch import vocab_cache
+from ckan_batch.vocab_cache import MISSING, VocabCache
+
+
+def test_entries_expire_after_namespace_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(vocab_cache.time, "time", lambda: now[0])
+    cache = VocabCache(tmp_path / "vocab.sqlite", ttls={"epsg": 60})
+
+    cache.set("epsg", "4326", "WGS 84")
+    cache.set("gcmd", "label", {"code": "c"})
+    now[0] += 61
+
+    assert cache.get("epsg", "4326") is MISSING
+    assert cache.get("epsg", "4326", default=None) is None
+    assert cache.get("gcmd", "label") == {"code": "c"}
+
+
+def test_entries_stored_under_another_version_are_missing(tmp_path):
+    path = tmp_path / "vocab.sqlite"
+    VocabCache(path, versions={"gcmd": "release-1"}).set("gcmd", "label", {"code": "c"})
+
+    assert VocabCache(path, versions={"gcmd": "release-1"}).get("gcmd", "label") == {"code": "c"}
+    assert VocabCache(path, versions={"gcmd": "release-2"}).get("gcmd", "label") is MISSING
+
+
+def test_clear_drops_only_the_given_namespace(tmp_path):
+    cache = VocabCache(tmp_path / "vocab.sqlite")
+    cache.set_many("parties", [("a", 1), ("b", 2)])
+    cache.set("epsg", "4326", "WGS 84")
+
+    cache.clear("parties")
+
+    assert cache.get("parties", "a") is MISSING
+    assert cache.get("epsg", "4326") == "WGS 84"